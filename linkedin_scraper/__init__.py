@@ -1,12 +1,72 @@
-from os.path import dirname, basename, isfile
-from .person import Person
-from .objects import Institution, Experience, Education, Contact
-from .company import Company
-from .jobs import Job
-from .job_search import JobSearch
+import importlib
+import logging
 
 __version__ = "2.11.5"
 
-import glob
-modules = glob.glob(dirname(__file__)+"/*.py")
-__all__ = [ basename(f)[:-3] for f in modules if isfile(f) and not f.endswith('__init__.py')]
+# Public names and the submodule defining them. They are imported on first access
+# (PEP 562), so `import linkedin_scraper` doesn't pull in selenium until it's needed.
+_LAZY_ATTRIBUTES = {
+    "Person": "person",
+    "Institution": "objects",
+    "Experience": "objects",
+    "Education": "objects",
+    "Contact": "objects",
+    "Company": "company",
+    "Job": "jobs",
+    "JobSearch": "job_search",
+    "configure_logging": "log",
+}
+
+_SUBMODULES = [
+    "actions",
+    "cli",
+    "company",
+    "connections",
+    "constants",
+    "dedup",
+    "enums",
+    "failures",
+    "job_frame",
+    "job_search",
+    "jobs",
+    "log",
+    "network",
+    "normalize",
+    "objects",
+    "person",
+    "planner",
+    "profile_parser",
+    "query",
+    "rate_limit",
+    "recrawl",
+    "replay",
+    "search_index",
+    "selectors",
+    "sessions",
+    "skills",
+    "standin",
+    "store",
+    "utils",
+    "watchdog",
+    "work_queue",
+]
+
+# job_frame needs pandas, so a star import leaves it out
+__all__ = list(_LAZY_ATTRIBUTES) + [name for name in _SUBMODULES if name != "job_frame"]
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,6 +3,8 @@ from . import constants as c
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from .rate_limit import ThrottleDetected, detect_throttle
 
 def __prompt_email_password():
   u = input("Email: ")
@@ -35,7 +37,13 @@ def login(driver, email=None, password=None, cookie = None, timeout=10):
         if remember:
             remember.submit()
   
-    element = WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CLASS_NAME, c.VERIFY_LOGIN_ID)))
+    try:
+        element = WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CLASS_NAME, c.VERIFY_LOGIN_ID)))
+    except TimeoutException:
+        signal = detect_throttle(driver)
+        if signal is not None:
+            raise ThrottleDetected(signal, driver.current_url)
+        raise
   
 def _login_with_cookie(driver, cookie):
     driver.get("https://www.linkedin.com/login")
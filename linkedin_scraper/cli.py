@@ -0,0 +1,479 @@
+"""
+Command line entry point, installed as `linkedin-scraper`.
+
+    linkedin-scraper jobs search "Data Engineer" --geoid 90009834 -o jobs.jsonl
+    linkedin-scraper jobs enrich --input jobs.jsonl --workers 4 -o details.jsonl
+    linkedin-scraper jobs search "Data Engineer" --geoid 90009834 --since marks.db -o new_jobs.jsonl
+    linkedin-scraper people --input profiles.txt --format csv -o people.csv --resume
+    linkedin-scraper companies --input companies.txt --employees -o companies.jsonl
+    linkedin-scraper jobs find "kafka spark" --index jobs.idx
+    linkedin-scraper jobs enrich --input jobs.jsonl --skills skills.json -o details.jsonl
+    linkedin-scraper recrawl --input tracked.txt --schedule recrawl.db --pages-per-hour 120 -o updates.jsonl
+
+Each worker owns a logged in Chrome session. Records are written as soon as an input
+finishes, and finished inputs are recorded next to the output so an interrupted run can
+continue with --resume.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from . import __version__
+from .failures import SEARCH_PAGE, JOB, PERSON, COMPANY, DeadLetterStore, RetryPolicy, ScrapeFailure
+from .log import configure_logging
+from .query import HighWaterMarks
+from .recrawl import RecrawlScheduler, scrape_entity
+from .search_index import JobIndex
+from .sessions import SessionPool, chrome_driver
+from .skills import SkillTagger
+from .store import EntityStore
+from .watchdog import Watchdog
+
+logger = logging.getLogger(__name__)
+
+JSONL = "jsonl"
+CSV = "csv"
+FORMATS = (JSONL, CSV)
+
+
+def read_inputs(path: str = None, items: List[str] = None) -> List[str]:
+    """Inputs given on the command line followed by the lines of path ('-' for stdin)"""
+    inputs = [item.strip() for item in items or [] if item.strip()]
+    if path:
+        f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    inputs.append(line)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+    return inputs
+
+
+def url_of(line: str) -> str:
+    """An input line is a URL, or a JSON record (e.g. `jobs search` output) with a linkedin_url"""
+    if line.startswith("{"):
+        return json.loads(line)["linkedin_url"]
+    return line
+
+
+def search_of(line: str, args) -> dict:
+    """
+    An input line is a search term, or a JSON object with search_term and optionally
+    geoid, max_pages, workplace_types and experience_levels overriding the flags.
+    """
+    search = {
+        "search_term": line,
+        "geoid": args.geoid,
+        "max_pages": args.max_pages,
+        "delay_seconds": args.delay,
+    }
+    if line.startswith("{"):
+        search.update(json.loads(line))
+    if search["geoid"] is None:
+        raise ValueError(f"No geoid for search '{search['search_term']}', pass --geoid")
+    return search
+
+
+class RecordWriter(object):
+    """Thread safe, streaming JSON lines or CSV writer"""
+
+    def __init__(self, path: str = None, output_format: str = JSONL, append: bool = False):
+        self.output_format = output_format
+        self._has_header = append and path is not None and os.path.exists(path) and os.path.getsize(path) > 0
+        if path is None or path == "-":
+            self._file = sys.stdout
+        else:
+            self._file = open(path, "a" if append else "w", encoding="utf-8", newline="")
+        self._csv = None
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _csv_writer(self, record: dict):
+        if self._csv is None:
+            self._csv = csv.DictWriter(self._file, fieldnames=list(record), extrasaction="ignore")
+            if not self._has_header:
+                self._csv.writeheader()
+        return self._csv
+
+    def write(self, records: List[dict]):
+        with self._lock:
+            for record in records:
+                if self.output_format == CSV:
+                    row = {
+                        key: json.dumps(value, default=str) if isinstance(value, (list, dict)) else value
+                        for key, value in record.items()
+                    }
+                    self._csv_writer(row).writerow(row)
+                else:
+                    self._file.write(json.dumps(record, default=str) + "\n")
+                self.count += 1
+            self._file.flush()
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class Progress(object):
+    """
+    Inputs already finished, kept in <output>.done so --resume can skip them.
+
+    Without an output file nothing is recorded and nothing is skipped.
+    """
+
+    def __init__(self, path: str = None, resume: bool = False):
+        self.path = path
+        self.done = set()
+        self._lock = threading.Lock()
+        if path is None:
+            return
+        if resume and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def mark_done(self, key: str):
+        with self._lock:
+            self.done.add(key)
+            if self.path is not None:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(key + "\n")
+
+
+class DriverPool(object):
+    """
+    Lazily starts and logs in one driver per worker thread, each supervised by a
+    watchdog that restarts it and logs in again when it crashes or loses its login
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self._local = threading.local()
+        self._watchdogs = []
+        self._lock = threading.Lock()
+
+    def watchdog(self) -> Watchdog:
+        watchdog = getattr(self._local, "watchdog", None)
+        if watchdog is None:
+            watchdog = Watchdog(lambda: chrome_driver(self.args.headless), login=self._login,
+                                max_restarts=self.args.max_restarts)
+            self._local.watchdog = watchdog
+            with self._lock:
+                self._watchdogs.append(watchdog)
+        return watchdog
+
+    def get(self):
+        return self.watchdog().driver
+
+    def call(self, func: Callable, *args):
+        """func(driver, *args) with this thread's driver, again after a recovery if its session dies"""
+        return self.watchdog().call(func, *args)
+
+    def _login(self, driver):
+        from . import actions
+
+        actions.login(driver, self.args.email, self.args.password, cookie=self.args.cookie)
+
+    def close(self):
+        for watchdog in self._watchdogs:
+            watchdog.close()
+        self._watchdogs = []
+
+
+def _search_jobs(driver, line, args) -> List[dict]:
+    from .job_search import JobSearch
+    search = search_of(line, args)
+    marks = HighWaterMarks(args.since) if args.since else None
+    try:
+        jobs = JobSearch(driver, scrape=False).search_multiple_pages(**search, high_water_marks=marks)
+    finally:
+        if marks is not None:
+            marks.close()
+    return [job.to_dict() for job in jobs]
+
+
+def _enrich_job(driver, line, args) -> List[dict]:
+    from .jobs import Job
+    return [Job(url_of(line), driver=driver, close_on_complete=False).to_dict()]
+
+
+def _scrape_person(driver, line, args) -> List[dict]:
+    from .person import Person
+    person = Person(url_of(line), driver=driver, parallel_details=args.parallel_tabs, close_on_complete=False)
+    return [person.to_dict()]
+
+
+def _scrape_company(driver, line, args) -> List[dict]:
+    from .company import Company
+    company = Company(url_of(line), driver=driver, get_employees=args.employees, close_on_complete=False)
+    return [company.to_dict()]
+
+
+_STORE_UPSERTS = {
+    SEARCH_PAGE: EntityStore.upsert_jobs,
+    JOB: EntityStore.upsert_jobs,
+    PERSON: EntityStore.upsert_people,
+    COMPANY: EntityStore.upsert_companies,
+}
+
+
+def _session_pool(args):
+    """A pool over the accounts of --accounts, keeping their budgets and health in <accounts>.state"""
+    if not args.accounts:
+        return None
+    return SessionPool.from_file(args.accounts, state_path=args.accounts + ".state",
+                                 driver_factory=lambda: chrome_driver(args.headless))
+
+
+def run(args, scrape: Callable, stage: str) -> int:
+    """Scrape every input with args.workers drivers, returning the process exit code"""
+    inputs = read_inputs(args.input, args.items)
+    if args.resume and args.output in (None, "-"):
+        raise SystemExit("--resume needs an --output file")
+    progress = Progress(None if args.output in (None, "-") else args.output + ".done", args.resume)
+    pending = [line for line in inputs if line not in progress.done]
+    skipped = len(inputs) - len(pending)
+    if skipped:
+        logger.info("Skipping %d inputs finished by a previous run", skipped, extra={"count": skipped})
+
+    dead_letters = DeadLetterStore(args.failures) if args.failures else None
+
+    writer = RecordWriter(args.output, args.format, append=args.resume)
+    store = EntityStore(args.store) if args.store else None
+    index = JobIndex(args.index) if getattr(args, "index", None) else None
+    tagger = _skill_tagger(getattr(args, "skills", None))
+    drivers = DriverPool(args)
+    sessions = _session_pool(args)
+    failed = []
+    start = time.perf_counter()
+
+    def work(line):
+        try:
+            if sessions is not None:
+                records = sessions.call(scrape, line, args)
+            else:
+                records = drivers.call(scrape, line, args)
+        except Exception as e:
+            logger.exception("Failed to scrape %s", line, extra={"url": line})
+            failed.append(line)
+            if dead_letters is not None:
+                dead_letters.add(ScrapeFailure.from_exception(e, stage, line))
+            return
+        if tagger is not None:
+            tagger.tag_jobs(records)
+        writer.write(records)
+        if store is not None:
+            _STORE_UPSERTS[stage](store, records)
+        if index is not None:
+            index.add(records)
+        progress.mark_done(line)
+        logger.info("Scraped %s", line, extra={"url": line, "count": len(records)})
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            list(executor.map(work, pending))
+    except KeyboardInterrupt:
+        logger.warning("Interrupted, rerun with --resume to continue")
+        raise
+    finally:
+        drivers.close()
+        if sessions is not None:
+            sessions.close()
+        if store is not None:
+            store.close()
+        if index is not None:
+            index.close()
+        writer.close()
+        elapsed = time.perf_counter() - start
+        finished = len(pending) - len(failed)
+        print(
+            f"{finished} of {len(pending)} inputs scraped ({len(failed)} failed, {skipped} skipped), "
+            f"{writer.count} records in {elapsed:.1f}s "
+            f"({writer.count / elapsed * 60 if elapsed else 0:.1f} records/min, "
+            f"{finished / elapsed * 60 if elapsed else 0:.1f} inputs/min)",
+            file=sys.stderr,
+        )
+    return 1 if failed else 0
+
+
+def recrawl_tracked(args) -> int:
+    """Track the inputs and recrawl tracked entities as they go stale, writing the changed ones"""
+    if _missing_credentials(args):
+        return 2
+    scheduler = RecrawlScheduler(args.schedule, pages_per_hour=args.pages_per_hour, min_staleness=args.min_staleness)
+    added = scheduler.track(url_of(line) for line in read_inputs(args.input, args.items))
+    logger.info("Tracking %d entities, %d new", scheduler.count(), added, extra={"count": added})
+
+    writer = RecordWriter(args.output, args.format, append=True)
+    store = EntityStore(args.store) if args.store else None
+    sessions = _session_pool(args)
+    drivers = DriverPool(args) if sessions is None else None
+
+    def save(kind, record, changed):
+        if changed or store is None:
+            writer.write([record])
+        if store is not None:
+            _STORE_UPSERTS[kind](store, [record])
+
+    def recrawl(_):
+        if sessions is not None:
+            # Every scrape borrows a session of the pool, there is no driver per worker
+            return scheduler.run(None, batches=args.batches, on_record=save,
+                                 scrape=lambda driver, kind, url: sessions.call(scrape_entity, kind, url))
+        return scheduler.run(drivers.get(), batches=args.batches, on_record=save,
+                             scrape=lambda driver, kind, url: drivers.call(scrape_entity, kind, url))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            crawled = sum(executor.map(recrawl, range(args.workers)))
+    except KeyboardInterrupt:
+        return 130
+    except RetryPolicy.give_up_on as e:
+        logger.error("Stopping the recrawl: %s", e)
+        return 1
+    finally:
+        if drivers is not None:
+            drivers.close()
+        if sessions is not None:
+            sessions.close()
+        if store is not None:
+            store.close()
+        writer.close()
+        scheduler.close()
+    print(f"{crawled} entities recrawled, {writer.count} records written", file=sys.stderr)
+    return 0
+
+
+def _skill_tagger(skills):
+    if not skills:
+        return None
+    return SkillTagger.default() if skills == "default" else SkillTagger.from_file(skills)
+
+
+def find_jobs(args) -> int:
+    """Print the best matches of a query in a job index as JSON lines"""
+    with JobIndex(args.index) as index:
+        for hit in index.search(args.query, limit=args.limit, match_all=not args.any, snippets=True):
+            print(json.dumps(hit._asdict()))
+    return 0
+
+
+def _common_options() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("items", nargs="*", help="Inputs, in addition to those read from --input")
+    parser.add_argument("-i", "--input", help="File with one input per line, '-' for stdin")
+    parser.add_argument("-o", "--output", help="Output file, stdout by default")
+    parser.add_argument("-f", "--format", choices=FORMATS, default=JSONL, help="Output format (default: jsonl)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Parallel browser sessions (default: 1)")
+    parser.add_argument("--resume", action="store_true", help="Skip inputs finished by a previous run and append")
+    parser.add_argument("--failures", help="Append failed inputs to this dead letter file")
+    parser.add_argument("--store", help="Also upsert records into this SQLite entity store")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome without a window")
+    parser.add_argument("--email", default=os.environ.get("LINKEDIN_USERNAME"),
+                        help="Login email (default: $LINKEDIN_USERNAME)")
+    parser.add_argument("--password", default=os.environ.get("LINKEDIN_PASSWORD"),
+                        help="Login password (default: $LINKEDIN_PASSWORD)")
+    parser.add_argument("--cookie", default=os.environ.get("LINKEDIN_COOKIE"),
+                        help="li_at cookie, used instead of email and password (default: $LINKEDIN_COOKIE)")
+    parser.add_argument("--accounts", help="JSON file of accounts to spread the work over, each with a daily page "
+                                           "budget, instead of a single login")
+    parser.add_argument("--max-restarts", type=int, default=3,
+                        help="Browser restarts or logins in a row to bring a crashed or logged out session "
+                             "back, per input (default: 3)")
+    parser.add_argument("--log-level", default="INFO", help="Logging level (default: INFO)")
+    parser.add_argument("--log-json", action="store_true", help="Log JSON lines")
+    return parser
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = _common_options()
+    parser = argparse.ArgumentParser(prog="linkedin-scraper", description="Scrape LinkedIn jobs, people and companies")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    jobs = commands.add_parser("jobs", help="Search and scrape job postings")
+    job_commands = jobs.add_subparsers(dest="jobs_command", required=True)
+
+    search = job_commands.add_parser("search", parents=[common], help="Search jobs, one search term per input")
+    search.add_argument("--geoid", type=int, help="LinkedIn location identifier, e.g. 90009834 for Poland")
+    search.add_argument("--max-pages", type=int, default=10, help="Result pages per search (default: 10)")
+    search.add_argument("--delay", type=float, default=3, help="Seconds between page loads (default: 3)")
+    search.add_argument("--since", metavar="MARKS",
+                        help="Only fetch jobs posted since the previous run with the same MARKS file, "
+                             "most recent first, stopping at the first page of older jobs")
+    search.set_defaults(scrape=_search_jobs, stage=SEARCH_PAGE)
+
+    enrich = job_commands.add_parser("enrich", parents=[common],
+                                     help="Scrape job details, one job URL or search result per input")
+    enrich.set_defaults(scrape=_enrich_job, stage=JOB)
+    for job_parser in (search, enrich):
+        job_parser.add_argument("--index", help="Also add the jobs to this full-text search index")
+        job_parser.add_argument("--skills", nargs="?", const="default",
+                                help="Add the skills mentioned in each job, from this JSON skill dictionary "
+                                     "or the built-in one")
+
+    find = job_commands.add_parser("find", help="Search a job index built with --index, best matches first")
+    find.add_argument("query", help="Words to look for, e.g. 'title:python airflow data*'")
+    find.add_argument("--index", required=True, help="Job index file")
+    find.add_argument("--limit", type=int, default=20, help="Maximum number of matches (default: 20)")
+    find.add_argument("--any", action="store_true", help="Match any word instead of all of them")
+    find.add_argument("--log-level", default="WARNING", help="Logging level (default: WARNING)")
+    find.set_defaults(handler=find_jobs, log_json=False)
+
+    recrawl = commands.add_parser("recrawl", parents=[common],
+                                  help="Recrawl tracked jobs, profiles and companies as they go stale, "
+                                       "tracking the job, profile and company URLs given as inputs")
+    recrawl.add_argument("--schedule", required=True, help="SQLite file with the tracked entities and their history")
+    recrawl.add_argument("--pages-per-hour", type=float, default=120,
+                         help="Page budget of all workers together (default: 120)")
+    recrawl.add_argument("--min-staleness", type=float, default=0.0,
+                         help="Skip entities less likely than this to have changed (default: 0)")
+    recrawl.add_argument("--batches", type=int, help="Stop after this many batches per worker (default: never)")
+    recrawl.set_defaults(handler=recrawl_tracked)
+
+    people = commands.add_parser("people", parents=[common], help="Scrape profiles, one profile URL per input")
+    people.add_argument("--parallel-tabs", action="store_true",
+                        help="Load a profile's experience and education pages side by side in new tabs")
+    people.set_defaults(scrape=_scrape_person, stage=PERSON)
+
+    companies = commands.add_parser("companies", parents=[common], help="Scrape companies, one company URL per input")
+    companies.add_argument("--employees", action="store_true", help="Also scrape the employee list")
+    companies.set_defaults(scrape=_scrape_company, stage=COMPANY)
+    return parser
+
+
+def _missing_credentials(args) -> bool:
+    if args.accounts:
+        return False
+    if not args.cookie and not (args.email and args.password):
+        logger.error("Set --email and --password (or LINKEDIN_USERNAME and LINKEDIN_PASSWORD), or --cookie")
+        return True
+    return False
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level.upper(), json_output=args.log_json)
+    if getattr(args, "handler", None) is not None:
+        return args.handler(args)
+    if _missing_credentials(args):
+        return 2
+    try:
+        return run(args, args.scrape, args.stage)
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,3 @@
-import requests
-from lxml import html
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -10,6 +8,9 @@ from .person import Person
 import time
 import os
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 AD_BANNER_CLASSNAME = ('ad-banner-container', '__ad')
 
@@ -120,6 +121,12 @@ class Company(Scraper):
 
     def get_employees(self, wait_time=10):
         total = []
+        # A watchdog supervising the driver brings a crashed or logged out session back,
+        # after which the list is walked again from the top, skipping the employees in total
+        self.supervised(self._walk_employees, total, wait_time)
+        return total
+
+    def _walk_employees(self, total, wait_time):
         list_css = "list-style-none"
         next_xpath = '//button[@aria-label="Next"]'
         driver = self.driver
@@ -128,7 +135,7 @@ class Company(Scraper):
             see_all_employees = driver.find_element(By.XPATH,'//a[@data-control-name="topcard_see_all_employees"]')
         except:
             pass
-        driver.get(os.path.join(self.linkedin_url, "people"))
+        self.get_page(os.path.join(self.linkedin_url, "people"))
 
         _ = WebDriverWait(driver, 3).until(EC.presence_of_all_elements_located((By.XPATH, '//span[@dir="ltr"]')))
 
@@ -139,7 +146,7 @@ class Company(Scraper):
 
         results_list = driver.find_element(By.CLASS_NAME, list_css)
         results_li = results_list.find_elements(By.TAG_NAME, "li")
-        for res in results_li:
+        for res in results_li[len(total):]:
             total.append(self.__parse_employee__(res))
 
         def is_loaded(previous_results):
@@ -155,8 +162,9 @@ class Company(Scraper):
 
         def get_data(previous_results):
             results_li = results_list.find_elements(By.TAG_NAME, "li")
-            for res in results_li[previous_results:]:
+            for res in results_li[max(previous_results, len(total)):]:
                 total.append(self.__parse_employee__(res))
+            return len(results_li)
 
         results_li_len = len(results_li)
         while is_loaded(results_li_len):
@@ -175,16 +183,12 @@ class Company(Scraper):
             driver.execute_script("window.scrollTo(0, Math.ceil(document.body.scrollHeight));")
             time.sleep(1)
 
-            get_data(results_li_len)
-            results_li_len = len(total)
-        return total
-
-
+            results_li_len = get_data(results_li_len)
 
     def scrape_logged_in(self, get_employees = True, close_on_complete = True):
         driver = self.driver
 
-        driver.get(self.linkedin_url)
+        self.get_page(self.linkedin_url)
 
         _ = WebDriverWait(driver, 3).until(EC.presence_of_all_elements_located((By.XPATH, '//div[@dir="ltr"]')))
 
@@ -199,7 +203,7 @@ class Company(Scraper):
             navigation.find_elements(By.XPATH, "//a[@data-control-name='org_about_module_see_all_view_link']"),
           ).click()
         except:
-          driver.get(os.path.join(self.linkedin_url, "about"))
+          self.get_page(os.path.join(self.linkedin_url, "about"))
 
         _ = WebDriverWait(driver, 3).until(EC.presence_of_all_elements_located((By.TAG_NAME, 'section')))
         time.sleep(3)
@@ -211,7 +215,7 @@ class Company(Scraper):
        #section ID is no longer needed, we are using class name now.
         #grid = driver.find_elements_by_tag_name("section")[section_id]
         grid = driver.find_element(By.CLASS_NAME, "artdeco-card.org-page-details-module__card-spacing.artdeco-card.org-about-module__margin-bottom")
-        print(grid)
+        logger.debug("Company about grid: %s", grid)
         descWrapper = grid.find_elements(By.TAG_NAME, "p")
         if len(descWrapper) > 0:
             self.about_us = descWrapper[0].text.strip()
@@ -286,10 +290,11 @@ class Company(Scraper):
         if get_employees:
             self.employees = self.get_employees()
 
-        driver.get(self.linkedin_url)
+        # get_employees may have replaced a dead driver
+        self.driver.get(self.linkedin_url)
 
         if close_on_complete:
-            driver.close()
+            self.driver.close()
 
     def scrape_not_logged_in(self, close_on_complete = True, retry_limit = 10, get_employees = True):
         driver = self.driver
@@ -346,10 +351,30 @@ class Company(Scraper):
         if get_employees:
             self.employees = self.get_employees()
 
-        driver.get(self.linkedin_url)
+        # get_employees may have replaced a dead driver
+        self.driver.get(self.linkedin_url)
 
         if close_on_complete:
-            driver.close()
+            self.driver.close()
+
+    def to_dict(self):
+        return {
+            "linkedin_url": self.linkedin_url,
+            "name": self.name,
+            "about_us": self.about_us,
+            "specialties": self.specialties,
+            "website": self.website,
+            "phone": self.phone,
+            "industry": self.industry,
+            "company_type": self.company_type,
+            "headquarters": self.headquarters,
+            "company_size": self.company_size,
+            "founded": self.founded,
+            "headcount": self.headcount,
+            "showcase_pages": [vars(page).copy() for page in self.showcase_pages],
+            "affiliated_companies": [vars(company).copy() for company in self.affiliated_companies],
+            "employees": self.employees,
+        }
 
     def __repr__(self):
         _output = {}
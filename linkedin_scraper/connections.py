@@ -0,0 +1,130 @@
+import logging
+import time
+from typing import Iterator
+
+from selenium.webdriver.common.by import By
+
+from .objects import Contact, Scraper
+from .log import elapsed_ms
+
+logger = logging.getLogger(__name__)
+
+CONNECTIONS_URL = "https://www.linkedin.com/mynetwork/invite-connect/connections/"
+
+# Cards from index arguments[0] on, so each batch only reads what the last scroll rendered
+_READ_CARDS_JS = """
+const cards = document.getElementsByClassName('mn-connection-card');
+const rows = [];
+for (let i = arguments[0]; i < cards.length; i++) {
+    const link = cards[i].querySelector('.mn-connection-card__link');
+    const name = cards[i].querySelector('.mn-connection-card__name');
+    const occupation = cards[i].querySelector('.mn-connection-card__occupation');
+    rows.push([
+        link ? link.href : null,
+        name ? name.textContent.trim() : null,
+        occupation ? occupation.textContent.trim() : null,
+    ]);
+}
+return rows;
+"""
+
+_COUNT_CARDS_JS = "return document.getElementsByClassName('mn-connection-card').length;"
+
+# Past a few hundred cards LinkedIn stops loading on scroll and shows a button instead
+_LOAD_MORE_JS = """
+window.scrollTo(0, document.body.scrollHeight);
+const button = document.querySelector('.scaffold-finite-scroll__load-button');
+if (button && !button.disabled) { button.click(); }
+"""
+
+
+class ConnectionsCrawler(Scraper):
+    """
+    Streams the logged in account's connections as Contact objects.
+
+    The list is scrolled incrementally and each batch reads only the cards rendered since
+    the previous one, in a single script call. cursor is the url of the last contact
+    yielded and position its place in the list; pass them as resume_after and
+    resume_position to continue an interrupted crawl. The list only grows by scrolling,
+    so a resumed crawl still scrolls down to position, but only counts the cards on the
+    way and starts reading a few cards before it (connections removed since move the
+    cursor up; ones added since are skipped like the cards before the cursor). Without
+    resume_position, every card is read until resume_after turns up.
+    """
+
+    # Cards read before resume_position, in case connections were removed since
+    resume_slack = 50
+
+    def __init__(self, driver, max_count: int = None, resume_after: str = None, resume_position: int = None,
+                 scroll_pause: float = 1.5, max_idle_scrolls: int = 3):
+        super().__init__()
+        self.driver = driver
+        self.max_count = max_count
+        self.resume_after = resume_after
+        self.resume_position = resume_position
+        self.scroll_pause = scroll_pause
+        self.max_idle_scrolls = max_idle_scrolls
+        self.cursor = resume_after
+        self.position = resume_position or 0
+        self.count = 0
+        self.elapsed = 0.0
+
+    @property
+    def cards_per_second(self) -> float:
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def _scroll_to(self, position: int) -> int:
+        """Load more cards until position of them are rendered or the list ends; returns the count"""
+        rendered = self.driver.execute_script(_COUNT_CARDS_JS)
+        idle_scrolls = 0
+        while rendered < position and idle_scrolls <= self.max_idle_scrolls:
+            self.driver.execute_script(_LOAD_MORE_JS)
+            time.sleep(self.scroll_pause)
+            count = self.driver.execute_script(_COUNT_CARDS_JS)
+            idle_scrolls = 0 if count > rendered else idle_scrolls + 1
+            rendered = count
+        return rendered
+
+    def crawl(self) -> Iterator[Contact]:
+        if self.max_count is not None and self.max_count <= 0:
+            return
+        start = time.perf_counter()
+        self.get_page(CONNECTIONS_URL)
+        self.wait_for_element_to_load(by=By.CLASS_NAME, name="mn-connection-card")
+
+        skipping = self.resume_after is not None
+        offset = 0
+        if skipping and self.resume_position:
+            offset = max(0, min(self.resume_position, self._scroll_to(self.resume_position)) - self.resume_slack)
+            logger.debug("Resuming %d cards down the list", offset, extra={"count": offset})
+        idle_scrolls = 0
+        try:
+            while True:
+                rows = self.driver.execute_script(_READ_CARDS_JS, offset)
+                first = offset
+                offset += len(rows)
+                idle_scrolls = 0 if rows else idle_scrolls + 1
+                if idle_scrolls > self.max_idle_scrolls:
+                    break
+
+                for index, (url, name, occupation) in enumerate(rows, start=first):
+                    if skipping:
+                        skipping = url != self.resume_after
+                        continue
+                    self.cursor = url
+                    self.position = index + 1
+                    self.count += 1
+                    yield Contact(name=name, occupation=occupation, url=url)
+                    if self.max_count is not None and self.count >= self.max_count:
+                        return
+
+                logger.debug("Read %d connection cards", offset, extra={"count": offset})
+                self.driver.execute_script(_LOAD_MORE_JS)
+                time.sleep(self.scroll_pause)
+        finally:
+            self.elapsed = time.perf_counter() - start
+            if skipping:
+                logger.warning("Resume cursor %s not found in %d connections", self.resume_after, offset,
+                               extra={"url": self.resume_after})
+            logger.info("Crawled %d connections (%.1f cards/s)", self.count, self.cards_per_second,
+                        extra={"count": self.count, "elapsed_ms": elapsed_ms(start)})
@@ -0,0 +1,282 @@
+import hashlib
+import re
+import sqlite3
+import struct
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .jobs import Job
+from .normalize import parse_job_id
+
+NEW = "new"
+DUPLICATE = "duplicate"
+NEAR_DUPLICATE = "near_duplicate"
+
+_EMPTY = 1 << 63
+_NON_WORD_RE = re.compile(r"[^\w]+", re.UNICODE)
+_PLACEHOLDER_DESCRIPTIONS = {"", "description not available", "unknown", "error"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    job_id INTEGER PRIMARY KEY,
+    key_hash TEXT NOT NULL,
+    signature BLOB
+);
+CREATE INDEX IF NOT EXISTS postings_key_hash ON postings (key_hash);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    job_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lsh_buckets_band_bucket ON lsh_buckets (band, bucket);
+"""
+
+
+@dataclass
+class DedupResult:
+    status: str
+    job_id: Optional[int] = None
+    duplicate_of: Optional[int] = None
+    similarity: Optional[float] = None
+
+    @property
+    def is_new(self):
+        return self.status == NEW
+
+
+def normalize_text(text) -> str:
+    if not isinstance(text, str):
+        return ""
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+class MinHasher(object):
+    """
+    One-permutation MinHash signatures over word shingles.
+
+    Each shingle is hashed once with a stable (process independent) hash; the hash
+    space is split into num_perm bins and the signature keeps the minimum of each bin.
+    Empty bins borrow from the next filled bin (rotation densification), so short
+    texts still produce comparable signatures. Cost is linear in the number of shingles.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+    def shingles(self, text: str) -> set:
+        """Word shingles of text, which is expected to be normalize_text() output"""
+        words = text.split()
+        size = self.shingle_size
+        if len(words) <= size:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        hashes = {zlib.crc32(shingle.encode("utf-8")) for shingle in self.shingles(text)}
+        if not hashes:
+            return None
+        n = self.num_perm
+        bins = [_EMPTY] * n
+        for h in hashes:
+            index, value = h % n, h // n
+            if value < bins[index]:
+                bins[index] = value
+        if _EMPTY not in bins:
+            return tuple(bins)
+        signature = list(bins)
+        for index in range(n):
+            if bins[index] != _EMPTY:
+                continue
+            step = 1
+            while bins[(index + step) % n] == _EMPTY:
+                step += 1
+            signature[index] = bins[(index + step) % n] + (step << 32)
+        return tuple(signature)
+
+    @staticmethod
+    def similarity(sig_a, sig_b) -> float:
+        """Estimated Jaccard similarity of the two shingle sets"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class JobDeduplicator(object):
+    """
+    Streaming exact and near-duplicate detection for job postings, persisted in SQLite
+    so it works across runs.
+
+    - Exact duplicates: the same LinkedIn job ID (in-memory set, O(1)), or the same
+      normalized (title, company, location, description) under a new job ID.
+    - Near duplicates: MinHash over job_description with an LSH band index, so a lookup
+      only compares against postings sharing at least one band bucket. Near duplicates
+      are indexed too, so each posting of a chain of small edits is matched against its
+      closest predecessor rather than only the first one.
+
+    A placeholder description ("Description not available") says nothing about the
+    posting, so such jobs are only matched on their job ID. Without an ID either they
+    can't be decided, and are reported as new without being indexed.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        commit_every: int = 1000,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.commit_every = commit_every
+        self._pending = 0
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        self._ids = {row[0] for row in self.conn.execute("SELECT job_id FROM postings")}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, job_id):
+        return job_id in self._ids
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    @staticmethod
+    def _normalized_fields(job: Job) -> List[str]:
+        return [
+            normalize_text(field)
+            for field in (job.job_title, job.company, job.location, job.job_description)
+        ]
+
+    @staticmethod
+    def _key_hash(fields: List[str]) -> str:
+        joined = "\x1f".join(fields)
+        return hashlib.blake2b(joined.encode("utf-8"), digest_size=16).hexdigest()
+
+    @classmethod
+    def job_key(cls, job: Job) -> str:
+        """Hash of the normalized (title, company, location, description) of a posting"""
+        return cls._key_hash(cls._normalized_fields(job))
+
+    @staticmethod
+    def _job_id(job: Job, key_hash: str, has_content: bool) -> Optional[int]:
+        job_id = parse_job_id(job.linkedin_url)
+        if job_id is None and has_content:
+            # No usable URL, derive a stable negative ID from the content instead
+            job_id = -(int(key_hash[:15], 16) or 1)
+        return job_id
+
+    def _band_buckets(self, signature) -> List[Tuple[int, int]]:
+        buckets = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(struct.pack(f"<{self.rows}Q", *chunk), digest_size=8).digest()
+            buckets.append((band, struct.unpack("<q", digest)[0]))
+        return buckets
+
+    def _lookup(self, job_id, key_hash, signature) -> DedupResult:
+        if job_id is None:
+            return DedupResult(NEW)
+        if job_id in self._ids:
+            return DedupResult(DUPLICATE, job_id, job_id, 1.0)
+        if signature is None:
+            # A placeholder description, so the content key isn't telling either
+            return DedupResult(NEW, job_id)
+
+        row = self.conn.execute(
+            "SELECT job_id FROM postings WHERE key_hash = ? LIMIT 1", (key_hash,)
+        ).fetchone()
+        if row:
+            # A repost: the same content under a new ID is an exact duplicate too
+            return DedupResult(DUPLICATE, job_id, row[0], 1.0)
+
+        candidates = set()
+        for band, bucket in self._band_buckets(signature):
+            candidates.update(
+                candidate for (candidate,) in self.conn.execute(
+                    "SELECT job_id FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket)
+                )
+            )
+        best_id, best_similarity = None, 0.0
+        for candidate in candidates:
+            (blob,) = self.conn.execute(
+                "SELECT signature FROM postings WHERE job_id = ?", (candidate,)
+            ).fetchone()
+            similarity = self.hasher.similarity(signature, array("Q", blob))
+            if similarity > best_similarity:
+                best_id, best_similarity = candidate, similarity
+        if best_id is not None and best_similarity >= self.threshold:
+            return DedupResult(NEAR_DUPLICATE, job_id, best_id, best_similarity)
+        return DedupResult(NEW, job_id)
+
+    def _analyze(self, job: Job):
+        fields = self._normalized_fields(job)
+        key_hash = self._key_hash(fields)
+        description = fields[-1]
+        if description in _PLACEHOLDER_DESCRIPTIONS:
+            signature = None
+        else:
+            signature = self.hasher.signature(description)
+        return self._job_id(job, key_hash, signature is not None), key_hash, signature
+
+    def check(self, job: Job) -> DedupResult:
+        """Classify a job against the index without adding it"""
+        return self._lookup(*self._analyze(job))
+
+    def _add(self, job_id, key_hash, signature):
+        blob = array("Q", signature).tobytes() if signature else None
+        self.conn.execute(
+            "INSERT OR IGNORE INTO postings (job_id, key_hash, signature) VALUES (?, ?, ?)",
+            (job_id, key_hash, blob),
+        )
+        if signature:
+            self.conn.executemany(
+                "INSERT INTO lsh_buckets (band, bucket, job_id) VALUES (?, ?, ?)",
+                [(band, bucket, job_id) for band, bucket in self._band_buckets(signature)],
+            )
+        self._ids.add(job_id)
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.conn.commit()
+            self._pending = 0
+
+    def add(self, job: Job):
+        """Add a job to the index unconditionally (unless its ID is already present, or unknown)"""
+        job_id, key_hash, signature = self._analyze(job)
+        if job_id is not None and job_id not in self._ids:
+            self._add(job_id, key_hash, signature)
+
+    def process(self, job: Job) -> DedupResult:
+        """Classify a job and add it to the index unless its ID is known already"""
+        job_id, key_hash, signature = self._analyze(job)
+        result = self._lookup(job_id, key_hash, signature)
+        if job_id is not None and job_id not in self._ids:
+            self._add(job_id, key_hash, signature)
+        return result
+
+    def filter(self, jobs: Iterable[Job]) -> Iterator[Job]:
+        """Yield only the new jobs of a stream, indexing them as they pass"""
+        for job in jobs:
+            if self.process(job).is_new:
+                yield job
+
+    def flag(self, jobs: Iterable[Job]) -> Iterator[Tuple[Job, DedupResult]]:
+        """Yield every job of a stream together with its classification"""
+        for job in jobs:
+            yield job, self.process(job)
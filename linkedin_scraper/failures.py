@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, Iterator, List, Tuple, Type
+
+from .rate_limit import ThrottleDetected
+from .watchdog import SessionLost
+
+logger = logging.getLogger(__name__)
+
+# Scraping stages a failure can come from
+SEARCH_PAGE = "search_page"
+JOB_CARD = "job_card"
+JOB = "job"
+PERSON = "person"
+COMPANY = "company"
+
+
+@dataclass
+class ScrapeFailure:
+    """
+    What went wrong while scraping an item, with enough context to re-run just that item.
+
+    context holds the arguments needed for a replay, e.g. the search parameters of a page.
+    """
+    error_class: str
+    message: str
+    stage: str
+    url: str = None
+    context: dict = field(default_factory=dict)
+    attempts: int = 1
+    failed_at: float = field(default_factory=time.time)
+    traceback: str = None
+
+    @classmethod
+    def from_exception(cls, e: Exception, stage: str, url: str = None, **context) -> "ScrapeFailure":
+        return cls(
+            error_class=type(e).__name__,
+            message=str(e),
+            stage=stage,
+            url=url,
+            context=context,
+            traceback="".join(traceback.format_exception(type(e), e, e.__traceback__)),
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How often and how patiently to retry a unit of work.
+
+    Exceptions in give_up_on are never retried (e.g. ThrottleDetected, where hammering
+    the same session only makes matters worse, or SessionLost, where a watchdog already
+    tried to bring the session back).
+    """
+    max_attempts: int = 3
+    backoff_seconds: float = 5
+    backoff_factor: float = 2
+    give_up_on: Tuple[Type[BaseException], ...] = (ThrottleDetected, SessionLost)
+
+    def delay(self, attempt: int) -> float:
+        return self.backoff_seconds * self.backoff_factor ** (attempt - 1)
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Call func, retrying on exceptions; the last exception is re-raised"""
+        attempt = 1
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except self.give_up_on:
+                raise
+            except Exception as e:
+                if attempt >= self.max_attempts:
+                    raise
+                delay = self.delay(attempt)
+                logger.warning("Attempt %d failed (%s: %s), retrying in %.0fs", attempt, type(e).__name__, e, delay)
+                time.sleep(delay)
+                attempt += 1
+
+
+class DeadLetterStore(object):
+    """
+    Append-only JSON lines file of ScrapeFailure records.
+
+    Failed items are written here instead of being mixed into the results, and can be
+    replayed later without re-running the whole scrape.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def add(self, failure: ScrapeFailure):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(failure.to_dict()) + "\n")
+
+    def __iter__(self) -> Iterator[ScrapeFailure]:
+        return iter(self._read()[0])
+
+    def _read(self, offset: int = 0) -> Tuple[List[ScrapeFailure], int]:
+        """The failures stored from offset on, and the offset of the end of the file"""
+        if not os.path.exists(self.path):
+            return [], 0
+        with open(self.path, encoding="utf-8") as f:
+            f.seek(offset)
+            failures = [ScrapeFailure(**json.loads(line)) for line in f.read().splitlines() if line.strip()]
+            return failures, f.tell()
+
+    @staticmethod
+    def _key(failure: ScrapeFailure) -> tuple:
+        return failure.stage, failure.url, json.dumps(failure.context, sort_keys=True, default=str)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def _rewrite(self, failures: List[ScrapeFailure]):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for failure in failures:
+                f.write(json.dumps(failure.to_dict()) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def replay(self, handlers: Dict[str, Callable], retry_policy: RetryPolicy = None,
+               max_attempts: int = None) -> list:
+        """
+        Re-run the stored failures.
+
+        Args:
+            handlers (Dict[str, Callable]): Per stage, a callable taking the ScrapeFailure
+                and returning its result
+            retry_policy (RetryPolicy, optional): Applied to each replayed item
+            max_attempts (int, optional): Skip failures that already failed this many times
+
+        Returns:
+            list: Results of the items that succeeded. Items failing again stay in the
+                store with their attempt count increased.
+
+        The handlers run without holding the store's lock, so they may add failures of
+        their own (a replayed search recording a failed job card); those are kept.
+        """
+        retry_policy = retry_policy or RetryPolicy(max_attempts=1)
+        results = []
+        remaining = []
+        with self._lock:
+            failures, offset = self._read()
+        for failure in failures:
+            handler = handlers.get(failure.stage)
+            if handler is None or (max_attempts is not None and failure.attempts >= max_attempts):
+                remaining.append(failure)
+                continue
+            try:
+                results.append(retry_policy.call(handler, failure))
+            except Exception as e:
+                again = ScrapeFailure.from_exception(e, failure.stage, failure.url, **failure.context)
+                again.attempts = failure.attempts + 1
+                remaining.append(again)
+        with self._lock:
+            added, _ = self._read(offset)
+            # A handler recording the very failure it raised would otherwise store it twice
+            replayed = {self._key(failure) for failure in remaining}
+            self._rewrite(remaining + [failure for failure in added if self._key(failure) not in replayed])
+        logger.info("Replayed %d of %d failures, %d remaining",
+                    len(failures) - len(remaining), len(failures), len(remaining))
+        return results
@@ -0,0 +1,156 @@
+from datetime import datetime
+from typing import Iterable, List, Union
+
+import pandas as pd
+
+from .enums import WorkplaceType, ExperienceLevel
+from .jobs import Job
+from .normalize import (
+    parse_applicant_count,
+    parse_experience_level,
+    parse_job_id,
+    parse_posted_date,
+    parse_workplace_type,
+)
+from .utils import list_of_job_to_pandas
+
+
+CATEGORICAL_COLUMNS = ["company", "company_linkedin_url", "location", "workplace_type", "experience"]
+
+
+def _map_unique(series: pd.Series, func) -> pd.Series:
+    """Apply func once per distinct value of series instead of once per row"""
+    uniques = series.dropna().unique()
+    return series.map(dict(zip(uniques, (func(value) for value in uniques))))
+
+
+class JobFrame(object):
+    """
+    Column-oriented container for large job result sets.
+
+    Jobs are stored as typed pandas columns (int64 job IDs, categoricals for the
+    repetitive string fields, datetime64 posting times), so dedup, filtering and
+    grouping run as vectorized operations instead of Python loops over Job objects.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Job], now: datetime = None) -> "JobFrame":
+        """
+        Build a JobFrame from Job objects.
+
+        Args:
+            jobs (Iterable[Job]): Jobs to convert
+            now (datetime, optional): Reference time for relative posted dates
+
+        Returns:
+            JobFrame: The typed frame
+        """
+        return cls.from_dataframe(list_of_job_to_pandas(jobs), now=now)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, now: datetime = None) -> "JobFrame":
+        """Type the columns of a frame produced by utils.list_of_job_to_pandas"""
+        now = now or datetime.now()
+        df = df.copy()
+
+        df.insert(0, "job_id", _map_unique(df["linkedin_url"], parse_job_id).astype("Int64"))
+        df["posted_at"] = pd.to_datetime(
+            _map_unique(df["posted_date"], lambda text: parse_posted_date(text, now))
+        )
+        df["applicant_total"] = _map_unique(
+            df["applicant_count"].astype("object"), parse_applicant_count
+        ).astype("Int64")
+        df["workplace"] = _map_unique(df["workplace_type"], parse_workplace_type).astype("Int8")
+        df["experience_level"] = _map_unique(df["experience"], parse_experience_level).astype("Int8")
+
+        for column in CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype("category")
+        return cls(df)
+
+    def __len__(self):
+        return len(self.df)
+
+    def __repr__(self):
+        return f"<JobFrame {len(self)} jobs>"
+
+    def dedup(self, subset: Union[str, List[str]] = "job_id", keep: str = "first") -> "JobFrame":
+        """
+        Drop duplicate jobs. Rows with a null in any subset column (e.g. no job ID, because
+        the URL was "Unknown") can't be told apart and are all kept.
+
+        Args:
+            subset (Union[str, List[str]]): Column(s) identifying a job, the job ID by default
+            keep (str): Which duplicate to keep, as in pandas.DataFrame.drop_duplicates
+
+        Returns:
+            JobFrame: A new frame without duplicates
+        """
+        df = self.df
+        columns = [subset] if isinstance(subset, str) else list(subset)
+        known = df[columns].notna().all(axis=1)
+        duplicated = df[known].duplicated(subset=columns, keep=keep).reindex(df.index, fill_value=False)
+        return JobFrame(df[~duplicated])
+
+    def filter(
+        self,
+        workplace_types: List[Union[int, WorkplaceType]] = None,
+        experience_levels: List[Union[int, ExperienceLevel]] = None,
+        companies: List[str] = None,
+        locations: List[str] = None,
+        posted_after: datetime = None,
+        min_applicants: int = None,
+        max_applicants: int = None,
+    ) -> "JobFrame":
+        """
+        Select jobs matching every given criterion. Criteria left as None are ignored.
+
+        Returns:
+            JobFrame: A new frame with the matching jobs
+        """
+        df = self.df
+        mask = pd.Series(True, index=df.index)
+        if workplace_types:
+            mask &= df["workplace"].isin([int(wt) for wt in workplace_types]).fillna(False)
+        if experience_levels:
+            mask &= df["experience_level"].isin([int(exp) for exp in experience_levels]).fillna(False)
+        if companies:
+            mask &= df["company"].isin(companies)
+        if locations:
+            mask &= df["location"].isin(locations)
+        if posted_after is not None:
+            mask &= (df["posted_at"] >= pd.Timestamp(posted_after)).fillna(False)
+        if min_applicants is not None:
+            mask &= (df["applicant_total"] >= min_applicants).fillna(False)
+        if max_applicants is not None:
+            mask &= (df["applicant_total"] <= max_applicants).fillna(False)
+        return JobFrame(df[mask.astype(bool)])
+
+    def posting_age(self, now: datetime = None) -> pd.Series:
+        """Age of each posting as a timedelta64 column"""
+        return pd.Timestamp(now or datetime.now()) - self.df["posted_at"]
+
+    def group_by(self, column: Union[str, List[str]] = "company") -> pd.DataFrame:
+        """
+        Summarize jobs per group.
+
+        Returns:
+            pandas.DataFrame: Job count, newest posting and mean applicants per group
+        """
+        grouped = self.df.groupby(column, observed=True)
+        return grouped.agg(
+            jobs=("job_id", "size"),
+            newest_posting=("posted_at", "max"),
+            mean_applicants=("applicant_total", "mean"),
+        ).sort_values("jobs", ascending=False)
+
+    def group_by_company(self) -> pd.DataFrame:
+        return self.group_by("company")
+
+    def to_jobs(self) -> List[Job]:
+        """Convert back into (unscraped) Job objects"""
+        columns = list(Job(scrape=False).to_dict().keys())
+        records = self.df[columns].astype("object").where(self.df[columns].notna(), None)
+        return [Job(scrape=False, **record) for record in records.to_dict("records")]
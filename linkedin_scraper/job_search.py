@@ -1,14 +1,21 @@
-import os
+import logging
+import math
+from datetime import datetime
 from typing import List, Union
 from time import sleep
-import urllib.parse
 import time
 import random  # Add this import for random delays
 
 from .objects import Scraper
-from . import constants as c
 from .jobs import Job
 from .enums import WorkplaceType, ExperienceLevel  # Add this import
+from .normalize import match_insights, normalize_job, parse_job_id, parse_result_count
+from .dedup import JobDeduplicator
+from .query import HighWaterMarks, JobQuery, SearchPlan
+from .rate_limit import ThrottleDetected, detect_throttle, EMPTY_RESULTS, MISSING_ELEMENT
+from .failures import ScrapeFailure, RetryPolicy, DeadLetterStore, SEARCH_PAGE, JOB_CARD
+from .log import elapsed_ms
+from .watchdog import SessionLost
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
@@ -16,6 +23,11 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 
+logger = logging.getLogger(__name__)
+
+# Added to the posted date filter of incremental searches, for jobs posted while the last run was paging
+POSTED_WITHIN_SLACK_SECONDS = 5 * 60
+
 
 class JobSearch(Scraper):
     AREAS = ["recommended_jobs", None, "still_hiring", "more_jobs"]
@@ -27,10 +39,20 @@ class JobSearch(Scraper):
         close_on_complete=False,
         scrape=True,
         scrape_recommended_jobs=True,
+        query_cache=None,
+        dead_letters=None,
     ):
         super().__init__()
         self.driver = driver
         self.base_url = base_url
+        self.query_cache = query_cache
+        self.dead_letters = dead_letters
+        self.failures = []
+        # Result count of the last search page loaded, and the plan of the last multi-page search
+        self.last_result_count = None
+        self.last_plan = None
+        # (URL, current URL) of the page estimate_results left loaded, for search() to reuse
+        self._estimate_page = None
 
         if scrape:
             self.scrape(close_on_complete, scrape_recommended_jobs)
@@ -70,10 +92,43 @@ class JobSearch(Scraper):
                 return full_url
         except (IndexError, AttributeError):
             # In case of any parsing error, return the original URL
-            print(f"Warning: Could not parse job URL: {full_url}")
+            logger.warning("Could not parse job URL: %s", full_url, extra={"url": full_url})
             return full_url
     
     
+    def _record_failure(self, failure: ScrapeFailure):
+        self.failures.append(failure)
+        if self.dead_letters is not None:
+            self.dead_letters.add(failure)
+
+    @staticmethod
+    def _search_context(query: JobQuery) -> dict:
+        """Arguments re-creating the search() call for query"""
+        return dict(
+            search_term=query.keywords,
+            geoid=query.geoid,
+            current_page_index=query.page,
+            workplace_types=list(query.workplace_types) or None,
+            experience_levels=list(query.experience_levels) or None,
+            sort_by=query.sort_by,
+            posted_within=query.posted_within,
+        )
+
+    def _job_card_url(self, job_card):
+        """The job URL of a card, from its title link or else its job ID attribute"""
+        try:
+            href = job_card.find_element(By.CLASS_NAME, "artdeco-entity-lockup__title").find_element(
+                By.TAG_NAME, "a"
+            ).get_attribute("href")
+            return self._extract_clean_job_url(href)
+        except Exception:
+            pass
+        try:
+            job_id = job_card.get_attribute("data-job-id")
+        except Exception:
+            return None
+        return f"https://www.linkedin.com/jobs/view/{job_id}" if job_id and job_id.isdigit() else None
+
     def _extract_job_title(self, text_content):
         import re
         if not text_content:
@@ -92,163 +147,137 @@ class JobSearch(Scraper):
             return first_line.strip()
 
     def scrape_job_card(self, base_element) -> Job:
+        """
+        Scrape a job card of a search results page, clicking it to load the details pane.
+
+        Raises the underlying exception if the card itself can't be read; search()
+        turns that into a ScrapeFailure.
+        """
+        job_div = self.wait_for_element_to_load(
+            name="artdeco-entity-lockup__title", base=base_element
+        )
+        
+        # Try multiple click strategies to handle click interception
+        clicked = False
+        
+        # Strategy 1: Scroll to element and try regular click
         try:
-            job_div = self.wait_for_element_to_load(
-                name="artdeco-entity-lockup__title", base=base_element
-            )
-            
-            # Try multiple click strategies to handle click interception
-            clicked = False
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", base_element)
+            sleep(0.5)  # Brief pause after scrolling
+            base_element.click()
+            clicked = True
+        except Exception as e1:
+            logger.debug("Regular click failed: %s", e1)
             
-            # Strategy 1: Scroll to element and try regular click
+            # Strategy 2: Use JavaScript click
             try:
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", base_element)
-                sleep(0.5)  # Brief pause after scrolling
-                base_element.click()
+                self.driver.execute_script("arguments[0].click();", base_element)
                 clicked = True
-            except Exception as e1:
-                print(f"Regular click failed: {e1}")
+                logger.debug("Used JavaScript click as fallback")
+            except Exception as e2:
+                logger.debug("JavaScript click failed: %s", e2)
                 
-                # Strategy 2: Use JavaScript click
+                # Strategy 3: Try clicking the job title link directly
                 try:
-                    self.driver.execute_script("arguments[0].click();", base_element)
+                    a_tag = job_div.find_element(By.TAG_NAME, "a")
+                    self.driver.execute_script("arguments[0].click();", a_tag)
                     clicked = True
-                    print("Used JavaScript click as fallback")
-                except Exception as e2:
-                    print(f"JavaScript click failed: {e2}")
-                    
-                    # Strategy 3: Try clicking the job title link directly
-                    try:
-                        a_tag = job_div.find_element(By.TAG_NAME, "a")
-                        self.driver.execute_script("arguments[0].click();", a_tag)
-                        clicked = True
-                        print("Clicked job title link as fallback")
-                    except Exception as e3:
-                        print(f"Job title link click failed: {e3}")
-            
-            if not clicked:
-                print("Warning: Could not click job card, proceeding with available data")
-            
-            job_title = self._extract_job_title(job_div.text.strip())
-            
-            # Extract the job ID path and create a clean LinkedIn URL
-            try:
-                a_tag = job_div.find_element(By.TAG_NAME, "a")
-                linkedin_url = self._extract_clean_job_url(a_tag.get_attribute("href"))
-            except Exception as e:
-                print(f"Warning: Could not extract job URL: {e}")
-                linkedin_url = "Unknown"
+                    logger.debug("Clicked job title link as fallback")
+                except Exception as e3:
+                    logger.debug("Job title link click failed: %s", e3)
+        
+        if not clicked:
+            logger.warning("Could not click job card, proceeding with available data")
+        
+        job_title = self._extract_job_title(job_div.text.strip())
+        
+        # Extract the job ID path and create a clean LinkedIn URL
+        try:
+            a_tag = job_div.find_element(By.TAG_NAME, "a")
+            linkedin_url = self._extract_clean_job_url(a_tag.get_attribute("href"))
+        except Exception as e:
+            logger.warning("Could not extract job URL: %s", e)
+            linkedin_url = "Unknown"
 
-            try:
-                company = base_element.find_element(
-                    By.CLASS_NAME, "artdeco-entity-lockup__subtitle"
-                ).text
-            except Exception:
-                company = "Unknown"
+        try:
+            company = base_element.find_element(
+                By.CLASS_NAME, "artdeco-entity-lockup__subtitle"
+            ).text
+        except Exception:
+            company = "Unknown"
+        
+        try:
+            company_element = self.driver.find_element(
+                By.CLASS_NAME, "job-details-jobs-unified-top-card__company-name"
+            )
+            company_a_tag = company_element.find_element(By.TAG_NAME, "a")
+            company_linkedin_url = company_a_tag.get_attribute("href")
+        except Exception:
+            company_linkedin_url = "Unknown"
+
+        # Handle posted date extraction with safer list access
+        posted_date = "Unknown"
+        applicant_count = "Unknown"
+        try:
+            description_container = self.driver.find_element(
+                By.CLASS_NAME, "job-details-jobs-unified-top-card__primary-description-container"
+            )
+            low_emphasis_elements = description_container.find_elements(
+                By.CLASS_NAME, "tvm__text--low-emphasis"
+            )
             
-            try:
-                company_element = self.driver.find_element(
-                    By.CLASS_NAME, "job-details-jobs-unified-top-card__company-name"
-                )
-                company_a_tag = company_element.find_element(By.TAG_NAME, "a")
-                company_linkedin_url = company_a_tag.get_attribute("href")
-            except Exception:
-                company_linkedin_url = "Unknown"
-
-            # Handle posted date extraction with safer list access
-            posted_date = "Unknown"
-            applicant_count = "Unknown"
-            try:
-                description_container = self.driver.find_element(
-                    By.CLASS_NAME, "job-details-jobs-unified-top-card__primary-description-container"
-                )
-                low_emphasis_elements = description_container.find_elements(
-                    By.CLASS_NAME, "tvm__text--low-emphasis"
-                )
-                
-                # Check if we have enough elements before accessing specific indices
-                if len(low_emphasis_elements) > 2:
-                    posted_date = low_emphasis_elements[2].text.strip()
-                if len(low_emphasis_elements) > 4:
-                    applicant_count = low_emphasis_elements[4].text.strip()
-            except Exception as e:
-                print(f"Warning: Could not extract posted date or applicant count: {e}")
+            # Check if we have enough elements before accessing specific indices
+            if len(low_emphasis_elements) > 2:
+                posted_date = low_emphasis_elements[2].text.strip()
+            if len(low_emphasis_elements) > 4:
+                applicant_count = low_emphasis_elements[4].text.strip()
+        except Exception as e:
+            logger.debug("Could not extract posted date or applicant count: %s", e)
 
-            # Get the job insights text
-            workplace_type = "Unknown"
-            experience = "Unknown"
-            try:
-                job_insight_element = self.driver.find_element(
-                    By.CLASS_NAME, "job-details-jobs-unified-top-card__job-insight"
-                )
-                job_insight_text = job_insight_element.text
-                
-                # Find workplace type in the text
-                for wt in c.WORKPLACE_TYPES:
-                    if wt in job_insight_text:
-                        workplace_type = wt
-                        break
-                        
-                # Find experience level in the text
-                for exp in c.EXPERIENCE_LEVELS:
-                    if exp in job_insight_text:
-                        experience = exp
-                        break
-            except Exception:
-                # If job insights can't be found, leave defaults
-                pass
+        # Get the job insights text
+        workplace_type = "Unknown"
+        experience = "Unknown"
+        try:
+            job_insight_element = self.driver.find_element(
+                By.CLASS_NAME, "job-details-jobs-unified-top-card__job-insight"
+            )
+            found_workplace_type, found_experience = match_insights(job_insight_element.text)
+            workplace_type = found_workplace_type or workplace_type
+            experience = found_experience or experience
+        except Exception:
+            # If job insights can't be found, leave defaults
+            pass
 
-            try:
-                location = base_element.find_element(
-                    By.CLASS_NAME, "job-card-container__metadata-wrapper"
-                ).text
-            except Exception:
-                location = "Unknown"
+        try:
+            location = base_element.find_element(
+                By.CLASS_NAME, "job-card-container__metadata-wrapper"
+            ).text
+        except Exception:
+            location = "Unknown"
 
-            try:
-                job_descriptions = self.driver.find_element(By.ID, "job-details").text
-            except Exception:
-                job_descriptions = "Description not available"
-                
-            job = Job(
-                linkedin_url=linkedin_url,
-                job_title=job_title,
-                company=company,
-                company_linkedin_url=company_linkedin_url,
-                location=location,
-                posted_date=posted_date,
-                applicant_count=applicant_count,
-                job_description=job_descriptions,
-                scrape=False,
-                workplace_type=workplace_type,
-                experience=experience,
-                driver=self.driver,
-            )
-            return job
-        except Exception as e:
-            print(f"Unexpected error in scrape_job_card: {e}")
-            import traceback
-            traceback.print_exc()
+        try:
+            job_descriptions = self.driver.find_element(By.ID, "job-details").text
+        except Exception:
+            job_descriptions = "Description not available"
             
-            # Create a minimal job object with what we know
-            return Job(
-                linkedin_url="Error",
-                job_title=f"Error: {str(e)}",
-                company="Error",
-                company_linkedin_url="Error",
-                location="Error",
-                posted_date="Error",
-                applicant_count="Error",
-                job_description=f"Error occurred while scraping: {str(e)}",
-                scrape=False,
-                workplace_type="Error",
-                experience="Error",
-                driver=self.driver,
-            )
+        job = Job(
+            linkedin_url=linkedin_url,
+            job_title=job_title,
+            company=company,
+            company_linkedin_url=company_linkedin_url,
+            location=location,
+            posted_date=posted_date,
+            applicant_count=applicant_count,
+            job_description=job_descriptions,
+            scrape=False,
+            workplace_type=workplace_type,
+            experience=experience,
+            driver=self.driver,
+        )
+        return normalize_job(job)
 
     def scrape_logged_in(self, close_on_complete=True, scrape_recommended_jobs=True):
-        driver = self.driver
-        driver.get(self.base_url)
+        self.get_page(self.base_url)
         if scrape_recommended_jobs:
             self.focus()
             sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
@@ -271,22 +300,76 @@ class JobSearch(Scraper):
                 setattr(self, area_name, area_results)
         return
 
-    def scroll_to_bottom_job_list(self, job_listing_class_name):
-        self.scroll_class_name_element_to_page_percent(job_listing_class_name, 0.3)
-        self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+    def scroll_to_bottom_job_list(self, job_listing_class_name, fraction=1.0):
+        """Scroll the result list down in steps, until fraction of it has been rendered"""
+        for percent in (0.3, 0.6, 1):
+            self.scroll_class_name_element_to_page_percent(job_listing_class_name, percent)
+            self.focus()
+            sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+            if percent >= fraction:
+                break
 
-        self.scroll_class_name_element_to_page_percent(job_listing_class_name, 0.6)
-        self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+    def _read_result_count(self):
+        """The result count shown above the result list, None if there is none"""
+        try:
+            elements = self.driver.find_elements(By.CLASS_NAME, "jobs-search-results-list__subtitle")
+            return parse_result_count(elements[0].text) if elements else None
+        except Exception as e:
+            logger.debug("Could not read the result count: %s", e)
+            return None
 
-        self.scroll_class_name_element_to_page_percent(job_listing_class_name, 1)
-        self.focus()
-        sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
+    def _wait_for_job_listing(self, job_listing_class_name):
+        try:
+            return self.wait_for_element_to_load(name=job_listing_class_name)
+        except TimeoutException:
+            signal = detect_throttle(self.driver)
+            if signal is not None:
+                self.get_rate_limiter().record_throttle(signal)
+                raise ThrottleDetected(signal, self.driver.current_url)
+            self.get_rate_limiter().record_soft_signal(MISSING_ELEMENT)
+            raise
+
+    def estimate_results(self, search_term: str, geoid: int,
+                         workplace_types: List[Union[int, WorkplaceType]] = None,
+                         experience_levels: List[Union[int, ExperienceLevel]] = None,
+                         posted_within: int = None):
+        """
+        Number of results of a search, as shown on its first page, without scrolling or
+        scraping any job card. LinkedIn serves at most JobQuery.MAX_RESULTS of them.
+
+        The page stays loaded, and a search() of its first page right after scrapes it
+        instead of loading it again.
+
+        Returns:
+            Optional[int]: The result count, None if the page didn't show one
+        """
+        query = JobQuery.create(search_term, geoid, workplace_types=workplace_types,
+                                experience_levels=experience_levels, posted_within=posted_within)
+        started = time.perf_counter()
+        url = query.url(self.base_url)
+        self.get_page(url)
+        self._wait_for_job_listing("scaffold-layout__list")
+        self.last_result_count = self._read_result_count()
+        self._estimate_page = (url, self.driver.current_url)
+        logger.info("'%s' has %s results", query.keywords, self.last_result_count,
+                    extra={"query": query.keywords, "count": self.last_result_count, "elapsed_ms": elapsed_ms(started)})
+        return self.last_result_count
+
+    def plan_search(self, search_term: str, geoid: int, max_pages: int = 10,
+                    workplace_types: List[Union[int, WorkplaceType]] = None,
+                    experience_levels: List[Union[int, ExperienceLevel]] = None) -> SearchPlan:
+        """
+        Pages search_multiple_pages needs for a search, from its result count. Pass the plan
+        to search_multiple_pages, which starts on the first page loaded here, or use
+        plan.result_count for capacity planning.
+        """
+        count = self.estimate_results(search_term, geoid, workplace_types, experience_levels)
+        return SearchPlan.create(count, max_pages)
 
     def search(self, search_term: str, geoid: int, current_page_index: int = 0, delay_seconds: int = 3, 
                workplace_types: List[Union[int, WorkplaceType]] = None, 
-               experience_levels: List[Union[int, ExperienceLevel]] = None) -> List[Job]:
+               experience_levels: List[Union[int, ExperienceLevel]] = None,
+               sort_by: str = None, posted_within: int = None) -> List[Job]:
         """
         Search for jobs on a single page with the given parameters
         
@@ -297,42 +380,64 @@ class JobSearch(Scraper):
             delay_seconds (int): Delay between operations to appear more human-like
             workplace_types (List[Union[int, WorkplaceType]], optional): List of workplace type filters
             experience_levels (List[Union[int, ExperienceLevel]], optional): List of experience level filters
+            sort_by (str, optional): "R" to sort by relevance, "DD" to sort by most recent
+            posted_within (int, optional): Only jobs posted in the last this many seconds
                 
         Returns:
             List[Job]: List of job results from the page
         """
-        # Build URL with pagination parameter if needed
-        start_value = current_page_index * 25  # LinkedIn uses 25 jobs per page
-        url_params = f"keywords={urllib.parse.quote(search_term)}&geoId={geoid}&refresh=true"
-        if current_page_index > 0:
-            url_params += f"&start={start_value}"
-        
-        # Add workplace type filter
-        if workplace_types:
-            workplace_filter = ",".join(str(int(wt)) for wt in workplace_types)
-            url_params += f"&f_WT={workplace_filter}"
-        
-        # Add experience level filter
-        if experience_levels:
-            experience_filter = ",".join(str(int(exp)) for exp in experience_levels)
-            url_params += f"&f_E={experience_filter}"
-            
-        url = os.path.join(self.base_url, "search") + f"?{url_params}"
-        self.driver.get(url)
-        
-        # Add initial delay after page load
-        time.sleep(delay_seconds)
-        
+        query = JobQuery.create(
+            search_term,
+            geoid,
+            workplace_types=workplace_types,
+            experience_levels=experience_levels,
+            sort_by=sort_by,
+            page=current_page_index,
+            posted_within=posted_within,
+        )
+        self.last_result_count = None
+        if self.query_cache is not None:
+            cached = self.query_cache.get(query.key)
+            if cached is not None:
+                logger.info("Using cached results for page %d (%d jobs)", current_page_index + 1, len(cached.jobs),
+                            extra={"query": query.keywords, "page": current_page_index + 1, "count": len(cached.jobs)})
+                return [
+                    normalize_job(Job(scrape=False, driver=self.driver, **job), cached.created_datetime)
+                    for job in cached.jobs
+                ]
+
+        page_started = time.perf_counter()
+        log_fields = {"query": query.keywords, "page": current_page_index + 1}
+        url = query.url(self.base_url)
+        if self._estimate_page == (url, self.driver.current_url):
+            logger.debug("Reusing the page loaded for the result count", extra=log_fields)
+        else:
+            self.get_page(url)
+
+            # Add initial delay after page load
+            time.sleep(delay_seconds)
+        self._estimate_page = None
+
         self.scroll_to_bottom()
         self.focus()
         sleep(self.WAIT_FOR_ELEMENT_TIMEOUT)
 
-        job_listing_class_name = "scaffold-layout__list"
-        job_listing = self.wait_for_element_to_load(name=job_listing_class_name)
+        job_listing = self._wait_for_job_listing("scaffold-layout__list")
+        # The result count tells how many cards this page holds, so an empty page needs no
+        # waiting for cards and a partial one less scrolling
+        self.last_result_count = self._read_result_count()
+        expected_cards = None
+        if self.last_result_count is not None:
+            expected_cards = max(0, min(self.last_result_count, JobQuery.MAX_RESULTS) - query.start)
+            if not expected_cards:
+                logger.info("No results left for page %d (%d results)", current_page_index + 1,
+                            self.last_result_count, extra=dict(log_fields, count=0))
+                return []
         job_listing = job_listing.find_element(By.XPATH, "./div[1]")
         job_listing_class_name = str(job_listing.get_attribute("class")).replace("\n", "")
-        print(f"Class name of the first div: {job_listing_class_name}")
-        self.scroll_to_bottom_job_list(job_listing_class_name)
+        logger.debug("Class name of the first div: %s", job_listing_class_name, extra=log_fields)
+        fraction = 1.0 if expected_cards is None else min(1.0, expected_cards / JobQuery.JOBS_PER_PAGE)
+        self.scroll_to_bottom_job_list(job_listing_class_name, fraction)
 
         job_results = []
         
@@ -341,34 +446,70 @@ class JobSearch(Scraper):
             job_cards = self.wait_for_all_elements_to_load(
                 name="job-card-list", base=job_listing
             )
-            print(f"Found {len(job_cards)} job cards on page {current_page_index + 1}")
+            logger.info("Found %d job cards on page %d", len(job_cards), current_page_index + 1,
+                        extra=dict(log_fields, count=len(job_cards)))
             
             # Here, scrape the job cards and add to results
             for i, job_card in enumerate(job_cards):
                 try:
+                    card_started = time.perf_counter()
                     job = self.scrape_job_card(job_card)
                     job_results.append(job)
-                    print(f"Scraped job: {job.job_title}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Scraped job: %s", job.job_title, extra=dict(
+                            log_fields, job_id=parse_job_id(job.linkedin_url), elapsed_ms=elapsed_ms(card_started)
+                        ))
                     
                     # Add delay every few jobs to appear more human-like
                     if i > 0 and i % 3 == 0:
-                        print(f"Taking a short pause after job {i}...")
+                        logger.debug("Taking a short pause after job %d", i, extra=log_fields)
                         time.sleep(delay_seconds)
                         
                 except Exception as e:
-                    print(f"Error scraping job card: {e}")
+                    logger.warning("Error scraping job card: %s", e, extra=log_fields)
+                    self._record_failure(ScrapeFailure.from_exception(
+                        e, JOB_CARD, url=self._job_card_url(job_card),
+                        search=self._search_context(query), card_index=i,
+                    ))
         
         except (NoSuchElementException, TimeoutException) as e:
-            print(f"Error finding job cards: {e}")
+            logger.warning("Error finding job cards: %s", e, extra=log_fields)
         
-        print(f"Total jobs scraped on this page: {len(job_results)}")
+        logger.info("Total jobs scraped on page %d: %d", current_page_index + 1, len(job_results),
+                    extra=dict(log_fields, count=len(job_results), elapsed_ms=elapsed_ms(page_started)))
+        if job_results:
+            self.get_rate_limiter().reset_soft_signals()
+        else:
+            self.get_rate_limiter().record_soft_signal(EMPTY_RESULTS)
+        if self.query_cache is not None and job_results:
+            self.query_cache.put(query.key, [job.to_dict() for job in job_results])
         return job_results
 
     def search_multiple_pages(self, search_term: str, geoid: int, max_pages: int = 10, delay_seconds: int = 3, 
                               workplace_types: List[Union[int, WorkplaceType]] = None, 
-                              experience_levels: List[Union[int, ExperienceLevel]] = None) -> List[Job]:
+                              experience_levels: List[Union[int, ExperienceLevel]] = None,
+                              deduplicator: JobDeduplicator = None,
+                              retry_policy: RetryPolicy = None,
+                              max_consecutive_failures: int = 3,
+                              since: datetime = None,
+                              high_water_marks: HighWaterMarks = None,
+                              plan: SearchPlan = None) -> List[Job]:
         """
         Search for jobs across multiple pages by making separate search requests for each page.
+
+        With since or high_water_marks the search is incremental: it asks for jobs posted
+        since the later of since and the search's stored high-water mark, most recent
+        first, and stops at the first page reaching older jobs, which are dropped. For
+        frequent polling that is usually a single page. After a run that got back to the
+        mark (or a first run), the time the run started becomes the new mark.
+
+        The result count on the first page (or a plan from plan_search) tells how many
+        pages there are, so the search stops after the last one instead of loading an
+        empty page to find the end. The plan is kept in self.last_plan.
+
+        When a watchdog.Watchdog supervises the driver, a page that fails because the
+        browser crashed or the session was logged out is loaded again once the watchdog
+        has brought the session back, and the search goes on from there.
         
         Args:
             search_term (str): The job search keywords
@@ -377,12 +518,39 @@ class JobSearch(Scraper):
             delay_seconds (int): Delay between operations to appear more human-like
             workplace_types (List[Union[int, WorkplaceType]], optional): List of workplace type filters
             experience_levels (List[Union[int, ExperienceLevel]], optional): List of experience level filters
+            deduplicator (JobDeduplicator, optional): Drops jobs already seen in this or earlier runs
+            retry_policy (RetryPolicy, optional): Retries of a failing page, by default none
+            max_consecutive_failures (int): Give up after this many pages failed in a row
+            since (datetime, optional): Only return jobs posted since
+            high_water_marks (HighWaterMarks, optional): Load the search's mark from and
+                store it in here
+            plan (SearchPlan, optional): Pages to load, read from the first page by default
                 
         Returns:
-            List[Job]: Combined list of job results from all pages
+            List[Job]: Combined list of job results from all pages. Pages that failed are
+                recorded in self.failures (and the dead letter store) instead.
         """
         all_jobs = []
         total_pages_scraped = 0
+        consecutive_failures = 0
+        failed_pages = 0
+        retry_policy = retry_policy or RetryPolicy(max_attempts=1)
+
+        run_started = datetime.now()
+        search_key = JobQuery.create(search_term, geoid, workplace_types, experience_levels).search_key
+        mark = since
+        if high_water_marks is not None:
+            stored = high_water_marks.get(search_key)
+            if stored is not None and (mark is None or stored > mark):
+                mark = stored
+        incremental = mark is not None or high_water_marks is not None
+        sort_by = "DD" if incremental else None
+        posted_within = None
+        if mark is not None:
+            posted_within = math.ceil((run_started - mark).total_seconds()) + POSTED_WITHIN_SLACK_SECONDS
+        complete = plan is not None and plan.pages == 0 and not plan.truncated
+        self.last_plan = plan
+        last_page = max_pages if plan is None else min(max_pages, plan.pages)
         
         # Build filter info for logging
         filter_info = []
@@ -392,43 +560,126 @@ class JobSearch(Scraper):
         if experience_levels:
             filter_info.append(f"Experience: {', '.join(ExperienceLevel(exp).label for exp in experience_levels)}")
         
+        if mark is not None:
+            filter_info.append(f"Posted since: {mark:%Y-%m-%d %H:%M}")
         filter_str = f" with filters: {'; '.join(filter_info)}" if filter_info else ""
-        print(f"Starting multi-page search for '{search_term}' (maximum {max_pages} pages){filter_str}")
+        logger.info("Starting multi-page search for '%s' (maximum %d pages)%s", search_term, max_pages, filter_str,
+                    extra={"query": search_term})
+        search_started = time.perf_counter()
         
-        for page_index in range(1, max_pages + 1):
+        for page_index in range(1, last_page + 1):
             try:
-                print(f"Searching page {page_index}...")
-                jobs_on_page = self.search(
+                logger.debug("Searching page %d", page_index, extra={"query": search_term, "page": page_index})
+                jobs_on_page = retry_policy.call(
+                    self.supervised,
+                    self.search,
                     search_term=search_term, 
                     geoid=geoid,
                     current_page_index=page_index - 1,  # LinkedIn uses 0-indexed pages in URL
                     delay_seconds=delay_seconds,
                     workplace_types=workplace_types,
-                    experience_levels=experience_levels
+                    experience_levels=experience_levels,
+                    sort_by=sort_by,
+                    posted_within=posted_within,
                 )
                 
                 # If we didn't find any jobs, we've likely reached the end
                 if not jobs_on_page:
-                    print(f"No jobs found on page {page_index}, ending search")
+                    logger.info("No jobs found on page %d, ending search", page_index,
+                                extra={"query": search_term, "page": page_index})
+                    complete = True
                     break
+
+                if self.last_plan is None and self.last_result_count is not None:
+                    self.last_plan = SearchPlan.create(self.last_result_count, max_pages)
+                    last_page = self.last_plan.pages
+                    logger.info("%d results, planning %d pages", self.last_result_count, last_page,
+                                extra={"query": search_term, "count": self.last_result_count})
+
+                # posted_at is the latest the relative posted date allows, so an earlier
+                # one was seen by the previous run, and so is everything after it
+                reached_mark = False
+                if mark is not None:
+                    newer = [job for job in jobs_on_page if job.posted_at is None or job.posted_at >= mark]
+                    reached_mark = len(newer) < len(jobs_on_page)
+                    jobs_on_page = newer
+
+                if deduplicator is not None:
+                    jobs_on_page = list(deduplicator.filter(jobs_on_page))
                     
                 all_jobs.extend(jobs_on_page)
                 total_pages_scraped += 1
+                consecutive_failures = 0
                 
-                print(f"Found {len(jobs_on_page)} jobs on page {page_index}")
-                print(f"Running total: {len(all_jobs)} jobs")
+                logger.info("Found %d jobs on page %d, running total: %d", len(jobs_on_page), page_index, len(all_jobs),
+                            extra={"query": search_term, "page": page_index, "count": len(jobs_on_page)})
+                if reached_mark:
+                    logger.info("Reached jobs posted before %s on page %d, ending search", f"{mark:%Y-%m-%d %H:%M}",
+                                page_index, extra={"query": search_term, "page": page_index})
+                    complete = True
+                    break
+                if page_index >= last_page:
+                    # The planned last page, or max_pages: no need to wait for another one
+                    complete = self.last_plan is not None and not self.last_plan.truncated
+                    break
                 
                 # Add a random delay between page requests
                 random_delay = delay_seconds + (random.random() * delay_seconds)
-                print(f"Taking a break before fetching next page ({random_delay:.2f} seconds)...")
+                logger.debug("Taking a break before fetching next page (%.2f seconds)", random_delay)
                 time.sleep(random_delay)
                 
             except Exception as e:
-                print(f"Error processing page {page_index}: {e}")
-                # Print full stack trace for debugging
-                import traceback
-                traceback.print_exc()
-                break
+                logger.warning("Error processing page %d: %s", page_index, e,
+                               extra={"query": search_term, "page": page_index})
+                query = JobQuery.create(
+                    search_term, geoid, workplace_types, experience_levels, sort_by=sort_by,
+                    page=page_index - 1, posted_within=posted_within,
+                )
+                self._record_failure(ScrapeFailure.from_exception(
+                    e, SEARCH_PAGE, url=query.url(self.base_url), search=self._search_context(query),
+                ))
+                consecutive_failures += 1
+                failed_pages += 1
+                if isinstance(e, (ThrottleDetected, SessionLost)) or consecutive_failures >= max_consecutive_failures:
+                    logger.error("Stopping search after %d failed page(s)", consecutive_failures,
+                                 extra={"query": search_term, "page": page_index})
+                    break
         
-        print(f"Multi-page search complete. Scraped {total_pages_scraped} pages with {len(all_jobs)} total jobs.")
-        return all_jobs
\ No newline at end of file
+        if high_water_marks is not None:
+            # A first run has nothing to catch up with, later ones must reach the previous mark
+            if (complete or mark is None) and not failed_pages:
+                high_water_marks.put(search_key, run_started)
+            else:
+                logger.warning("Keeping the high-water mark of '%s', the run didn't get back to it "
+                               "(failed pages or max_pages too low)", search_term, extra={"query": search_term})
+        logger.info("Multi-page search complete. Scraped %d pages with %d total jobs.", total_pages_scraped, len(all_jobs),
+                    extra={"query": search_term, "count": len(all_jobs), "elapsed_ms": elapsed_ms(search_started)})
+        return all_jobs
+
+    def replay_failures(self, dead_letters: DeadLetterStore = None, retry_policy: RetryPolicy = None) -> List[Job]:
+        """
+        Re-run only the pages and job cards that failed, as recorded in a dead letter store.
+
+        Failed job cards are scraped from their job page. A card whose URL couldn't be
+        read at all stays in the store: re-running its whole results page would cost a
+        page and bring back every other card on it again.
+
+        Returns:
+            List[Job]: Jobs recovered by the replay
+        """
+        dead_letters = dead_letters or self.dead_letters
+        if dead_letters is None:
+            raise ValueError("No dead letter store to replay")
+
+        def replay_search(failure):
+            return self.search(**failure.context["search"])
+
+        def replay_job_card(failure):
+            if not failure.url:
+                raise ValueError("No job URL was recorded for this card, it can't be replayed on its own")
+            return [Job(failure.url, driver=self.driver, close_on_complete=False)]
+
+        results = dead_letters.replay(
+            {SEARCH_PAGE: replay_search, JOB_CARD: replay_job_card}, retry_policy
+        )
+        return [job for jobs in results for job in jobs]
@@ -1,7 +1,7 @@
 from selenium.common.exceptions import TimeoutException
 
 from .objects import Scraper
-from . import constants as c
+from .normalize import normalize_job
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -40,6 +40,14 @@ class Job(Scraper):
         self.workplace_type = workplace_type
         self.experience = experience
 
+        # Parsed counterparts of the fields above, filled in by normalize.normalize_job
+        self.posted_at = None
+        self.applicant_total = None
+        self.workplace = None
+        self.experience_level = None
+        # Skill IDs mentioned in the posting, filled in by skills.SkillTagger
+        self.skills = None
+
         if scrape:
             self.scrape(close_on_complete)
 
@@ -70,7 +78,7 @@ class Job(Scraper):
     def scrape_logged_in(self, close_on_complete=True):
         driver = self.driver
 
-        driver.get(self.linkedin_url)
+        self.get_page(self.linkedin_url)
         self.focus()
         self.job_title = self.wait_for_element_to_load(
             name="job-details-jobs-unified-top-card__job-title"
@@ -109,6 +117,7 @@ class Job(Scraper):
             ).text.strip()
         except TimeoutException:
             self.benefits = None
+        normalize_job(self)
 
         if close_on_complete:
             driver.close()
@@ -0,0 +1,60 @@
+import json
+import logging
+import sys
+import time
+
+# Structured fields attached to records through `extra=`, picked up by JsonFormatter
+FIELDS = ("query", "page", "job_id", "url", "elapsed_ms", "count", "shard", "task_id", "signal")
+
+ROOT_LOGGER = "linkedin_scraper"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the structured fields as top level keys"""
+
+    def format(self, record):
+        data = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+                    + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                data[name] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+def configure_logging(level=logging.INFO, json_output: bool = False, stream=None) -> logging.Logger:
+    """
+    Send the package's logs to stream (stderr by default).
+
+    Args:
+        level: Minimum level to emit, records below it cost no formatting
+        json_output (bool): Emit JSON lines instead of plain text
+        stream: Where to write, defaults to sys.stderr
+
+    Returns:
+        logging.Logger: The package's root logger
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(level)
+    for handler in list(logger.handlers):
+        if not isinstance(handler, logging.NullHandler):
+            logger.removeHandler(handler)
+    handler = logging.StreamHandler(stream or sys.stderr)
+    if json_output:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+def elapsed_ms(start: float) -> int:
+    """Milliseconds since start, a time.perf_counter() value"""
+    return int((time.perf_counter() - start) * 1000)
@@ -0,0 +1,382 @@
+"""
+Extraction from the JSON the LinkedIn web app fetches, instead of from the rendered DOM.
+
+Pages load their data from the voyager API in the background. With Chrome's performance
+log enabled, NetworkCapture picks those responses up as a page loads (bodies are read
+over CDP), and the *_from_payload functions map them straight to Job, Experience and
+Education objects: no waiting for rendering, clicking or DOM traversal.
+
+The mapping functions only take parsed payloads, so captured responses saved with
+NetworkCapture.dump can be replayed through them without a browser.
+"""
+import base64
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, asdict
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .enums import WorkplaceType
+from .jobs import Job
+from .log import elapsed_ms
+from .normalize import normalize_job, parse_job_id
+from .objects import Experience, Education, Scraper
+from .query import JobQuery
+
+logger = logging.getLogger(__name__)
+
+VOYAGER_API = "/voyager/api/"
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_URN_ID_RE = re.compile(r":(?P<id>[^:(),]+)\)?$")
+_JOB_URN_RE = re.compile(r"urn:li:(?:fsd_jobPosting|fs_normalized_jobPosting|jobPosting):(?P<id>\d+)")
+_WORKPLACE_URN_RE = re.compile(r"urn:li:fsd?_workplaceType:(?P<code>\d+)")
+
+
+def chrome_options(options=None):
+    """Chrome options with the performance log NetworkCapture reads from"""
+    if options is None:
+        from selenium.webdriver.chrome.options import Options
+        options = Options()
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+@dataclass
+class CapturedResponse:
+    url: str
+    status: int
+    payload: dict
+    captured_at: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class NetworkCapture(object):
+    """
+    Collects voyager API responses from the driver's performance log.
+
+    The driver must have been started with chrome_options(), otherwise the log is empty.
+    Responses are read incrementally: each call to poll() returns only what arrived since
+    the previous one.
+    """
+
+    def __init__(self, driver, url_filter: str = VOYAGER_API):
+        self.driver = driver
+        self.url_filter = url_filter
+        self.responses: List[CapturedResponse] = []
+        self._pending: Dict[str, Tuple[str, int]] = {}
+
+    def start(self):
+        """Enable network events and drop whatever the log held from earlier pages"""
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.get_log("performance")
+        self._pending.clear()
+        return self
+
+    def _body(self, request_id: str) -> Optional[dict]:
+        try:
+            result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception:
+            # Bodies of responses the page already discarded (e.g. after a navigation) are gone
+            logger.debug("No body for request %s", request_id, exc_info=True)
+            return None
+        body = result.get("body", "")
+        if result.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8", errors="replace")
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+
+    def poll(self) -> List[CapturedResponse]:
+        captured = []
+        for entry in self.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                url = response.get("url", "")
+                if self.url_filter in url and "json" in response.get("mimeType", ""):
+                    self._pending[params["requestId"]] = (url, response.get("status"))
+            elif method == "Network.loadingFinished" and params.get("requestId") in self._pending:
+                url, status = self._pending.pop(params["requestId"])
+                payload = self._body(params["requestId"])
+                if payload is not None:
+                    captured.append(CapturedResponse(url, status, payload, time.time()))
+        self.responses.extend(captured)
+        return captured
+
+    def wait_for(self, extract: Callable[[dict], list], timeout: float = 10, settle: float = 0.5,
+                 poll_interval: float = 0.2) -> list:
+        """
+        Poll until extract() finds something in the captured payloads, then keep collecting
+        for settle seconds so payloads arriving together aren't split up.
+
+        Returns:
+            list: Everything extract() returned, in arrival order, or [] on timeout
+        """
+        results = []
+        deadline = time.time() + timeout
+        settle_until = None
+        while time.time() < deadline and (settle_until is None or time.time() < settle_until):
+            for response in self.poll():
+                found = extract(response.payload)
+                if found:
+                    results.extend(found)
+                    settle_until = settle_until or time.time() + settle
+            time.sleep(poll_interval)
+        return results
+
+    def dump(self, path: str):
+        """Append the captured responses to a JSON lines fixture file"""
+        with open(path, "a", encoding="utf-8") as f:
+            for response in self.responses:
+                f.write(json.dumps(response.to_dict()) + "\n")
+
+
+def load_responses(path: str) -> Iterator[CapturedResponse]:
+    """Replay a fixture file written by NetworkCapture.dump"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield CapturedResponse(**json.loads(line))
+
+
+def iter_entities(payload: dict) -> Iterator[dict]:
+    """The typed entities of a voyager response, from its data and included sections"""
+    data = payload.get("data")
+    if isinstance(data, dict) and "$type" in data:
+        yield data
+    for entity in payload.get("included", []):
+        if isinstance(entity, dict):
+            yield entity
+
+
+def _is_type(entity: dict, *suffixes: str) -> bool:
+    return entity.get("$type", "").rsplit(".", 1)[-1] in suffixes
+
+
+def _text(value) -> Optional[str]:
+    """Voyager text fields are either plain strings or TextViewModels ({"text": ...})"""
+    if isinstance(value, dict):
+        value = value.get("text")
+    return value.strip() if isinstance(value, str) else None
+
+
+def _urn_id(urn: Optional[str]) -> Optional[str]:
+    if not urn:
+        return None
+    match = _URN_ID_RE.search(urn)
+    return match.group("id") if match else None
+
+
+def _date(value: Optional[dict], default_month: int) -> Tuple[Optional[str], Optional[date]]:
+    """({"month": 3, "year": 2021}) -> ("Mar 2021", date(2021, 3, 1)), like profile_parser's dates"""
+    if not value or not value.get("year"):
+        return None, None
+    month = value.get("month")
+    text = f"{_MONTHS[month - 1]} {value['year']}" if month else str(value["year"])
+    return text, date(value["year"], month or default_month, 1)
+
+
+def _date_range(entity: dict):
+    date_range = entity.get("dateRange") or entity.get("timePeriod") or {}
+    from_text, start = _date(date_range.get("start") or date_range.get("startDate"), 1)
+    to_text, end = _date(date_range.get("end") or date_range.get("endDate"), 12)
+    if from_text and not to_text:
+        to_text = "Present"
+    return from_text, to_text, start, end
+
+
+def _months_between(start: Optional[date], end: Optional[date]) -> Optional[int]:
+    if start is None:
+        return None
+    end = end or date.today()
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def jobs_from_payload(payload: dict) -> List[Job]:
+    """
+    Jobs in a job search or job details response.
+
+    Search results come as JobPostingCards (title, company and location as display text),
+    details as JobPostings (description, workplace types, listing time); both are merged
+    per job id, in the order the ids first appear.
+    """
+    companies = {}
+    jobs: Dict[str, Job] = {}
+
+    def job_for(job_id: str) -> Job:
+        if job_id not in jobs:
+            jobs[job_id] = Job(linkedin_url=f"https://www.linkedin.com/jobs/view/{job_id}/", scrape=False)
+        return jobs[job_id]
+
+    entities = list(iter_entities(payload))
+    for entity in entities:
+        if _is_type(entity, "Company") and entity.get("entityUrn"):
+            companies[entity["entityUrn"]] = entity
+
+    for entity in entities:
+        if _is_type(entity, "JobPostingCard"):
+            match = _JOB_URN_RE.search(entity.get("jobPostingUrn") or entity.get("entityUrn") or "")
+            if not match:
+                continue
+            job = job_for(match.group("id"))
+            job.job_title = job.job_title or _text(entity.get("jobPostingTitle")) or _text(entity.get("title"))
+            job.company = job.company or _text(entity.get("primaryDescription"))
+            job.location = job.location or _text(entity.get("secondaryDescription"))
+        elif _is_type(entity, "JobPosting"):
+            match = _JOB_URN_RE.search(entity.get("entityUrn") or "")
+            if not match:
+                continue
+            job = job_for(match.group("id"))
+            job.job_title = _text(entity.get("title")) or job.job_title
+            job.location = _text(entity.get("formattedLocation")) or job.location
+            job.job_description = _text(entity.get("description")) or job.job_description
+            company_urn = (entity.get("companyDetails") or {}).get("company") or entity.get("*company")
+            company = companies.get(company_urn)
+            if company is not None:
+                job.company = _text(company.get("name")) or job.company
+                job.company_linkedin_url = company.get("url") or job.company_linkedin_url
+            workplace_codes = [
+                int(m.group("code")) for m in map(_WORKPLACE_URN_RE.search, entity.get("workplaceTypes") or []) if m
+            ]
+            if workplace_codes and workplace_codes[0] in WorkplaceType._value2member_map_:
+                job.workplace_type = WorkplaceType(workplace_codes[0]).label
+            listed_at = entity.get("listedAt") or entity.get("originalListedAt")
+            if listed_at:
+                job.posted_at = datetime.fromtimestamp(listed_at / 1000)
+            applies = entity.get("applies")
+            if applies is not None:
+                job.applicant_count = f"{applies} applicants"
+
+    for job in jobs.values():
+        listed_at = job.posted_at
+        normalize_job(job)
+        job.posted_at = listed_at or job.posted_at
+    return list(jobs.values())
+
+
+def experiences_from_payload(payload: dict) -> List[Experience]:
+    """Positions in a profile (or profile section) response"""
+    companies = {
+        entity["entityUrn"]: entity
+        for entity in iter_entities(payload) if _is_type(entity, "Company") and entity.get("entityUrn")
+    }
+    experiences = []
+    for entity in iter_entities(payload):
+        if not _is_type(entity, "Position"):
+            continue
+        from_text, to_text, start, end = _date_range(entity)
+        company = companies.get(entity.get("companyUrn") or entity.get("*company"), {})
+        company_id = _urn_id(entity.get("companyUrn"))
+        months = _months_between(start, end)
+        experiences.append(Experience(
+            position_title=_text(entity.get("title")),
+            institution_name=_text(entity.get("companyName")) or _text(company.get("name")),
+            linkedin_url=company.get("url") or (
+                f"https://www.linkedin.com/company/{company_id}/" if company_id else None
+            ),
+            from_date=from_text,
+            to_date=to_text,
+            location=_text(entity.get("locationName")) or _text(entity.get("geoLocationName")),
+            description=_text(entity.get("description")),
+            start_date=start,
+            end_date=end,
+            duration_months=months,
+        ))
+    return experiences
+
+
+def educations_from_payload(payload: dict) -> List[Education]:
+    """Educations in a profile (or profile section) response"""
+    educations = []
+    for entity in iter_entities(payload):
+        if not _is_type(entity, "Education"):
+            continue
+        from_text, to_text, start, end = _date_range(entity)
+        school_id = _urn_id(entity.get("schoolUrn"))
+        degree = ", ".join(filter(None, (_text(entity.get("degreeName")), _text(entity.get("fieldOfStudy")))))
+        educations.append(Education(
+            institution_name=_text(entity.get("schoolName")),
+            linkedin_url=f"https://www.linkedin.com/school/{school_id}/" if school_id else None,
+            degree=degree or None,
+            from_date=from_text,
+            to_date=to_text,
+            description=_text(entity.get("description")),
+            start_date=start,
+            end_date=end,
+        ))
+    return educations
+
+
+class NetworkScraper(Scraper):
+    """
+    Scrapes jobs and profile sections from captured API responses.
+
+    The driver must be started with chrome_options() (performance logging on). Pages are
+    loaded through get_page, so the session's rate limiter still applies.
+    """
+
+    def __init__(self, driver, timeout: float = 10, settle: float = 0.5, fixture_path: str = None):
+        super().__init__()
+        self.driver = driver
+        self.timeout = timeout
+        self.settle = settle
+        self.fixture_path = fixture_path
+        self.capture = NetworkCapture(driver)
+
+    def _load(self, url: str, extract: Callable[[dict], list]) -> list:
+        start = time.perf_counter()
+        self.capture.start()
+        self.get_page(url)
+        results = self.capture.wait_for(extract, timeout=self.timeout, settle=self.settle)
+        if self.fixture_path:
+            self.capture.dump(self.fixture_path)
+        self.capture.responses.clear()
+        logger.info("Captured %d items from %s", len(results), url,
+                    extra={"url": url, "count": len(results), "elapsed_ms": elapsed_ms(start)})
+        return results
+
+    def search(self, query: JobQuery, base_url: str = "https://www.linkedin.com/jobs/") -> List[Job]:
+        return _merge_jobs(self._load(query.url(base_url), jobs_from_payload))
+
+    def job(self, url: str) -> Optional[Job]:
+        """
+        The job at url, or None if no response held it. Job pages also load similar and
+        recommended jobs; only the one with url's job ID is picked.
+        """
+        job_id = parse_job_id(url)
+        if job_id is None:
+            raise ValueError(f"No job ID in {url}")
+
+        def extract(payload):
+            return [job for job in jobs_from_payload(payload) if parse_job_id(job.linkedin_url) == job_id]
+
+        jobs = _merge_jobs(self._load(url, extract))
+        return jobs[0] if jobs else None
+
+    def experiences(self, person_url: str) -> List[Experience]:
+        return self._load(person_url.rstrip("/") + "/details/experience/", experiences_from_payload)
+
+    def educations(self, person_url: str) -> List[Education]:
+        return self._load(person_url.rstrip("/") + "/details/education/", educations_from_payload)
+
+
+def _merge_jobs(jobs: Iterable[Job]) -> List[Job]:
+    """Combine the partial Jobs several responses produced for the same posting"""
+    merged: Dict[str, Job] = {}
+    for job in jobs:
+        if job.linkedin_url not in merged:
+            merged[job.linkedin_url] = job
+            continue
+        target = merged[job.linkedin_url]
+        for name, value in vars(job).items():
+            if value is not None and getattr(target, name, None) is None:
+                setattr(target, name, value)
+    return list(merged.values())
@@ -0,0 +1,188 @@
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from . import constants as c
+from .enums import WorkplaceType, ExperienceLevel
+
+
+# Label (as found in c.WORKPLACE_TYPES / c.EXPERIENCE_LEVELS) -> enum member
+WORKPLACE_TYPE_LABELS = {
+    "Remote": WorkplaceType.REMOTE,
+    "Hybrid": WorkplaceType.HYBRID,
+    "On-site": WorkplaceType.ON_SITE,
+    "In-person": WorkplaceType.ON_SITE,
+}
+
+EXPERIENCE_LEVEL_LABELS = {
+    "Internship": ExperienceLevel.INTERNSHIP,
+    "Entry": ExperienceLevel.ENTRY_LEVEL,
+    "Associate": ExperienceLevel.ASSOCIATE,
+    "Mid-Senior": ExperienceLevel.MID_SENIOR,
+    "Director": ExperienceLevel.DIRECTOR,
+    "Executive": ExperienceLevel.EXECUTIVE,
+}
+
+_UNIT_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 60 * 60,
+    "day": 24 * 60 * 60,
+    "week": 7 * 24 * 60 * 60,
+    "month": 30 * 24 * 60 * 60,
+    "year": 365 * 24 * 60 * 60,
+}
+
+_RELATIVE_DATE_RE = re.compile(
+    r"(?P<amount>\d+|an?|one)\+?\s+(?P<unit>second|minute|hour|day|week|month|year)s?\s+ago",
+    re.IGNORECASE,
+)
+_JUST_NOW_RE = re.compile(r"\b(?:just now|moments? ago)\b", re.IGNORECASE)
+_APPLICANT_COUNT_RE = re.compile(
+    r"(?P<number>\d[\d,]*)\+?\s+(?:applicants?|people\s+clicked\s+apply)",
+    re.IGNORECASE,
+)
+_RESULT_COUNT_RE = re.compile(r"(?P<number>\d[\d,.]*)\+?\s+results?\b", re.IGNORECASE)
+_JOB_ID_RE = re.compile(r"(?:/jobs/view/|currentJobId=)(?:[^/?&]*?-)?(?P<job_id>\d+)")
+
+# One alternation for both label families, so an insights string is scanned once
+_INSIGHT_RE = re.compile(
+    "|".join(
+        [f"(?P<wt{i}>{re.escape(label)})" for i, label in enumerate(c.WORKPLACE_TYPES)]
+        + [f"(?P<exp{i}>{re.escape(label)})" for i, label in enumerate(c.EXPERIENCE_LEVELS)]
+    )
+)
+
+
+@lru_cache(maxsize=4096)
+def _posted_age_seconds(text: str) -> Optional[int]:
+    if _JUST_NOW_RE.search(text):
+        return 0
+    match = _RELATIVE_DATE_RE.search(text)
+    if not match:
+        return None
+    amount = match.group("amount").lower()
+    amount = 1 if amount in ("a", "an", "one") else int(amount)
+    return amount * _UNIT_SECONDS[match.group("unit").lower()]
+
+
+def parse_posted_date(text: str, now: datetime = None) -> Optional[datetime]:
+    """
+    Convert a relative posting date such as "3 days ago" or "Reposted 2 weeks ago"
+    into an absolute timestamp. Open ended ages ("30+ days ago") count as the bound.
+
+    Args:
+        text (str): Posted date text as shown on the job card
+        now (datetime, optional): Reference time, defaults to the current time
+
+    Returns:
+        Optional[datetime]: The estimated posting time, or None if the text can't be parsed
+    """
+    if not isinstance(text, str):
+        return None
+    age = _posted_age_seconds(text)
+    if age is None:
+        return None
+    return (now or datetime.now()) - timedelta(seconds=age)
+
+
+@lru_cache(maxsize=4096)
+def parse_applicant_count(text: str) -> Optional[int]:
+    """
+    Convert applicant text such as "Over 100 applicants" or "Be among the first 25 applicants"
+    into an integer. Lower bounds ("Over 100", "100+") are returned as the bound itself.
+    """
+    if isinstance(text, int):
+        return text
+    if not isinstance(text, str):
+        return None
+    match = _APPLICANT_COUNT_RE.search(text)
+    if not match:
+        return None
+    return int(match.group("number").replace(",", ""))
+
+
+def parse_result_count(text: str) -> Optional[int]:
+    """
+    Convert the result count of a search page, such as "1,234 results" or "10,000+ results",
+    into an integer. Lower bounds are returned as the bound itself.
+    """
+    if not isinstance(text, str):
+        return None
+    match = _RESULT_COUNT_RE.search(text)
+    if not match:
+        return None
+    return int(re.sub(r"[,.]", "", match.group("number")))
+
+
+@lru_cache(maxsize=4096)
+def match_insights(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Find the workplace type and experience level labels in a job insights string
+    with a single pass of a precompiled regex.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: The matched entries of c.WORKPLACE_TYPES and
+            c.EXPERIENCE_LEVELS, None where nothing matched
+    """
+    workplace_type = None
+    experience = None
+    if not isinstance(text, str):
+        return workplace_type, experience
+    for match in _INSIGHT_RE.finditer(text):
+        if match.lastgroup.startswith("wt"):
+            workplace_type = workplace_type or match.group()
+        else:
+            experience = experience or match.group()
+        if workplace_type and experience:
+            break
+    return workplace_type, experience
+
+
+def parse_workplace_type(text: str) -> Optional[WorkplaceType]:
+    """Map insights (or an already extracted label) to a WorkplaceType"""
+    return WORKPLACE_TYPE_LABELS.get(match_insights(text)[0])
+
+
+def parse_experience_level(text: str) -> Optional[ExperienceLevel]:
+    """Map insights (or an already extracted label) to an ExperienceLevel"""
+    return EXPERIENCE_LEVEL_LABELS.get(match_insights(text)[1])
+
+
+@lru_cache(maxsize=65536)
+def parse_job_id(url: str) -> Optional[int]:
+    """Extract the numeric job ID from a LinkedIn job URL"""
+    if not isinstance(url, str):
+        return None
+    match = _JOB_ID_RE.search(url)
+    if not match:
+        return None
+    return int(match.group("job_id"))
+
+
+def normalize_job(job, now: datetime = None):
+    """
+    Attach parsed values to a Job, leaving the scraped strings untouched:
+
+    - posted_at: datetime parsed from posted_date
+    - applicant_total: int parsed from applicant_count
+    - workplace: WorkplaceType parsed from workplace_type
+    - experience_level: ExperienceLevel parsed from experience
+    """
+    job.posted_at = parse_posted_date(job.posted_date, now)
+    job.applicant_total = parse_applicant_count(job.applicant_count)
+    job.workplace = parse_workplace_type(job.workplace_type)
+    job.experience_level = parse_experience_level(job.experience)
+    return job
+
+
+def normalize_jobs(jobs: Iterable, now: datetime = None) -> List:
+    """
+    Normalize a batch of jobs against a single reference time.
+
+    Parsers are memoized on the raw text, so a batch with repeated values
+    ("1 day ago", "Over 100 applicants", ...) only parses each distinct string once.
+    """
+    now = now or datetime.now()
+    return [normalize_job(job, now) for job in jobs]
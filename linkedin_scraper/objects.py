@@ -1,9 +1,12 @@
 from dataclasses import dataclass
+from datetime import date
 from time import sleep
 
 from selenium.webdriver import Chrome
 
 from . import constants as c
+from .rate_limit import RateLimiter, ThrottleDetected, detect_throttle, HARD_SIGNALS
+from .watchdog import Watchdog
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -38,6 +41,10 @@ class Experience(Institution):
     position_title: str = None
     duration: str = None
     location: str = None
+    # Parsed from from_date/to_date/duration by profile_parser
+    start_date: date = None
+    end_date: date = None
+    duration_months: int = None
 
 
 @dataclass
@@ -46,6 +53,8 @@ class Education(Institution):
     to_date: str = None
     description: str = None
     degree: str = None
+    start_date: date = None
+    end_date: date = None
 
 
 @dataclass
@@ -65,10 +74,94 @@ class Scraper:
     WAIT_FOR_ELEMENT_TIMEOUT = 5
     TOP_CARD = "pv-top-card"
 
+    rate_limiter = None  # Overrides the limiter shared by the driver's session
+
     @staticmethod
     def wait(duration):
         sleep(int(duration))
 
+    def get_rate_limiter(self) -> RateLimiter:
+        return self.rate_limiter or RateLimiter.for_driver(self.driver)
+
+    def get_page(self, url):
+        """
+        Load url through the session's rate limiter.
+
+        Throttled loads ("429" pages) are retried after the limiter's cooldown;
+        checkpoints and auth walls raise ThrottleDetected straight away.
+        """
+        limiter = self.get_rate_limiter()
+        for _ in range(limiter.max_retries + 1):
+            limiter.acquire()
+            self.driver.get(url)
+            signal = detect_throttle(self.driver)
+            if signal is None:
+                limiter.record_success()
+                return
+            limiter.record_throttle(signal)
+            if signal in HARD_SIGNALS:
+                break
+        raise ThrottleDetected(signal, url)
+
+    def supervised(self, func, *args, **kwargs):
+        """
+        Call func(*args, **kwargs), a method working on self.driver. If a Watchdog
+        supervises the driver and the session dies on the way, the watchdog brings it back
+        (possibly as a new driver, which becomes self.driver) and func is called again.
+        """
+        watchdog = Watchdog.for_driver(self.driver)
+        if watchdog is None:
+            return func(*args, **kwargs)
+
+        def attempt(driver):
+            self.driver = driver
+            return func(*args, **kwargs)
+
+        return watchdog.call(attempt)
+
+    def open_tabs(self, urls) -> list:
+        """
+        Start loading each url in a new tab of the session, without waiting for any of them.
+
+        The pages load concurrently while the current tab keeps focus. Returns the new
+        window handles, in the order of urls.
+        """
+        limiter = self.get_rate_limiter()
+        handles = []
+        for url in urls:
+            limiter.acquire()
+            known = set(self.driver.window_handles)
+            self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+            handles.append(next(h for h in self.driver.window_handles if h not in known))
+        return handles
+
+    def switch_to_tab(self, handle, url=None):
+        """
+        Focus a tab from open_tabs once its page has loaded, reporting the load to the
+        rate limiter like get_page does. Raises ThrottleDetected if it hit a throttle page.
+        """
+        self.driver.switch_to.window(handle)
+        WebDriverWait(self.driver, self.WAIT_FOR_ELEMENT_TIMEOUT).until(
+            lambda driver: driver.execute_script("return document.readyState") == "complete"
+        )
+        limiter = self.get_rate_limiter()
+        signal = detect_throttle(self.driver)
+        if signal is None:
+            limiter.record_success()
+            return
+        limiter.record_throttle(signal)
+        raise ThrottleDetected(signal, url)
+
+    def close_tabs(self, handles, return_to):
+        """Close the given tabs and focus return_to again"""
+        for handle in handles:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception:
+                pass
+        self.driver.switch_to.window(return_to)
+
     def focus(self):
         self.driver.execute_script('alert("Focus window")')
         self.driver.switch_to.alert.accept()
@@ -1,13 +1,18 @@
-import requests
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException
-from .objects import Experience, Education, Scraper, Interest, Accomplishment, Contact
+from .objects import Scraper, Interest, Accomplishment
+from .profile_parser import parse_experiences, parse_educations
+from .connections import ConnectionsCrawler
+from .rate_limit import ThrottleDetected
 import os
+import logging
 # from linkedin_scraper import selectors
 
+logger = logging.getLogger(__name__)
+
 
 class Person(Scraper):
 
@@ -31,8 +36,12 @@ class Person(Scraper):
         scrape=True,
         close_on_complete=True,
         time_to_wait_after_login=0,
+        parallel_details=False,
+        max_contacts=None,
     ):
         self.linkedin_url = linkedin_url
+        self.parallel_details = parallel_details
+        self.max_contacts = max_contacts
         self.name = name
         self.about = about or []
         self.experiences = experiences or []
@@ -88,7 +97,7 @@ class Person(Scraper):
         if self.is_signed_in():
             self.scrape_logged_in(close_on_complete=close_on_complete)
         else:
-            print("you are not logged in!")
+            logger.warning("you are not logged in!")
 
     def _click_see_more_by_class_name(self, class_name):
         try:
@@ -108,155 +117,54 @@ class Person(Scraper):
 
     def get_experiences(self):
         url = os.path.join(self.linkedin_url, "details/experience")
-        self.driver.get(url)
+        self.get_page(url)
+        self.extract_experiences()
+
+    def extract_experiences(self):
+        """Read the experiences off the details/experience page in the current tab"""
         self.focus()
         main = self.wait_for_element_to_load(by=By.TAG_NAME, name="main")
         self.scroll_to_half()
         self.scroll_to_bottom()
         main_list = self.wait_for_element_to_load(name="pvs-list__container", base=main)
-        for position in main_list.find_elements(By.CLASS_NAME, "pvs-list__paged-list-item"):
-            position = position.find_element(By.CSS_SELECTOR, "div[data-view-name='profile-component-entity']")
-            company_logo_elem, position_details = position.find_elements(By.XPATH, "*")
-
-            # company elem
-            company_linkedin_url = company_logo_elem.find_element(By.XPATH,"*").get_attribute("href")
-            if not company_linkedin_url:
-                continue
-
-            # position details
-            position_details_list = position_details.find_elements(By.XPATH,"*")
-            position_summary_details = position_details_list[0] if len(position_details_list) > 0 else None
-            position_summary_text = position_details_list[1] if len(position_details_list) > 1 else None
-            outer_positions = position_summary_details.find_element(By.XPATH,"*").find_elements(By.XPATH,"*")
-
-            if len(outer_positions) == 4:
-                position_title = outer_positions[0].find_element(By.TAG_NAME,"span").text
-                company = outer_positions[1].find_element(By.TAG_NAME,"span").text
-                work_times = outer_positions[2].find_element(By.TAG_NAME,"span").text
-                location = outer_positions[3].find_element(By.TAG_NAME,"span").text
-            elif len(outer_positions) == 3:
-                if "·" in outer_positions[2].text:
-                    position_title = outer_positions[0].find_element(By.TAG_NAME,"span").text
-                    company = outer_positions[1].find_element(By.TAG_NAME,"span").text
-                    work_times = outer_positions[2].find_element(By.TAG_NAME,"span").text
-                    location = ""
-                else:
-                    position_title = ""
-                    company = outer_positions[0].find_element(By.TAG_NAME,"span").text
-                    work_times = outer_positions[1].find_element(By.TAG_NAME,"span").text
-                    location = outer_positions[2].find_element(By.TAG_NAME,"span").text
-            else:
-                position_title = ""
-                company = outer_positions[0].find_element(By.TAG_NAME,"span").text
-                work_times = ""
-                location = ""
-
-
-            times = work_times.split("·")[0].strip() if work_times else ""
-            duration = work_times.split("·")[1].strip() if len(work_times.split("·")) > 1 else None
-
-            from_date = " ".join(times.split(" ")[:2]) if times else ""
-            to_date = " ".join(times.split(" ")[3:]) if times else ""
-            if position_summary_text and any(element.get_attribute("pvs-list__container") for element in position_summary_text.find_elements(By.TAG_NAME, "*")):
-                inner_positions = (position_summary_text.find_element(By.CLASS_NAME,"pvs-list__container")
-                                  .find_element(By.XPATH,"*").find_element(By.XPATH,"*").find_element(By.XPATH,"*")
-                                  .find_elements(By.CLASS_NAME,"pvs-list__paged-list-item"))
-            else:
-                inner_positions = []
-            if len(inner_positions) > 1:
-                descriptions = inner_positions
-                for description in descriptions:
-                    res = description.find_element(By.TAG_NAME,"a").find_elements(By.XPATH,"*")
-                    position_title_elem = res[0] if len(res) > 0 else None
-                    work_times_elem = res[1] if len(res) > 1 else None
-                    location_elem = res[2] if len(res) > 2 else None
-
-
-                    location = location_elem.find_element(By.XPATH,"*").text if location_elem else None
-                    position_title = position_title_elem.find_element(By.XPATH,"*").find_element(By.TAG_NAME,"*").text if position_title_elem else ""
-                    work_times = work_times_elem.find_element(By.XPATH,"*").text if work_times_elem else ""
-                    times = work_times.split("·")[0].strip() if work_times else ""
-                    duration = work_times.split("·")[1].strip() if len(work_times.split("·")) > 1 else None
-                    from_date = " ".join(times.split(" ")[:2]) if times else ""
-                    to_date = " ".join(times.split(" ")[3:]) if times else ""
-
-                    experience = Experience(
-                        position_title=position_title,
-                        from_date=from_date,
-                        to_date=to_date,
-                        duration=duration,
-                        location=location,
-                        description=description,
-                        institution_name=company,
-                        linkedin_url=company_linkedin_url
-                    )
-                    self.add_experience(experience)
-            else:
-                description = position_summary_text.text if position_summary_text else ""
-
-                experience = Experience(
-                    position_title=position_title,
-                    from_date=from_date,
-                    to_date=to_date,
-                    duration=duration,
-                    location=location,
-                    description=description,
-                    institution_name=company,
-                    linkedin_url=company_linkedin_url
-                )
-                self.add_experience(experience)
+        for experience in parse_experiences(main_list.get_attribute("outerHTML")):
+            self.add_experience(experience)
 
     def get_educations(self):
         url = os.path.join(self.linkedin_url, "details/education")
-        self.driver.get(url)
+        self.get_page(url)
+        self.extract_educations()
+
+    def extract_educations(self):
+        """Read the educations off the details/education page in the current tab"""
         self.focus()
         main = self.wait_for_element_to_load(by=By.TAG_NAME, name="main")
         self.scroll_to_half()
         self.scroll_to_bottom()
         main_list = self.wait_for_element_to_load(name="pvs-list__container", base=main)
-        for position in main_list.find_elements(By.CLASS_NAME,"pvs-list__paged-list-item"):
-            position = position.find_element(By.XPATH,"//div[@data-view-name='profile-component-entity']")
-            institution_logo_elem, position_details = position.find_elements(By.XPATH,"*")
-
-            # company elem
-            institution_linkedin_url = institution_logo_elem.find_element(By.XPATH,"*").get_attribute("href")
-
-            # position details
-            position_details_list = position_details.find_elements(By.XPATH,"*")
-            position_summary_details = position_details_list[0] if len(position_details_list) > 0 else None
-            position_summary_text = position_details_list[1] if len(position_details_list) > 1 else None
-            outer_positions = position_summary_details.find_element(By.XPATH,"*").find_elements(By.XPATH,"*")
-
-            institution_name = outer_positions[0].find_element(By.TAG_NAME,"span").text
-            if len(outer_positions) > 1:
-                degree = outer_positions[1].find_element(By.TAG_NAME,"span").text
-            else:
-                degree = None
-
-            if len(outer_positions) > 2:
-                times = outer_positions[2].find_element(By.TAG_NAME,"span").text
-
-                if times != "":
-                    from_date = times.split(" ")[times.split(" ").index("-")-1] if len(times.split(" "))>3 else times.split(" ")[0]
-                    to_date = times.split(" ")[-1]
-            else:
-                from_date = None
-                to_date = None
-
-
-
-            description = position_summary_text.text if position_summary_text else ""
-
-            education = Education(
-                from_date=from_date,
-                to_date=to_date,
-                description=description,
-                degree=degree,
-                institution_name=institution_name,
-                linkedin_url=institution_linkedin_url
-            )
+        for education in parse_educations(main_list.get_attribute("outerHTML")):
             self.add_education(education)
 
+    def get_details_in_tabs(self):
+        """
+        Load the experience and education pages side by side in new tabs, then extract
+        each, so a profile costs its slowest details page rather than the sum of them.
+
+        The profile stays loaded in the original tab, so there's no navigating back.
+        """
+        profile_tab = self.driver.current_window_handle
+        pages = [
+            (os.path.join(self.linkedin_url, "details/experience"), self.extract_experiences),
+            (os.path.join(self.linkedin_url, "details/education"), self.extract_educations),
+        ]
+        handles = self.open_tabs([url for url, _ in pages])
+        try:
+            for handle, (url, extract) in zip(handles, pages):
+                self.switch_to_tab(handle, url)
+                extract()
+        finally:
+            self.close_tabs(handles, profile_tab)
+
     def get_name_and_location(self):
         top_panel = self.driver.find_element(By.XPATH, "//*[@class='mt2 relative']")
         self.name = top_panel.find_element(By.TAG_NAME, "h1").text
@@ -298,13 +206,17 @@ class Person(Scraper):
             "window.scrollTo(0, Math.ceil(document.body.scrollHeight/1.5));"
         )
 
-        # get experience
-        self.get_experiences()
+        if self.parallel_details:
+            # get experience and education together
+            self.get_details_in_tabs()
+        else:
+            # get experience
+            self.get_experiences()
 
-        # get education
-        self.get_educations()
+            # get education
+            self.get_educations()
 
-        driver.get(self.linkedin_url)
+            self.get_page(self.linkedin_url)
 
         # get interest
         try:
@@ -357,22 +269,12 @@ class Person(Scraper):
 
         # get connections
         try:
-            driver.get("https://www.linkedin.com/mynetwork/invite-connect/connections/")
-            _ = WebDriverWait(driver, self.__WAIT_FOR_ELEMENT_TIMEOUT).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "mn-connections"))
-            )
-            connections = driver.find_element(By.CLASS_NAME, "mn-connections")
-            if connections is not None:
-                for conn in connections.find_elements(By.CLASS_NAME, "mn-connection-card"):
-                    anchor = conn.find_element(By.CLASS_NAME, "mn-connection-card__link")
-                    url = anchor.get_attribute("href")
-                    name = conn.find_element(By.CLASS_NAME, "mn-connection-card__details").find_element(By.CLASS_NAME, "mn-connection-card__name").text.strip()
-                    occupation = conn.find_element(By.CLASS_NAME, "mn-connection-card__details").find_element(By.CLASS_NAME, "mn-connection-card__occupation").text.strip()
-
-                    contact = Contact(name=name, occupation=occupation, url=url)
-                    self.add_contact(contact)
-        except:
-            connections = None
+            for contact in ConnectionsCrawler(driver, max_count=self.max_contacts).crawl():
+                self.add_contact(contact)
+        except ThrottleDetected:
+            raise
+        except Exception:
+            logger.debug("Could not read connections", exc_info=True)
 
         if close_on_complete:
             driver.quit()
@@ -399,6 +301,22 @@ class Person(Scraper):
         else:
             return None
 
+    def to_dict(self):
+        return {
+            "linkedin_url": self.linkedin_url,
+            "name": self.name,
+            "about": self.about,
+            "location": getattr(self, "location", None),
+            "open_to_work": getattr(self, "open_to_work", None),
+            "company": self.company,
+            "job_title": self.job_title,
+            "experiences": [vars(experience).copy() for experience in self.experiences],
+            "educations": [vars(education).copy() for education in self.educations],
+            "interests": [vars(interest).copy() for interest in self.interests],
+            "accomplishments": [vars(accomplishment).copy() for accomplishment in self.accomplishments],
+            "contacts": [vars(contact).copy() for contact in self.contacts],
+        }
+
     def __repr__(self):
         return "<Person {name}\n\nAbout\n{about}\n\nExperience\n{exp}\n\nEducation\n{edu}\n\nInterest\n{int}\n\nAccomplishments\n{acc}\n\nContacts\n{conn}>".format(
             name=self.name,
@@ -0,0 +1,229 @@
+import logging
+import queue
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .dedup import JobDeduplicator
+from .enums import WorkplaceType, ExperienceLevel
+from .job_search import JobSearch
+from .jobs import Job
+from .normalize import parse_job_id
+from .query import QueryCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchShard:
+    """One concrete LinkedIn search: a query plus the filters narrowing it down"""
+    search_term: str
+    geoid: int
+    workplace_types: Tuple[int, ...] = ()
+    experience_levels: Tuple[int, ...] = ()
+
+    def __str__(self):
+        filters = []
+        if self.workplace_types:
+            filters.append("Workplace: " + ", ".join(WorkplaceType(wt).label for wt in self.workplace_types))
+        if self.experience_levels:
+            filters.append("Experience: " + ", ".join(ExperienceLevel(exp).label for exp in self.experience_levels))
+        filter_str = f" [{'; '.join(filters)}]" if filters else ""
+        return f"'{self.search_term}' @ {self.geoid}{filter_str}"
+
+
+@dataclass
+class ShardResult:
+    shard: SearchShard
+    jobs_found: int = 0
+    new_jobs: int = 0
+    saturated: bool = False
+    children: List[SearchShard] = field(default_factory=list)
+    error: Optional[str] = None
+    result_count: Optional[int] = None  # As shown on the shard's first page
+
+
+class SearchPlanner(object):
+    """
+    Splits a high-level job search into shards to get past LinkedIn's result cap.
+
+    A shard with more results than max_pages hold (as counted on its first page, or
+    when it fills every page) is considered saturated and is split further, first per
+    WorkplaceType, then per ExperienceLevel, then per sub-geoid (from the sub_geoids
+    mapping). A shard known to be saturated from its count is split without crawling
+    it; otherwise the crawl starts on the page loaded for the count. Shards are worked
+    off a shared queue by one thread per driver, and the results are merged and
+    deduplicated.
+    """
+
+    JOBS_PER_PAGE = 25
+    MAX_PAGES = 40  # LinkedIn stops serving results after 1000 jobs
+
+    def __init__(
+        self,
+        drivers: Sequence,
+        sub_geoids: Dict[int, List[int]] = None,
+        max_pages: int = MAX_PAGES,
+        delay_seconds: int = 3,
+        deduplicator: JobDeduplicator = None,
+        query_cache: QueryCache = None,
+    ):
+        """
+        Args:
+            drivers (Sequence): Logged in webdrivers, one worker thread is started per driver
+            sub_geoids (Dict[int, List[int]], optional): Smaller locations to split a geoid into
+            max_pages (int): Pages scraped per shard, a shard filling all of them is saturated
+            delay_seconds (int): Delay passed on to JobSearch.search_multiple_pages
+            deduplicator (JobDeduplicator, optional): Used for merging instead of a job ID set
+            query_cache (QueryCache, optional): Shared page cache for the drivers' JobSearch
+        """
+        if not drivers:
+            raise ValueError("SearchPlanner needs at least one driver")
+        self.drivers = list(drivers)
+        self.sub_geoids = sub_geoids or {}
+        self.max_pages = min(max_pages, self.MAX_PAGES)
+        self.delay_seconds = delay_seconds
+        self.deduplicator = deduplicator
+        self.query_cache = query_cache
+        self.results: List[ShardResult] = []
+
+        self._lock = threading.Lock()
+        self._seen = set()
+        self._jobs: List[Job] = []
+
+    def split(self, shard: SearchShard) -> List[SearchShard]:
+        """
+        Split a shard into narrower shards which together cover the same results.
+
+        Returns:
+            List[SearchShard]: The narrower shards, empty when the shard can't be split further
+        """
+        if len(shard.workplace_types) != 1:
+            options = shard.workplace_types or tuple(int(wt) for wt in WorkplaceType)
+            return [replace(shard, workplace_types=(wt,)) for wt in options]
+        if len(shard.experience_levels) != 1:
+            options = shard.experience_levels or tuple(int(exp) for exp in ExperienceLevel)
+            return [replace(shard, experience_levels=(exp,)) for exp in options]
+        return [replace(shard, geoid=geoid) for geoid in self.sub_geoids.get(shard.geoid, [])]
+
+    def is_saturated(self, jobs_found: int, result_count: int = None) -> bool:
+        """A shard is saturated when it has more results than its pages hold, or fills them without a count"""
+        if result_count is not None:
+            return result_count > self.max_pages * self.JOBS_PER_PAGE
+        return jobs_found >= self.max_pages * self.JOBS_PER_PAGE
+
+    def _merge(self, jobs: List[Job]) -> int:
+        with self._lock:
+            if self.deduplicator is not None:
+                new_jobs = list(self.deduplicator.filter(jobs))
+            else:
+                new_jobs = []
+                for job in jobs:
+                    job_id = parse_job_id(job.linkedin_url)
+                    if job_id is None:
+                        # No job ID to tell it apart from other jobs ("Unknown" URL), keep it
+                        new_jobs.append(job)
+                    elif job_id not in self._seen:
+                        self._seen.add(job_id)
+                        new_jobs.append(job)
+            self._jobs.extend(new_jobs)
+        return len(new_jobs)
+
+    def run_shard(self, job_search: JobSearch, shard: SearchShard) -> ShardResult:
+        """Scrape a single shard, or split it right away when its result count is too large"""
+        result = ShardResult(shard)
+        workplace_types = list(shard.workplace_types) or None
+        experience_levels = list(shard.experience_levels) or None
+        try:
+            plan = job_search.plan_search(shard.search_term, shard.geoid, self.max_pages,
+                                          workplace_types, experience_levels)
+        except Exception as e:
+            logger.warning("Couldn't count the results of shard %s, crawling it: %s", shard, e,
+                           extra={"shard": str(shard)})
+            plan = None
+        if plan is not None and plan.result_count is not None and self.is_saturated(0, plan.result_count):
+            result.result_count = plan.result_count
+            result.children = self.split(shard)
+            if result.children:
+                result.saturated = True
+                return result
+        jobs = job_search.search_multiple_pages(
+            search_term=shard.search_term,
+            geoid=shard.geoid,
+            max_pages=self.max_pages,
+            delay_seconds=self.delay_seconds,
+            workplace_types=workplace_types,
+            experience_levels=experience_levels,
+            plan=plan,
+        )
+        result.jobs_found = len(jobs)
+        result.new_jobs = self._merge(jobs)
+        if job_search.last_plan is not None:
+            result.result_count = job_search.last_plan.result_count
+        result.saturated = self.is_saturated(result.jobs_found, result.result_count)
+        if result.saturated:
+            result.children = self.split(shard)
+            if not result.children:
+                logger.warning("Shard %s is saturated but can't be split further, results are truncated", shard,
+                               extra={"shard": str(shard)})
+        return result
+
+    def _worker(self, driver, shards: "queue.Queue"):
+        job_search = JobSearch(driver, scrape=False, query_cache=self.query_cache)
+        while True:
+            shard = shards.get()
+            if shard is None:
+                shards.task_done()
+                return
+            try:
+                result = self.run_shard(job_search, shard)
+            except Exception as e:
+                logger.error("Error processing shard %s: %s", shard, e, extra={"shard": str(shard)})
+                result = ShardResult(shard, error=str(e))
+            with self._lock:
+                self.results.append(result)
+            for child in result.children:
+                shards.put(child)
+            logger.info("Shard %s: %d jobs, %d new, split into %d shards", shard, result.jobs_found,
+                        result.new_jobs, len(result.children), extra={"shard": str(shard), "count": result.jobs_found})
+            shards.task_done()
+
+    def run(self, search_term: str, geoid: int,
+            workplace_types: List[Union[int, WorkplaceType]] = None,
+            experience_levels: List[Union[int, ExperienceLevel]] = None) -> List[Job]:
+        """
+        Search for every job matching the query, splitting saturated shards as needed.
+
+        Args:
+            search_term (str): The job search keywords
+            geoid (int): LinkedIn's location identifier
+            workplace_types (List[Union[int, WorkplaceType]], optional): Restrict to these workplace types
+            experience_levels (List[Union[int, ExperienceLevel]], optional): Restrict to these experience levels
+
+        Returns:
+            List[Job]: Merged, deduplicated jobs from all shards
+        """
+        root = SearchShard(
+            search_term=search_term,
+            geoid=geoid,
+            workplace_types=tuple(sorted(int(wt) for wt in workplace_types or [])),
+            experience_levels=tuple(sorted(int(exp) for exp in experience_levels or [])),
+        )
+        shards = queue.Queue()
+        shards.put(root)
+        workers = [
+            threading.Thread(target=self._worker, args=(driver, shards), daemon=True)
+            for driver in self.drivers
+        ]
+        for worker in workers:
+            worker.start()
+
+        shards.join()
+        for _ in workers:
+            shards.put(None)
+        for worker in workers:
+            worker.join()
+
+        logger.info("Search plan complete. Ran %d shards, %d unique jobs.", len(self.results), len(self._jobs),
+                    extra={"query": search_term, "count": len(self._jobs)})
+        return list(self._jobs)
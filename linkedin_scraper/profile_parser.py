@@ -0,0 +1,253 @@
+"""
+Offline parser for the experience and education sections of a profile.
+
+Works on a snapshot of the section's HTML (e.g. the outerHTML of the details page's
+pvs-list__container), so a profile costs one browser round trip instead of one per field,
+and stored snapshots can be re-parsed without a browser.
+
+Each entry's lines are classified by content rather than by how many there are: the line
+holding a date range or duration splits the title/company lines before it from the
+location after it. Entries without one (LinkedIn omits the dates of some positions) are
+read in the usual order: title, company, location.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+from lxml import etree
+
+from .objects import Experience, Education
+
+_MONTHS = {
+    month: number
+    for number, month in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+    )
+}
+
+_DATE = r"(?:(?P<{0}_month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+)?(?P<{0}_year>\d{{4}})"
+_DATE_RANGE_RE = re.compile(
+    rf"^(?P<start>{_DATE.format('start')})"
+    rf"(?:\s*[-–—]\s*(?:(?P<present>present)|(?P<end>{_DATE.format('end')})))?"
+    r"(?:\s*·\s*(?P<duration>.*))?$",
+    re.IGNORECASE,
+)
+_DURATION_RE = re.compile(
+    r"^(?=\d)(?:(?P<years>\d+)\s*yrs?)?\s*(?:(?P<months>\d+)\s*mos?)?$",
+    re.IGNORECASE,
+)
+
+_PAGED_ITEM = "contains(concat(' ', normalize-space(@class), ' '), ' pvs-list__paged-list-item ')"
+# Top level entries only, positions nested under a company are read from their entry
+_ENTRIES = etree.XPath(f"//li[{_PAGED_ITEM}][not(ancestor::li[{_PAGED_ITEM}])]")
+_NESTED_ENTRIES = etree.XPath(f".//li[{_PAGED_ITEM}]")
+_ENTITY = etree.XPath(".//div[@data-view-name='profile-component-entity'][1]")
+_CHILDREN = etree.XPath("./*")
+_LINK = etree.XPath("(./descendant-or-self::a/@href)[1]")
+_ANCHOR = etree.XPath("(.//a)[1]")
+_NESTED_LIST = etree.XPath(".//*[contains(concat(' ', normalize-space(@class), ' '), ' pvs-list__container ')]")
+# LinkedIn renders each line twice, once for screen readers; the aria-hidden copy is the visible one
+_LINES = etree.XPath(".//span[@aria-hidden='true'][not(ancestor::span[@aria-hidden='true'])]")
+
+# Plain etree elements, lxml.html's per-element class lookup roughly doubles the parse time
+_PARSER = etree.HTMLParser()
+
+
+class DateRange(NamedTuple):
+    """
+    A parsed "Jan 2020 - Mar 2021 · 1 yr 3 mos" string.
+
+    Dates are the first of their month; a bare year starts in January and ends in December.
+    end is None while the position is current.
+    """
+    start_text: Optional[str] = None
+    end_text: Optional[str] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+    current: bool = False
+    duration: Optional[str] = None
+    duration_months: Optional[int] = None
+
+
+def _to_date(month: Optional[str], year: str, default_month: int) -> date:
+    return date(int(year), _MONTHS[month[:3].lower()] if month else default_month, 1)
+
+
+def _duration_months(text: str) -> Optional[int]:
+    match = _DURATION_RE.match(text.strip())
+    if match is None:
+        return None
+    return int(match.group("years") or 0) * 12 + int(match.group("months") or 0)
+
+
+@lru_cache(maxsize=65536)
+def parse_date_range(text: str) -> Optional[DateRange]:
+    """The DateRange in text, or None if it's neither a date range nor a bare duration"""
+    text = " ".join(text.split())
+    match = _DATE_RANGE_RE.match(text)
+    if match is None:
+        months = _duration_months(text)
+        return DateRange(duration=text, duration_months=months) if months is not None else None
+    duration = match.group("duration")
+    present = match.group("present")
+    end = None
+    if match.group("end"):
+        end = _to_date(match.group("end_month"), match.group("end_year"), 12)
+    return DateRange(
+        start_text=match.group("start"),
+        end_text=present or match.group("end"),
+        start=_to_date(match.group("start_month"), match.group("start_year"), 1),
+        end=end,
+        current=present is not None,
+        duration=duration,
+        duration_months=_duration_months(duration) if duration else None,
+    )
+
+
+def _lines(element) -> List[str]:
+    lines = ["".join(span.itertext()).strip() for span in _LINES(element)]
+    return [line for line in lines if line]
+
+
+def _split_lines(lines: List[str]):
+    """
+    (lines before the dates, DateRange or None, lines after the dates). Without a date
+    line, the first two lines (title and company, or school and degree) come first.
+    """
+    for i, line in enumerate(lines):
+        dates = parse_date_range(line)
+        if dates is not None:
+            return lines[:i], dates, lines[i + 1:]
+    return lines[:2], None, lines[2:]
+
+
+def _entity_parts(entry):
+    """(link, summary lines, summary element) of an entry, or None if it isn't an entity"""
+    entities = _ENTITY(entry)
+    if not entities:
+        return None
+    children = _CHILDREN(entities[0])
+    if len(children) < 2:
+        return None
+    logo, details = children[0], children[1]
+    links = _LINK(logo)
+    details_children = _CHILDREN(details)
+    if not details_children:
+        return None
+    summary = details_children[1] if len(details_children) > 1 else None
+    return (links[0] if links else None), _lines(details_children[0]), summary
+
+
+def _experience(company, url, title, dates, location, description) -> Experience:
+    dates = dates or DateRange()
+    return Experience(
+        position_title=title,
+        from_date=dates.start_text or "",
+        to_date=dates.end_text or "",
+        duration=dates.duration,
+        location=location,
+        description=description,
+        institution_name=company,
+        linkedin_url=url,
+        start_date=dates.start,
+        end_date=dates.end,
+        duration_months=dates.duration_months,
+    )
+
+
+def _parse_experience_entry(entry) -> List[Experience]:
+    parts = _entity_parts(entry)
+    if parts is None:
+        return []
+    url, lines, summary = parts
+    if not url or not lines:
+        return []
+    head, dates, tail = _split_lines(lines)
+    nested = _NESTED_ENTRIES(summary) if summary is not None and _NESTED_LIST(summary) else []
+
+    if len(nested) > 1:
+        # Several positions at one company: the entry's own lines are the company header
+        company = head[0] if head else ""
+        experiences = []
+        for item in nested:
+            anchors = _ANCHOR(item)
+            position_lines = _lines(anchors[0]) if anchors else _lines(item)
+            title, item_dates, item_tail = _split_lines(position_lines)
+            in_anchor = set(position_lines)
+            description = "\n".join(line for line in _lines(item) if line not in in_anchor)
+            experiences.append(_experience(
+                company, url, title[0] if title else "", item_dates,
+                item_tail[0] if item_tail else None, description,
+            ))
+        return experiences
+
+    if len(head) > 1:
+        title, company = head[0], head[1]
+    elif dates is None:
+        # A lone line without dates is the position, not where it was held
+        title, company = head[0], ""
+    else:
+        title, company = "", head[0] if head else ""
+    description = "\n".join(_lines(summary)) if summary is not None else ""
+    return [_experience(company, url, title, dates, tail[0] if tail else "", description)]
+
+
+def _parse_education_entry(entry) -> Optional[Education]:
+    parts = _entity_parts(entry)
+    if parts is None:
+        return None
+    url, lines, summary = parts
+    if not lines:
+        return None
+    head, dates, _ = _split_lines(lines)
+    dates = dates or DateRange()
+    return Education(
+        institution_name=head[0] if head else None,
+        degree=head[1] if len(head) > 1 else None,
+        from_date=dates.start_text,
+        to_date=dates.end_text,
+        description="\n".join(_lines(summary)) if summary is not None else "",
+        linkedin_url=url,
+        start_date=dates.start,
+        end_date=dates.end,
+    )
+
+
+def _root(source):
+    return etree.fromstring(source, _PARSER) if isinstance(source, (str, bytes)) else source
+
+
+def parse_experiences(source) -> List[Experience]:
+    """
+    Experiences in a details/experience section.
+
+    Args:
+        source: The section's HTML, or an already parsed lxml element
+
+    Returns:
+        List[Experience]: In page order; positions at the same company become one
+            Experience each, sharing the company's name and link
+    """
+    experiences = []
+    for entry in _ENTRIES(_root(source)):
+        experiences.extend(_parse_experience_entry(entry))
+    return experiences
+
+
+def parse_educations(source) -> List[Education]:
+    """
+    Educations in a details/education section.
+
+    Args:
+        source: The section's HTML, or an already parsed lxml element
+
+    Returns:
+        List[Education]: In page order
+    """
+    educations = []
+    for entry in _ENTRIES(_root(source)):
+        education = _parse_education_entry(entry)
+        if education is not None:
+            educations.append(education)
+    return educations
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import ClassVar, List, Optional, Tuple, Union
+from urllib.parse import quote, urljoin
+
+from .enums import WorkplaceType, ExperienceLevel
+
+
+@dataclass(frozen=True)
+class JobQuery:
+    """
+    Canonical form of a job search page request.
+
+    Equivalent searches (different keyword spacing or case, filter order, duplicated
+    filters) produce the same URL and the same key, so the key can be used to share
+    results. LinkedIn's keyword search ignores case.
+    """
+    keywords: str
+    geoid: int
+    workplace_types: Tuple[int, ...] = ()
+    experience_levels: Tuple[int, ...] = ()
+    sort_by: Optional[str] = None  # "R" for relevance, "DD" for most recent
+    page: int = 0
+    posted_within: Optional[int] = None  # Only jobs posted in the last this many seconds
+
+    JOBS_PER_PAGE: ClassVar[int] = 25
+    MAX_RESULTS: ClassVar[int] = 1000  # LinkedIn serves no results past this offset
+
+    @classmethod
+    def create(cls, keywords: str, geoid: int,
+               workplace_types: List[Union[int, WorkplaceType]] = None,
+               experience_levels: List[Union[int, ExperienceLevel]] = None,
+               sort_by: str = None, page: int = 0, posted_within: int = None) -> "JobQuery":
+        return cls(
+            keywords=" ".join(keywords.lower().split()),
+            geoid=int(geoid),
+            workplace_types=tuple(sorted({int(wt) for wt in workplace_types or []})),
+            experience_levels=tuple(sorted({int(exp) for exp in experience_levels or []})),
+            sort_by=sort_by or None,
+            page=int(page),
+            posted_within=int(posted_within) if posted_within else None,
+        )
+
+    @property
+    def start(self) -> int:
+        return self.page * self.JOBS_PER_PAGE
+
+    @classmethod
+    def pages_for(cls, result_count: int) -> int:
+        """Result pages holding result_count jobs, up to the site's limit"""
+        return -(-min(result_count, cls.MAX_RESULTS) // cls.JOBS_PER_PAGE)
+
+    def for_page(self, page: int) -> "JobQuery":
+        return replace(self, page=page)
+
+    def params(self) -> List[Tuple[str, str]]:
+        """Query string parameters in canonical order"""
+        params = [("keywords", self.keywords), ("geoId", str(self.geoid))]
+        if self.workplace_types:
+            params.append(("f_WT", ",".join(str(wt) for wt in self.workplace_types)))
+        if self.experience_levels:
+            params.append(("f_E", ",".join(str(exp) for exp in self.experience_levels)))
+        if self.posted_within:
+            params.append(("f_TPR", f"r{self.posted_within}"))
+        if self.sort_by:
+            params.append(("sortBy", self.sort_by))
+        if self.page > 0:
+            params.append(("start", str(self.start)))
+        return params
+
+    @property
+    def key(self) -> str:
+        """Stable hash identifying this query, independent of the process and parameter order"""
+        canonical = json.dumps(self.params(), separators=(",", ":"))
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    @property
+    def search_key(self) -> str:
+        """Key of the search as a whole: the same for all its pages, sort orders and time windows"""
+        return replace(self, page=0, sort_by=None, posted_within=None).key
+
+    def url(self, base_url: str = "https://www.linkedin.com/jobs/") -> str:
+        if not base_url.endswith("/"):
+            base_url += "/"
+        params = self.params() + [("refresh", "true")]
+        query_string = "&".join(f"{name}={quote(value, safe=',')}" for name, value in params)
+        return urljoin(base_url, "search") + "?" + query_string
+
+
+@dataclass(frozen=True)
+class SearchPlan:
+    """Pages to load for a search, worked out from the result count on its first page"""
+    result_count: Optional[int]  # None when the page didn't show a count
+    pages: int
+
+    @classmethod
+    def create(cls, result_count: Optional[int], max_pages: int) -> "SearchPlan":
+        if result_count is None:
+            return cls(None, max_pages)
+        return cls(result_count, min(max_pages, JobQuery.pages_for(result_count)))
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the planned pages leave results out, or might"""
+        return self.result_count is None or self.pages < JobQuery.pages_for(self.result_count)
+
+
+@dataclass
+class CachedPage:
+    created_at: float
+    jobs: List[dict]
+
+    @property
+    def created_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at)
+
+
+class QueryCache(object):
+    """
+    Search results cache keyed on JobQuery.key with a TTL.
+
+    Backed by SQLite, so workers on the same host can share one cache file.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS query_cache (
+        query_key TEXT PRIMARY KEY,
+        created_at REAL NOT NULL,
+        jobs TEXT NOT NULL
+    )
+    """
+
+    def __init__(self, path: str = ":memory:", ttl_seconds: float = 15 * 60):
+        self.ttl_seconds = ttl_seconds
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute(self._SCHEMA)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        """Return the cached page for key, or None if it is missing or expired"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT created_at, jobs FROM query_cache WHERE query_key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedPage(created_at=row[0], jobs=json.loads(row[1]))
+
+    def put(self, key: str, jobs: List[dict]):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO query_cache (query_key, created_at, jobs) VALUES (?, ?, ?)",
+                (key, time.time(), json.dumps(jobs)),
+            )
+            self.conn.commit()
+
+    def purge(self) -> int:
+        """Delete expired entries, returning how many were removed"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "DELETE FROM query_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self.conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        self.conn.close()
+
+
+class HighWaterMarks(object):
+    """
+    Time of the last complete run of each search, keyed on JobQuery.search_key, so the
+    next run only needs the jobs posted since. Backed by SQLite like QueryCache.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS high_water_marks (
+        search_key TEXT PRIMARY KEY,
+        posted_since REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(self._SCHEMA)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, key: str) -> Optional[datetime]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT posted_since FROM high_water_marks WHERE search_key = ?", (key,)
+            ).fetchone()
+        return datetime.fromtimestamp(row[0]) if row is not None else None
+
+    def put(self, key: str, posted_since: datetime):
+        """Record that every job of the search posted before posted_since has been seen"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO high_water_marks (search_key, posted_since, updated_at) VALUES (?, ?, ?)",
+                (key, posted_since.timestamp(), time.time()),
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
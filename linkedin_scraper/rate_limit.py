@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+import weakref
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Throttling signals
+CHECKPOINT = "checkpoint"
+AUTH_WALL = "auth_wall"
+TOO_MANY_REQUESTS = "too_many_requests"
+EMPTY_RESULTS = "empty_results"
+MISSING_ELEMENT = "missing_element"
+BUDGET_EXHAUSTED = "budget_exhausted"
+
+# Signals after which reloading won't help, the session needs attention first
+HARD_SIGNALS = (CHECKPOINT, AUTH_WALL)
+
+_URL_SIGNALS = (
+    ("/checkpoint/", CHECKPOINT),
+    ("/authwall", AUTH_WALL),
+    ("/uas/login", AUTH_WALL),
+)
+_PAGE_SIGNALS = ("Too Many Requests", "HTTP ERROR 429")
+
+
+class ThrottleDetected(Exception):
+    def __init__(self, signal: str, url: str = None):
+        super().__init__(f"LinkedIn throttling detected ({signal}) at {url}")
+        self.signal = signal
+        self.url = url
+
+
+class PageBudgetExhausted(ThrottleDetected):
+    """Raised before loading a page past the limiter's page_limit; the session needs a rest, not a retry"""
+
+    def __init__(self, url: str = None):
+        super().__init__(BUDGET_EXHAUSTED, url)
+
+
+def detect_throttle(driver) -> Optional[str]:
+    """
+    Look for signs of throttling on the currently loaded page.
+
+    Returns:
+        Optional[str]: The detected signal, or None if the page looks healthy
+    """
+    try:
+        current_url = driver.current_url or ""
+        title = driver.title or ""
+    except Exception:
+        return None
+    # The login checkpoint that only asks to remember the account is handled by actions.login
+    if current_url.rstrip("/").endswith("/checkpoint/lg/login-submit"):
+        return None
+    for fragment, signal in _URL_SIGNALS:
+        if fragment in current_url:
+            return signal
+    if any(marker in title for marker in _PAGE_SIGNALS):
+        return TOO_MANY_REQUESTS
+    return None
+
+
+class RateLimiter(object):
+    """
+    AIMD page rate control for one browser session.
+
+    The page rate (in pages per minute) grows additively with every healthy page and
+    is cut multiplicatively on a throttling signal, together with a cooldown that
+    doubles on consecutive throttles. Soft signals (empty result lists, elements
+    missing from a loaded page) only count as throttling when several arrive in a row.
+
+    Pacing is opt-in: with rate=None (the default) pages load as fast as the scraper
+    asks for them until the first throttling signal, from which on the rate starts at
+    max_rate * decrease. Pass a rate to pace the session from the first page.
+
+    page_limit caps pages (counted like self.pages) at that total; acquire raises
+    PageBudgetExhausted once it is reached.
+    """
+
+    # Keyed on the driver itself so a limiter goes away together with its driver
+    _limiters: "weakref.WeakKeyDictionary[object, RateLimiter]" = weakref.WeakKeyDictionary()
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        min_rate: float = 1,
+        max_rate: float = 30,
+        increase: float = 1,
+        decrease: float = 0.5,
+        cooldown_seconds: float = 60,
+        max_cooldown_seconds: float = 15 * 60,
+        soft_signal_threshold: int = 3,
+        max_retries: int = 3,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.soft_signal_threshold = soft_signal_threshold
+        self.max_retries = max_retries
+
+        self.page_limit: Optional[int] = None
+        self.pages = 0
+        self.throttles = 0
+        self._consecutive_throttles = 0
+        self._consecutive_soft_signals = 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_driver(cls, driver, **kwargs) -> "RateLimiter":
+        """Return the limiter shared by every scraper using this driver's session"""
+        with cls._registry_lock:
+            limiter = cls._limiters.get(driver)
+            if limiter is None:
+                limiter = cls._limiters[driver] = cls(**kwargs)
+            return limiter
+
+    @classmethod
+    def forget_driver(cls, driver):
+        with cls._registry_lock:
+            cls._limiters.pop(driver, None)
+
+    @classmethod
+    def transfer(cls, old_driver, new_driver):
+        """Hand the limiter of a driver's session over to the driver replacing it"""
+        with cls._registry_lock:
+            limiter = cls._limiters.pop(old_driver, None)
+            if limiter is not None:
+                cls._limiters[new_driver] = limiter
+
+    @property
+    def interval(self) -> float:
+        return 0.0 if self.rate is None else 60.0 / self.rate
+
+    def acquire(self):
+        """Block until the session may load its next page"""
+        with self._lock:
+            if self.page_limit is not None and self.pages >= self.page_limit:
+                raise PageBudgetExhausted()
+            now = time.monotonic()
+            wait = max(0.0, self._next_slot - now)
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def record_success(self):
+        with self._lock:
+            self.pages += 1
+            self._consecutive_throttles = 0
+            if self.rate is not None:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_throttle(self, signal: str) -> float:
+        """
+        Slow down after a throttling signal.
+
+        Returns:
+            float: The cooldown applied before the next page load, in seconds
+        """
+        with self._lock:
+            self.throttles += 1
+            self._consecutive_throttles += 1
+            self._consecutive_soft_signals = 0
+            self.rate = max(self.min_rate, (self.max_rate if self.rate is None else self.rate) * self.decrease)
+            cooldown = min(
+                self.max_cooldown_seconds,
+                self.cooldown_seconds * 2 ** (self._consecutive_throttles - 1),
+            )
+            self._next_slot = max(self._next_slot, time.monotonic() + cooldown)
+        logger.warning("Throttling detected (%s), slowing down to %.1f pages/min with a %.0fs cooldown",
+                       signal, self.rate, cooldown, extra={"signal": signal})
+        return cooldown
+
+    def reset_soft_signals(self):
+        """Call when a page had the content it was expected to have"""
+        with self._lock:
+            self._consecutive_soft_signals = 0
+
+    def record_soft_signal(self, signal: str):
+        """Note a weak throttling hint, acting on it once enough arrive in a row"""
+        with self._lock:
+            self._consecutive_soft_signals += 1
+            triggered = self._consecutive_soft_signals >= self.soft_signal_threshold
+        if triggered:
+            self.record_throttle(signal)
@@ -0,0 +1,384 @@
+"""
+Freshness-driven recrawling of tracked jobs, profiles and companies.
+
+Instead of re-scraping everything on a fixed schedule, RecrawlScheduler keeps the
+change history of every tracked entity (a hash of its to_dict() record per crawl),
+estimates how often each one changes, and spends a global pages-per-hour budget on
+the entities most likely to have changed since their last crawl:
+
+    scheduler = RecrawlScheduler("recrawl.db", pages_per_hour=300)
+    scheduler.track(urls)  # kinds are inferred from the URLs
+    scheduler.run(driver, on_record=save)  # or next_batch() and record() by hand
+
+Changes are modelled as a Poisson process with a rate per entity. Crawls only reveal
+whether an entity changed since the previous crawl, not how often, so the rate is
+estimated with Cho and Garcia-Molina's estimator for that case and blended with a
+prior rate per kind while there are few crawls. An entity last crawled t days ago then
+has changed with probability 1 - exp(-rate * t), and the batch takes the entities with
+the highest rate * t first. Never crawled entities come before all others.
+"""
+import logging
+import math
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from .failures import JOB, PERSON, COMPANY, RetryPolicy
+from .log import elapsed_ms
+from .store import content_hash
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+
+# Prior change rates in changes per day, used until an entity has a history of its own
+DEFAULT_PRIOR_RATES = {JOB: 0.5, PERSON: 1 / 60, COMPANY: 1 / 30}
+
+# Pages loaded by one scrape of each kind: a profile also loads its experience and
+# education pages, a company its about page
+PAGE_COSTS = {JOB: 1, PERSON: 3, COMPANY: 2}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracked (
+    linkedin_url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    change_rate REAL NOT NULL,
+    content_hash TEXT,
+    first_crawled REAL,
+    last_crawled REAL,
+    last_changed REAL,
+    crawls INTEGER NOT NULL DEFAULT 0,
+    changes INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS crawl_history (
+    linkedin_url TEXT NOT NULL,
+    crawled_at REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    changed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS crawl_history_url ON crawl_history (linkedin_url, crawled_at);
+"""
+
+
+def kind_of(url: str) -> Optional[str]:
+    """The kind of entity a LinkedIn URL points to, None if it isn't a job, profile or company"""
+    if "/jobs/view/" in url:
+        return JOB
+    if "/in/" in url:
+        return PERSON
+    if "/company/" in url:
+        return COMPANY
+    return None
+
+
+def estimate_change_rate(crawls: int, changes: int, span: float, prior_rate: float,
+                         prior_weight: float = 2.0) -> float:
+    """
+    Changes per day of an entity crawled crawls times over span seconds, changes of
+    which found it changed since the crawl before.
+
+    The naive changes / span undercounts, since several changes between two crawls
+    look like one. -log((n - X + 0.5) / (n + 0.5)) / I, for X changes seen over n
+    intervals of mean length I, corrects for that, and stays finite when every crawl
+    saw a change. It is blended with prior_rate as if prior_weight intervals had
+    been observed at that rate.
+    """
+    intervals = crawls - 1
+    if intervals <= 0 or span <= 0:
+        return prior_rate
+    mean_interval = span / intervals / DAY
+    estimate = -math.log((intervals - changes + 0.5) / (intervals + 0.5)) / mean_interval
+    return (intervals * estimate + prior_weight * prior_rate) / (intervals + prior_weight)
+
+
+class PageBudget(object):
+    """
+    Token bucket of page loads, refilled at pages_per_hour and holding at most burst
+    pages, so a scheduler that was idle can't spend hours of budget at once.
+    """
+
+    def __init__(self, pages_per_hour: float, burst: float = None, now: float = None):
+        self.pages_per_hour = pages_per_hour
+        self.burst = burst if burst is not None else max(1.0, pages_per_hour / 6)
+        self._pages = self.burst
+        self._updated = time.time() if now is None else now
+
+    def available(self, now: float = None) -> float:
+        now = time.time() if now is None else now
+        self._pages = min(self.burst, self._pages + (now - self._updated) * self.pages_per_hour / 3600)
+        self._updated = now
+        return self._pages
+
+    def spend(self, pages: float):
+        self._pages -= pages
+
+    def wait_time(self, pages: float, now: float = None) -> float:
+        """Seconds until pages are available"""
+        missing = pages - self.available(now)
+        return max(0.0, missing * 3600 / self.pages_per_hour)
+
+
+class CrawlTarget(NamedTuple):
+    linkedin_url: str
+    kind: str
+    staleness: float  # Probability that the entity changed since its last crawl
+    last_crawled: Optional[float]
+
+
+def scrape_entity(driver, kind: str, url: str) -> dict:
+    """Scrape one entity with the scraper class of its kind, returning its to_dict() record"""
+    if kind == JOB:
+        from .jobs import Job
+        return Job(url, driver=driver, close_on_complete=False).to_dict()
+    if kind == PERSON:
+        from .person import Person
+        return Person(url, driver=driver, close_on_complete=False).to_dict()
+    if kind == COMPANY:
+        from .company import Company
+        return Company(url, driver=driver, get_employees=False, close_on_complete=False).to_dict()
+    raise ValueError(f"Unknown entity kind {kind!r}")
+
+
+class RecrawlScheduler(object):
+    """
+    Change history and crawl priorities of tracked entities, in SQLite.
+
+    Args:
+        path (str): SQLite database file, in memory by default
+        pages_per_hour (float): Global page budget of all crawls
+        burst (float, optional): Pages the budget can save up, 10 minutes' worth by default
+        prior_rates (Dict[str, float], optional): Prior changes per day of each kind
+        page_costs (Dict[str, int], optional): Pages loaded by a scrape of each kind
+        min_interval (float): Seconds before an entity is crawled again
+        min_staleness (float): Skip entities less likely than this to have changed
+        ignored_fields (Sequence[str]): Record fields left out of the content hash, e.g.
+            "applicant_count" to not count new applicants as a change
+    """
+
+    def __init__(self, path: str = ":memory:", pages_per_hour: float = 120, burst: float = None,
+                 prior_rates: Dict[str, float] = None, page_costs: Dict[str, int] = None,
+                 min_interval: float = 60 * 60, min_staleness: float = 0.0, ignored_fields: Sequence[str] = ()):
+        self.prior_rates = dict(DEFAULT_PRIOR_RATES, **(prior_rates or {}))
+        self.page_costs = dict(PAGE_COSTS, **(page_costs or {}))
+        if burst is None:
+            burst = max(max(self.page_costs.values()), pages_per_hour / 6)
+        self.budget = PageBudget(pages_per_hour, burst)
+        self.min_interval = min_interval
+        self.min_staleness = min_staleness
+        self.ignored_fields = set(ignored_fields)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def track(self, urls: Iterable[str], kind: str = None) -> int:
+        """
+        Start tracking entities, inferring their kind from the URL unless given.
+
+        Returns:
+            int: Entities that weren't tracked yet
+        """
+        rows = []
+        for url in urls:
+            url_kind = kind or kind_of(url)
+            if url_kind not in self.prior_rates:
+                logger.warning("Not tracking %s, unknown entity kind", url, extra={"url": url})
+                continue
+            rows.append((url, url_kind, self.prior_rates[url_kind]))
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tracked (linkedin_url, kind, change_rate) VALUES (?, ?, ?)", rows
+            )
+            return self.conn.total_changes - before
+
+    def untrack(self, urls: Iterable[str]) -> int:
+        """Stop tracking entities, dropping their history"""
+        rows = [(url,) for url in urls]
+        with self._lock, self.conn:
+            self.conn.executemany("DELETE FROM crawl_history WHERE linkedin_url = ?", rows)
+            return self.conn.executemany("DELETE FROM tracked WHERE linkedin_url = ?", rows).rowcount
+
+    def _hash(self, record: dict) -> str:
+        if self.ignored_fields:
+            record = {key: value for key, value in record.items() if key not in self.ignored_fields}
+        return content_hash(record)
+
+    def record(self, url: str, record: dict, crawled_at: float = None) -> bool:
+        """
+        Record a crawl of an entity, tracking it if it wasn't, and update its change rate.
+
+        Returns:
+            bool: Whether the entity changed since its previous crawl
+        """
+        now = time.time() if crawled_at is None else crawled_at
+        digest = self._hash(record)
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT kind, content_hash, first_crawled, crawls, changes FROM tracked WHERE linkedin_url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                kind = kind_of(url)
+                if kind not in self.prior_rates:
+                    raise ValueError(f"Can't infer the entity kind of {url}, track() it first")
+                row = (kind, None, None, 0, 0)
+                self.conn.execute(
+                    "INSERT INTO tracked (linkedin_url, kind, change_rate) VALUES (?, ?, ?)",
+                    (url, kind, self.prior_rates[kind]),
+                )
+            kind, previous, first_crawled, crawls, changes = row
+            changed = previous is not None and previous != digest
+            crawls += 1
+            changes += changed
+            first_crawled = now if first_crawled is None else first_crawled
+            rate = estimate_change_rate(crawls, changes, now - first_crawled, self.prior_rates[kind])
+            self.conn.execute(
+                "UPDATE tracked SET change_rate = ?, content_hash = ?, first_crawled = ?, last_crawled = ?, "
+                "last_changed = CASE WHEN ? THEN ? ELSE last_changed END, crawls = ?, changes = ?, failures = 0, "
+                "not_before = ? WHERE linkedin_url = ?",
+                (rate, digest, first_crawled, now, changed, now, crawls, changes, now + self.min_interval, url),
+            )
+            self.conn.execute(
+                "INSERT INTO crawl_history (linkedin_url, crawled_at, content_hash, changed) VALUES (?, ?, ?, ?)",
+                (url, now, digest, changed),
+            )
+        return changed
+
+    def record_failure(self, url: str, failed_at: float = None):
+        """Back off from an entity that failed to scrape, doubling the delay on every failure in a row"""
+        now = time.time() if failed_at is None else failed_at
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT failures FROM tracked WHERE linkedin_url = ?", (url,)).fetchone()
+            if row is None:
+                return
+            delay = min(DAY, self.min_interval * 2 ** row[0])
+            self.conn.execute(
+                "UPDATE tracked SET failures = failures + 1, not_before = ? WHERE linkedin_url = ?", (now + delay, url)
+            )
+
+    def next_batch(self, max_size: int = None, now: float = None) -> List[CrawlTarget]:
+        """
+        The stalest entities whose pages fit in the budget available now, which is spent
+        on them. Entities crawled less than min_interval ago, or backing off after a
+        failure, are left out.
+
+        Args:
+            max_size (int, optional): Maximum number of entities
+            now (float, optional): Current time, for simulations
+
+        Returns:
+            List[CrawlTarget]: The entities to crawl, stalest first
+        """
+        now = time.time() if now is None else now
+        start = time.perf_counter()
+        # 1 - exp(-rate * age) grows with rate * age, so ordering by the latter needs no math functions
+        threshold = -math.log(1 - self.min_staleness) if self.min_staleness < 1 else math.inf
+        batch = []
+        with self._lock:
+            pages = self.budget.available(now)
+            limit = int(pages // min(self.page_costs.values()))
+            if max_size is not None:
+                limit = min(limit, max_size)
+            if limit <= 0:
+                return []
+            rows = self.conn.execute(
+                "SELECT linkedin_url, kind, change_rate * (? - last_crawled) / ?, last_crawled FROM tracked "
+                "WHERE not_before <= ? AND (last_crawled IS NULL OR change_rate * (? - last_crawled) / ? >= ?) "
+                "ORDER BY last_crawled IS NOT NULL, change_rate * (? - last_crawled) DESC LIMIT ?",
+                (now, DAY, now, now, DAY, threshold, now, limit),
+            ).fetchall()
+            for url, kind, exposure, last_crawled in rows:
+                cost = self.page_costs.get(kind, 1)
+                if cost > pages:
+                    continue
+                pages -= cost
+                self.budget.spend(cost)
+                staleness = 1.0 if exposure is None else 1 - math.exp(-exposure)
+                batch.append(CrawlTarget(url, kind, staleness, last_crawled))
+        logger.debug("Scheduled %d recrawls", len(batch), extra={"count": len(batch), "elapsed_ms": elapsed_ms(start)})
+        return batch
+
+    def history(self, url: str) -> List[dict]:
+        """Crawls of an entity, oldest first"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT crawled_at, content_hash, changed FROM crawl_history WHERE linkedin_url = ? ORDER BY crawled_at",
+                (url,),
+            ).fetchall()
+        return [{"crawled_at": crawled_at, "content_hash": digest, "changed": bool(changed)}
+                for crawled_at, digest, changed in rows]
+
+    def change_rate(self, url: str) -> Optional[float]:
+        """Estimated changes per day of a tracked entity"""
+        with self._lock:
+            row = self.conn.execute("SELECT change_rate FROM tracked WHERE linkedin_url = ?", (url,)).fetchone()
+        return row[0] if row is not None else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM tracked").fetchone()[0]
+
+    def run(self, driver, batches: int = None, scrape: Callable = scrape_entity,
+            on_record: Callable[[str, dict, bool], None] = None) -> int:
+        """
+        Crawl batch after batch with one driver, waiting for the budget in between.
+        Several threads can run with a driver each, sharing the budget.
+
+        Args:
+            driver: Logged in webdriver
+            batches (int, optional): Stop after this many batches, run until interrupted by default
+            scrape (Callable): Called with (driver, kind, url), returns the entity's record
+            on_record (Callable, optional): Called with (kind, record, changed) after every crawl,
+                e.g. to write or store the record
+
+        Returns:
+            int: Entities crawled
+
+        Raises:
+            ThrottleDetected, SessionLost: As RetryPolicy, the run stops instead of spending
+                the rest of the batch on a throttled or lost session
+        """
+        crawled = done = 0
+        while batches is None or done < batches:
+            batch = self.next_batch()
+            if not batch:
+                if self.count() == 0:
+                    logger.warning("Nothing is tracked, stopping")
+                    break
+                with self._lock:
+                    wait = self.budget.wait_time(min(self.page_costs.values()))
+                # Everything may also be within min_interval of its last crawl, or fresh enough
+                time.sleep(max(wait, 60))
+                continue
+            done += 1
+            for target in batch:
+                try:
+                    record = scrape(driver, target.kind, target.linkedin_url)
+                except RetryPolicy.give_up_on:
+                    raise
+                except Exception:
+                    logger.exception("Failed to recrawl %s", target.linkedin_url, extra={"url": target.linkedin_url})
+                    self.record_failure(target.linkedin_url)
+                    continue
+                changed = self.record(target.linkedin_url, record)
+                crawled += 1
+                logger.info("Recrawled %s (%s)", target.linkedin_url, "changed" if changed else "unchanged",
+                            extra={"url": target.linkedin_url})
+                if on_record is not None:
+                    on_record(target.kind, record, changed)
+        return crawled
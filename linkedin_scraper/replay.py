@@ -0,0 +1,728 @@
+"""
+Browser-free drivers for deterministic tests and load tests.
+
+RecordingDriver wraps a real driver and snapshots every page it visits (its final DOM,
+after scrolling and clicking, plus the results of the scripts run on it). ReplayDriver
+serves those snapshots back through the subset of the WebDriver API the scrapers use, so
+JobSearch, Person and Company run unchanged against them with no browser or network:
+
+    driver = RecordingDriver(webdriver.Chrome(), "recording.jsonl")
+    ...  # scrape as usual, then
+    driver.quit()
+
+    with instant_waits():
+        person = Person(url, driver=ReplayDriver("recording.jsonl"), close_on_complete=False)
+"""
+import contextlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from lxml import etree
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    NoAlertPresentException,
+    NoSuchElementException,
+    NoSuchWindowException,
+)
+from selenium.webdriver.common.by import By
+
+logger = logging.getLogger(__name__)
+
+NOT_FOUND_HTML = "<html><head><title>Page not found</title></head><body></body></html>"
+
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset", "figcaption",
+    "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main",
+    "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+_SKIPPED_TAGS = {"head", "script", "style", "template", "noscript"}
+_HIDDEN_CLASSES = {"visually-hidden", "a11y-text"}
+_DISPLAY_NONE_RE = re.compile(r"display\s*:\s*none")
+_URL_ATTRIBUTES = {"href", "src", "action"}
+
+_PARSER = etree.HTMLParser()
+
+
+def page_key(url: str) -> str:
+    """url with the fragment, trailing slash and query parameter order normalized away"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/") or "/", query, ""))
+
+
+def _class_test(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _quote(value: str) -> str:
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ")"
+
+
+_CSS_TOKEN_RE = re.compile(
+    r"\s*(?P<combinator>>)\s*"
+    r"|(?P<space>\s+)"
+    r"|(?P<tag>[\w-]+|\*)"
+    r"|#(?P<id>[\w-]+)"
+    r"|\.(?P<cls>[\w-]+)"
+    r"|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$~|]?=)\s*(?P<value>\"[^\"]*\"|'[^']*'|[^\]\s]+))?\s*\]"
+)
+
+
+def _css_to_xpath(selector: str) -> str:
+    """The simple CSS the scrapers use (tags, ids, classes, attributes, ' ' and '>') as XPath"""
+    paths = []
+    for group in selector.split(","):
+        steps, axis, conditions, tag = [], ".//", [], "*"
+        position = 0
+        group = group.strip()
+        while position < len(group):
+            match = _CSS_TOKEN_RE.match(group, position)
+            if match is None or match.end() == position:
+                raise InvalidSelectorException(f"Unsupported CSS selector for replay: {selector}")
+            position = match.end()
+            if match.group("combinator") or match.group("space"):
+                steps.append(axis + tag + "".join(f"[{c}]" for c in conditions))
+                axis = "/" if match.group("combinator") else "//"
+                conditions, tag = [], "*"
+            elif match.group("tag"):
+                tag = match.group("tag")
+            elif match.group("id"):
+                conditions.append(f"@id={_quote(match.group('id'))}")
+            elif match.group("cls"):
+                conditions.append(_class_test(match.group("cls")))
+            else:
+                name, op, value = match.group("attr"), match.group("op"), match.group("value")
+                if value and value[0] in "'\"":
+                    value = value[1:-1]
+                if op is None:
+                    conditions.append(f"@{name}")
+                elif op == "=":
+                    conditions.append(f"@{name}={_quote(value)}")
+                elif op == "*=":
+                    conditions.append(f"contains(@{name}, {_quote(value)})")
+                elif op == "^=":
+                    conditions.append(f"starts-with(@{name}, {_quote(value)})")
+                elif op == "$=":
+                    conditions.append(
+                        f"substring(@{name}, string-length(@{name}) - {len(value) - 1}) = {_quote(value)}"
+                    )
+                elif op == "~=":
+                    conditions.append(f"contains(concat(' ', normalize-space(@{name}), ' '), {_quote(' ' + value + ' ')})")
+                else:
+                    conditions.append(f"(@{name}={_quote(value)} or starts-with(@{name}, {_quote(value + '-')}))")
+        steps.append(axis + tag + "".join(f"[{c}]" for c in conditions))
+        paths.append("".join(steps))
+    return " | ".join(paths)
+
+
+def locator_to_xpath(by: str, value: str) -> str:
+    """XPath equivalent of a selenium locator, relative to the element it is applied to"""
+    if by == By.XPATH:
+        return value
+    if by == By.ID:
+        return f".//*[@id={_quote(value)}]"
+    if by == By.NAME:
+        return f".//*[@name={_quote(value)}]"
+    if by == By.TAG_NAME:
+        return f".//{value}"
+    if by == By.CLASS_NAME:
+        # Selenium sends class names as ".value", so dotted names select compound classes
+        return ".//*" + "".join(f"[{_class_test(name)}]" for name in re.split(r"[\s.]+", value) if name)
+    if by == By.CSS_SELECTOR:
+        return _css_to_xpath(value)
+    if by == By.LINK_TEXT:
+        return f".//a[normalize-space(.)={_quote(value)}]"
+    if by == By.PARTIAL_LINK_TEXT:
+        return f".//a[contains(normalize-space(.), {_quote(value)})]"
+    raise InvalidSelectorException(f"Unsupported locator strategy: {by}")
+
+
+_local = threading.local()
+
+
+def _xpath(by: str, value: str) -> etree.XPath:
+    # Compiled XPath objects aren't thread safe, so each thread keeps its own
+    cache = getattr(_local, "xpaths", None)
+    if cache is None:
+        cache = _local.xpaths = {}
+    key = (by, value)
+    if key not in cache:
+        try:
+            cache[key] = etree.XPath(locator_to_xpath(by, value))
+        except etree.XPathSyntaxError as e:
+            raise InvalidSelectorException(f"Invalid selector {by}={value}: {e}")
+    return cache[key]
+
+
+def _is_hidden(node) -> bool:
+    if "hidden" in node.attrib or _DISPLAY_NONE_RE.search(node.get("style", "")):
+        return True
+    return not _HIDDEN_CLASSES.isdisjoint(node.get("class", "").split())
+
+
+def visible_text(node) -> str:
+    """Roughly what selenium's .text gives: rendered text, one line per block element"""
+    parts = []
+
+    def walk(element, is_root=False):
+        if isinstance(element.tag, str) and element.tag not in _SKIPPED_TAGS and not _is_hidden(element):
+            block = element.tag in _BLOCK_TAGS
+            if block or element.tag == "br":
+                parts.append("\n")
+            if element.text:
+                parts.append(element.text)
+            for child in element:
+                walk(child)
+            if block:
+                parts.append("\n")
+        if element.tail and not is_root:
+            parts.append(element.tail)
+
+    walk(node, is_root=True)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+@dataclass
+class Page:
+    """A recorded page: its final DOM and the results of scripts run on it"""
+    url: str
+    current_url: str
+    title: str
+    html: str
+    # script -> [[args, result], ...] in call order
+    scripts: Dict[str, list] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url, "current_url": self.current_url, "title": self.title,
+            "html": self.html, "scripts": self.scripts,
+        }
+
+
+class Recording(object):
+    """Pages keyed on page_key(url), stored as a JSON lines file"""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.pages: Dict[str, Page] = {}
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self.add(Page(**json.loads(line)))
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __contains__(self, url):
+        return page_key(url) in self.pages
+
+    def add(self, page: Page):
+        self.pages[page_key(page.url)] = page
+
+    def get(self, url: str) -> Optional[Page]:
+        return self.pages.get(page_key(url))
+
+    def save(self, path: str = None):
+        path = path or self.path
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for page in self.pages.values():
+                f.write(json.dumps(page.to_dict()) + "\n")
+        os.replace(tmp_path, path)
+
+
+class ReplayElement(object):
+    """WebElement look-alike over an lxml node"""
+
+    def __init__(self, driver: "ReplayDriver", node):
+        self._driver = driver
+        self._node = node
+        self.id = f"{id(node):x}"
+
+    def __eq__(self, other):
+        return isinstance(other, ReplayElement) and other._node is self._node
+
+    def __hash__(self):
+        return hash(self._node)
+
+    def __repr__(self):
+        return f"<ReplayElement {self.tag_name} class={self._node.get('class')!r}>"
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.tag
+
+    @property
+    def text(self) -> str:
+        return visible_text(self._node)
+
+    def get_attribute(self, name: str):
+        node = self._node
+        if name == "outerHTML":
+            return etree.tostring(node, method="html", encoding="unicode", with_tail=False)
+        if name == "innerHTML":
+            return (node.text or "") + "".join(
+                etree.tostring(child, method="html", encoding="unicode") for child in node
+            )
+        if name == "textContent":
+            return "".join(node.itertext())
+        if name == "innerText":
+            return self.text
+        value = node.get(name)
+        if value is not None and name in _URL_ATTRIBUTES:
+            return urljoin(self._driver.current_url, value)
+        return value
+
+    get_property = get_attribute
+    get_dom_attribute = get_attribute
+
+    def find_elements(self, by=By.ID, value=None) -> List["ReplayElement"]:
+        return [
+            ReplayElement(self._driver, node)
+            for node in _xpath(by, value)(self._node)
+            if isinstance(node, etree._Element) and isinstance(node.tag, str)
+        ]
+
+    def find_element(self, by=By.ID, value=None) -> "ReplayElement":
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: {by}={value}")
+        return elements[0]
+
+    def is_displayed(self) -> bool:
+        return not any(_is_hidden(node) for node in self._node.iterancestors()) and not _is_hidden(self._node)
+
+    def is_enabled(self) -> bool:
+        return "disabled" not in self._node.attrib
+
+    def is_selected(self) -> bool:
+        return "checked" in self._node.attrib or "selected" in self._node.attrib
+
+    # Interactions can't change a recorded page; they're counted so tests can assert on them
+    def click(self):
+        self._driver.on_click(self)
+
+    def send_keys(self, *values):
+        self._driver.interactions.append(("send_keys", self))
+
+    def submit(self):
+        self._driver.interactions.append(("submit", self))
+
+    def clear(self):
+        self._driver.interactions.append(("clear", self))
+
+
+class _Alert(object):
+    def __init__(self, driver, text):
+        self._driver = driver
+        self.text = text
+
+    def accept(self):
+        self._driver._alert = None
+
+    dismiss = accept
+
+
+class _SwitchTo(object):
+    def __init__(self, driver):
+        self._driver = driver
+
+    @property
+    def alert(self) -> _Alert:
+        if self._driver._alert is None:
+            raise NoAlertPresentException("no such alert")
+        return _Alert(self._driver, self._driver._alert)
+
+    def window(self, handle):
+        if handle not in self._driver._windows:
+            raise NoSuchWindowException(f"no such window: {handle}")
+        self._driver._current = handle
+
+    def new_window(self, type_hint=None):
+        self._driver._current = self._driver._open_window(None)
+
+    def default_content(self):
+        pass
+
+    def frame(self, frame_reference):
+        pass
+
+
+class _Window(object):
+    def __init__(self):
+        self.url = "about:blank"
+        self.page: Optional[Page] = None
+        self.root = None
+        self.history: List[str] = []
+
+
+class ReplayDriver(object):
+    """
+    Serves recorded pages through the WebDriver API subset the scrapers use.
+
+    Pages missing from the recording are served as an empty "Page not found" page, or
+    raise KeyError with strict=True. latency (seconds) is slept on every page load, to
+    load-test pacing and concurrency with realistic page times.
+    """
+
+    def __init__(self, recording: Union[str, Recording], strict: bool = False, latency: float = 0.0):
+        self.recording = recording if isinstance(recording, Recording) else Recording(recording)
+        self.strict = strict
+        self.latency = latency
+        self.session_id = f"replay-{uuid.uuid4().hex}"
+        self.interactions = []
+        self.pages_served = 0
+        self._trees: Dict[str, etree._Element] = {}
+        self._windows: Dict[str, _Window] = {}
+        self._current = self._open_window(None)
+        self._alert = None
+        self._cookies = []
+        self._script_calls: Dict[tuple, int] = {}
+        self.switch_to = _SwitchTo(self)
+
+    def _open_window(self, url: Optional[str]) -> str:
+        handle = f"window-{len(self._windows)}-{uuid.uuid4().hex[:8]}"
+        self._windows[handle] = _Window()
+        if url is not None:
+            self._load(self._windows[handle], url)
+        return handle
+
+    @property
+    def _window(self) -> _Window:
+        if self._current not in self._windows:
+            raise NoSuchWindowException("The current window was closed")
+        return self._windows[self._current]
+
+    def _load(self, window: _Window, url: str):
+        if self.latency:
+            time.sleep(self.latency)
+        page = self.recording.get(url)
+        if page is None:
+            if self.strict:
+                raise KeyError(f"Page not in recording: {url}")
+            logger.warning("Page not in recording: %s", url, extra={"url": url})
+            page = Page(url=url, current_url=url, title="Page not found", html=NOT_FOUND_HTML)
+        key = page_key(page.url)
+        if key not in self._trees:
+            self._trees[key] = etree.fromstring(page.html or NOT_FOUND_HTML, _PARSER)
+        window.history.append(url)
+        window.url = page.current_url or url
+        window.page = page
+        window.root = self._trees[key]
+        self.pages_served += 1
+
+    # Navigation
+
+    def get(self, url: str):
+        self._load(self._window, url)
+
+    def refresh(self):
+        self._load(self._window, self._window.history[-1])
+
+    def back(self):
+        history = self._window.history
+        if len(history) > 1:
+            history.pop()
+            self._load(self._window, history.pop())
+
+    @property
+    def current_url(self) -> str:
+        return self._window.url
+
+    @property
+    def title(self) -> str:
+        page = self._window.page
+        return page.title if page is not None else ""
+
+    @property
+    def page_source(self) -> str:
+        page = self._window.page
+        return page.html if page is not None else ""
+
+    # Windows
+
+    @property
+    def window_handles(self) -> List[str]:
+        return list(self._windows)
+
+    @property
+    def current_window_handle(self) -> str:
+        return self._current
+
+    def close(self):
+        self._windows.pop(self._current, None)
+
+    def quit(self):
+        self._windows.clear()
+
+    # Elements
+
+    def find_elements(self, by=By.ID, value=None) -> List[ReplayElement]:
+        root = self._window.root
+        if root is None:
+            return []
+        return ReplayElement(self, root).find_elements(by, value)
+
+    def find_element(self, by=By.ID, value=None) -> ReplayElement:
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: {by}={value}")
+        return elements[0]
+
+    def on_click(self, element: ReplayElement):
+        """Called for every element clicked; subclasses serving live pages can react to it"""
+        self.interactions.append(("click", element))
+
+    # Scripts
+
+    def _recorded_result(self, script: str, args):
+        page = self._window.page
+        calls = page.scripts.get(script) if page is not None else None
+        if not calls:
+            return False, None
+        matching = [result for recorded_args, result in calls if recorded_args == args]
+        if not matching:
+            return False, None
+        key = (page_key(page.url), script, json.dumps(args))
+        index = self._script_calls.get(key, 0)
+        self._script_calls[key] = index + 1
+        # Repeated calls replay in order, then keep returning the last result
+        return True, matching[min(index, len(matching) - 1)]
+
+    def execute_script(self, script: str, *args):
+        if any(isinstance(arg, ReplayElement) for arg in args):
+            return None
+        # Scripts acting on the browser rather than the page are emulated, never replayed
+        if "alert(" in script:
+            match = re.search(r"alert\((['\"])(.*?)\1\)", script)
+            self._alert = match.group(2) if match else ""
+            return None
+        if "window.open(" in script:
+            self._open_window(args[0] if args else "about:blank")
+            return None
+        found, result = self._recorded_result(script, list(args))
+        if found:
+            return result
+        if "document.readyState" in script:
+            return "complete"
+        elif "scrollHeight" in script and script.lstrip().startswith("return"):
+            return 0
+        return None
+
+    def execute_async_script(self, script: str, *args):
+        return self.execute_script(script, *args)
+
+    # Everything else the scrapers touch
+
+    def get_cookies(self) -> List[dict]:
+        return list(self._cookies)
+
+    def add_cookie(self, cookie: dict):
+        self._cookies.append(cookie)
+
+    def delete_all_cookies(self):
+        self._cookies = []
+
+    def get_log(self, log_type: str) -> list:
+        return []
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict) -> dict:
+        return {}
+
+    def execute(self, driver_command: str, params: dict = None) -> dict:
+        return {"value": None}
+
+    def implicitly_wait(self, time_to_wait):
+        pass
+
+    def set_page_load_timeout(self, time_to_wait):
+        pass
+
+    def maximize_window(self):
+        pass
+
+    def set_window_size(self, width, height, window_handle="current"):
+        pass
+
+
+_BROWSER_SCRIPT_RE = re.compile(r"\balert\(|window\.open\(")
+
+
+def _jsonable(value) -> bool:
+    try:
+        json.dumps(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+class RecordingDriver(object):
+    """
+    Wraps a real driver and records a snapshot of every page it visits into a Recording.
+
+    A page is snapshotted when it loads and again when it's left (navigating, switching
+    windows, closing), so the recording holds its final DOM, including content loaded by
+    scrolling. Script results are recorded when their arguments and result are plain JSON.
+    Everything not overridden here is passed through to the wrapped driver.
+    """
+
+    def __init__(self, driver, recording: Union[str, Recording]):
+        self._driver = driver
+        self.recording = recording if isinstance(recording, Recording) else Recording(recording)
+        self._requested = {}
+        self.switch_to = _RecordingSwitchTo(self)
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    def snapshot(self):
+        """Record the current window's page as it is now"""
+        driver = self._driver
+        try:
+            handle = driver.current_window_handle
+            url = self._requested.get(handle) or driver.current_url
+            if not url or url.startswith(("about:", "data:", "chrome:")):
+                return
+            previous = self.recording.get(url)
+            self.recording.add(Page(
+                url=url,
+                current_url=driver.current_url,
+                title=driver.title,
+                html=driver.page_source,
+                scripts=previous.scripts if previous is not None else {},
+            ))
+        except Exception:
+            logger.debug("Could not snapshot the current page", exc_info=True)
+
+    def get(self, url: str):
+        self.snapshot()
+        self._driver.get(url)
+        self._requested[self._driver.current_window_handle] = url
+        self.snapshot()
+
+    def execute_script(self, script: str, *args):
+        result = self._driver.execute_script(script, *args)
+        if not _BROWSER_SCRIPT_RE.search(script) and _jsonable(list(args)) and _jsonable(result):
+            page = self.recording.get(self._requested.get(self._driver.current_window_handle)
+                                      or self._driver.current_url)
+            if page is not None:
+                page.scripts.setdefault(script, []).append([list(args), result])
+        return result
+
+    def close(self):
+        self.snapshot()
+        self._requested.pop(self._driver.current_window_handle, None)
+        self._driver.close()
+
+    def quit(self):
+        self.snapshot()
+        self.save()
+        self._driver.quit()
+
+    def save(self, path: str = None):
+        if path or self.recording.path:
+            self.recording.save(path)
+
+
+class _RecordingSwitchTo(object):
+    def __init__(self, recorder: RecordingDriver):
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._recorder._driver.switch_to, name)
+
+    def window(self, handle):
+        self._recorder.snapshot()
+        self._recorder._driver.switch_to.window(handle)
+        self._recorder.snapshot()
+
+
+class _VirtualClock(object):
+    """Stands in for the time module in selenium's wait module: sleeping advances the clock instantly"""
+
+    def __init__(self):
+        self._offset = 0.0
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        return time.monotonic() + self._offset
+
+    def time(self) -> float:
+        return time.time() + self._offset
+
+    def sleep(self, seconds: float):
+        with self._lock:
+            self._offset += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+_instant_lock = threading.Lock()
+_instant_users = 0
+_instant_clock = None
+_instant_originals = {}
+
+
+def _patched_modules():
+    from selenium.webdriver.support import wait as wait_module
+    from . import company, connections, job_search, objects, rate_limit
+
+    # (module, attribute, what replaces it given the clock)
+    return (
+        (wait_module, "time", lambda clock: clock),
+        (connections, "time", lambda clock: clock),
+        (company, "time", lambda clock: clock),
+        (job_search, "time", lambda clock: clock),
+        (rate_limit, "time", lambda clock: clock),
+        (objects, "sleep", lambda clock: clock.sleep),
+        (job_search, "sleep", lambda clock: clock.sleep),
+    )
+
+
+@contextlib.contextmanager
+def instant_waits():
+    """
+    Make WebDriverWait timeouts, Scraper.wait(), the pauses between job cards and search
+    pages, the connection crawler's scroll pauses and the rate limiter's pacing and
+    cooldowns return immediately.
+
+    A replayed page never changes, so an element that isn't there on the first look never
+    appears; without this every optional element costs its full wait timeout. Only for
+    replay: it affects every driver in the process while active. Overlapping uses (e.g.
+    from several threads) share one virtual clock, and the real functions come back when
+    the last one exits.
+    """
+    global _instant_users, _instant_clock
+    with _instant_lock:
+        if _instant_users == 0:
+            _instant_clock = _VirtualClock()
+            for module, name, replacement in _patched_modules():
+                _instant_originals[module, name] = getattr(module, name)
+                setattr(module, name, replacement(_instant_clock))
+        _instant_users += 1
+        clock = _instant_clock
+    try:
+        yield clock
+    finally:
+        with _instant_lock:
+            _instant_users -= 1
+            if _instant_users == 0:
+                for (module, name), original in _instant_originals.items():
+                    setattr(module, name, original)
+                _instant_originals.clear()
+                _instant_clock = None
@@ -0,0 +1,428 @@
+"""
+A pool of logged in sessions over several LinkedIn accounts.
+
+SessionPool hands out one browser session per account, so work is spread over as many
+accounts as there are, each within its own daily page budget:
+
+    pool = SessionPool(load_accounts("accounts.json"), state_path="sessions.db")
+    with pool.session() as session:
+        Person(url, driver=session.driver, close_on_complete=False)
+    pool.close()
+
+A session goes to the healthy account with the most budget left, and watches how its
+account fares while in use. Its driver's rate limiter refuses to load pages past the
+account's remaining budget (raising PageBudgetExhausted), so one long session can't
+overrun it. Throttling rests the account for a cooldown that doubles on
+every throttled session in a row, a checkpoint or auth wall blocks it for a day, and a
+session that was logged out logs in again before its next use (or blocks the account if
+that fails), in a new browser if its browser crashed. Page counts and health are kept in
+SQLite, so budgets hold across runs.
+
+The accounts file is a JSON list of accounts, each with email and password, a li_at
+cookie, or a set of cookies saved with driver.get_cookies():
+
+    [{"name": "research-1", "email": "...", "password": "...", "daily_pages": 400},
+     {"name": "research-2", "cookie": "AQEDAR..."}]
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .rate_limit import HARD_SIGNALS, PageBudgetExhausted, RateLimiter, ThrottleDetected
+from .watchdog import is_driver_alive, is_signed_in
+
+logger = logging.getLogger(__name__)
+
+# Account health
+HEALTHY = "healthy"
+COOLING = "cooling"  # Throttled, resting until resume_at
+LOGGED_OUT = "logged_out"  # Logs in again before its next session
+BLOCKED = "blocked"  # Checkpoint, auth wall or failed login; rests until resume_at
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS account_usage (
+    account TEXT NOT NULL,
+    day TEXT NOT NULL,
+    pages INTEGER NOT NULL DEFAULT 0,
+    throttles INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account, day)
+);
+CREATE TABLE IF NOT EXISTS account_health (
+    account TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    resume_at REAL NOT NULL DEFAULT 0,
+    strikes INTEGER NOT NULL DEFAULT 0,
+    last_signal TEXT,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class NoSessionAvailable(Exception):
+    pass
+
+
+@dataclass
+class Account:
+    name: str
+    email: str = None
+    password: str = None
+    cookie: str = None  # li_at cookie
+    cookies: List[dict] = None  # Cookies saved with driver.get_cookies()
+    daily_pages: int = 500
+
+    def __repr__(self):
+        # Keeps credentials out of logs and tracebacks
+        return f"Account(name={self.name!r}, daily_pages={self.daily_pages})"
+
+
+def load_accounts(path: str) -> List[Account]:
+    """Read the accounts of a JSON file, see the module docstring"""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    accounts = []
+    for i, entry in enumerate(entries):
+        entry.setdefault("name", entry.get("email") or f"account-{i + 1}")
+        accounts.append(Account(**entry))
+    return accounts
+
+
+@dataclass
+class AccountStatus:
+    name: str
+    state: str
+    pages_today: int
+    daily_pages: int
+    throttles_today: int
+    resume_at: float = 0.0
+    last_signal: str = None
+    in_use: bool = False
+
+    @property
+    def budget_left(self) -> int:
+        return max(0, self.daily_pages - self.pages_today)
+
+
+@dataclass
+class Session:
+    """An account's logged in driver, lent to one worker at a time"""
+    account: Account
+    driver: object
+    _pages_at_start: int = field(default=0, repr=False)
+    _throttles_at_start: int = field(default=0, repr=False)
+    state: Optional[str] = None  # The account's health once the session is released
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return RateLimiter.for_driver(self.driver)
+
+
+def chrome_driver(headless: bool = False):
+    """A new Chrome driver, as the command line starts them"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(options=options)
+
+
+def _login(driver, account: Account):
+    from . import actions
+
+    if account.cookies:
+        driver.get("https://www.linkedin.com/login")
+        for cookie in account.cookies:
+            driver.add_cookie({key: value for key, value in cookie.items() if key != "sameSite"})
+        driver.get("https://www.linkedin.com/feed/")
+    else:
+        actions.login(driver, account.email, account.password, cookie=account.cookie)
+
+
+class SessionPool(object):
+    """
+    Logged in sessions over several accounts, with per-account daily page budgets and
+    health tracking. Thread safe: each worker takes a session with session() and the
+    pool keeps every account to one worker at a time.
+
+    Args:
+        accounts (List[Account]): The accounts to spread work over
+        state_path (str): SQLite file keeping page counts and health across runs, in memory by default
+        driver_factory (Callable): Starts a new, logged out driver
+        cooldown_seconds (float): Rest after a first throttled session, doubling on every next one
+        max_cooldown_seconds (float): Upper bound of that rest
+        blocked_seconds (float): Rest after a checkpoint, auth wall or failed login
+        throttle_threshold (int): Throttles within one session that rest the account even
+            if the work itself succeeded
+        login (Callable): Logs a driver in to an account, actions.login by default
+        is_signed_in (Callable): Tells whether a driver is still logged in, after a failure
+    """
+
+    def __init__(self, accounts: List[Account], state_path: str = ":memory:",
+                 driver_factory: Callable = chrome_driver, cooldown_seconds: float = 15 * 60,
+                 max_cooldown_seconds: float = 6 * 60 * 60, blocked_seconds: float = 24 * 60 * 60,
+                 throttle_threshold: int = 3, login: Callable = _login,
+                 is_signed_in: Callable = is_signed_in):
+        if not accounts:
+            raise ValueError("SessionPool needs at least one account")
+        names = [account.name for account in accounts]
+        if len(set(names)) != len(names):
+            raise ValueError("Account names must be unique")
+        self.accounts: Dict[str, Account] = {account.name: account for account in accounts}
+        self.driver_factory = driver_factory
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.blocked_seconds = blocked_seconds
+        self.throttle_threshold = throttle_threshold
+        self._login = login
+        self._is_signed_in = is_signed_in
+
+        self.conn = sqlite3.connect(state_path, timeout=30, check_same_thread=False)
+        if state_path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO account_health (account, state, updated_at) VALUES (?, ?, ?)",
+                [(name, HEALTHY, now) for name in self.accounts],
+            )
+
+        self._drivers: Dict[str, object] = {}
+        self._in_use = set()
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "SessionPool":
+        return cls(load_accounts(path), **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _day(now: float) -> str:
+        return time.strftime("%Y-%m-%d", time.gmtime(now))
+
+    def status(self, now: float = None) -> List[AccountStatus]:
+        """Health and today's page count of every account"""
+        now = time.time() if now is None else now
+        with self._condition:
+            health = {row[0]: row[1:] for row in self.conn.execute(
+                "SELECT account, state, resume_at, last_signal FROM account_health"
+            )}
+            usage = {row[0]: row[1:] for row in self.conn.execute(
+                "SELECT account, pages, throttles FROM account_usage WHERE day = ?", (self._day(now),)
+            )}
+            in_use = set(self._in_use)
+        statuses = []
+        for name, account in self.accounts.items():
+            state, resume_at, last_signal = health[name]
+            pages, throttles = usage.get(name, (0, 0))
+            statuses.append(AccountStatus(name, state, pages, account.daily_pages, throttles,
+                                          resume_at, last_signal, name in in_use))
+        return statuses
+
+    def _pick(self, now: float):
+        """
+        The best account to use now (or None), when one could be available next, and
+        whether all of them are blocked
+        """
+        best, best_key, next_at = None, None, None
+        statuses = self.status(now)
+        all_blocked = all(status.state == BLOCKED and status.resume_at > now for status in statuses)
+        for status in statuses:
+            if status.in_use:
+                continue
+            resting = status.state in (COOLING, BLOCKED) and status.resume_at > now
+            if resting or not status.budget_left:
+                # The budget of the day frees up at midnight UTC
+                free_at = status.resume_at if resting else (now // 86400 + 1) * 86400
+                next_at = free_at if next_at is None else min(next_at, free_at)
+                continue
+            # Most of its budget left first, then the fewest throttles today
+            key = (status.budget_left / max(1, status.daily_pages), -status.throttles_today)
+            if best_key is None or key > best_key:
+                best, best_key = status, key
+        return best, next_at, all_blocked
+
+    def _acquire(self, timeout: float = None) -> Session:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise NoSessionAvailable("The session pool is closed")
+                now = time.time()
+                status, next_at, all_blocked = self._pick(now)
+                if status is not None:
+                    self._in_use.add(status.name)
+                    break
+                if all_blocked:
+                    raise NoSessionAvailable("Every account is blocked, see SessionPool.status()")
+                wait = None if next_at is None else max(0.0, next_at - now)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise NoSessionAvailable(f"No account available within {timeout}s")
+                    wait = remaining if wait is None else min(wait, remaining)
+                if wait is not None and wait > 60:
+                    logger.info("All accounts are busy, resting or out of budget, waiting %.0fs", wait)
+                self._condition.wait(wait)
+        account = self.accounts[status.name]
+        try:
+            driver = self._driver(account, status.state)
+        except Exception as e:
+            with self._condition:
+                self._in_use.discard(account.name)
+                self._condition.notify_all()
+            self._set_health(account.name, BLOCKED, signal=getattr(e, "signal", None) or "login_failed",
+                             rest=self.blocked_seconds)
+            logger.exception("Failed to log in as %s, blocking the account", account.name)
+            return self._acquire(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        limiter = RateLimiter.for_driver(driver)
+        limiter.page_limit = limiter.pages + status.budget_left
+        return Session(account, driver, limiter.pages, limiter.throttles)
+
+    def _driver(self, account: Account, state: str):
+        driver = self._drivers.get(account.name)
+        if driver is not None and not is_driver_alive(driver):
+            logger.warning("The browser of %s is gone, starting a new one", account.name)
+            try:
+                driver.quit()
+            except Exception:
+                logger.debug("Failed to quit the dead driver", exc_info=True)
+            replacement = self.driver_factory()
+            RateLimiter.transfer(driver, replacement)
+            driver = self._drivers[account.name] = replacement
+            state = LOGGED_OUT
+        if driver is not None and state not in (LOGGED_OUT, BLOCKED):
+            return driver
+        if driver is None:
+            driver = self.driver_factory()
+            self._drivers[account.name] = driver
+        logger.info("Logging in as %s", account.name)
+        self._login(driver, account)
+        if state != HEALTHY:
+            self._set_health(account.name, HEALTHY)
+        return driver
+
+    def _set_health(self, name: str, state: str, signal: str = None, rest: float = 0.0, strike: bool = False):
+        now = time.time()
+        with self._condition:
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE account_health SET state = ?, resume_at = ?, last_signal = COALESCE(?, last_signal), "
+                    "strikes = CASE WHEN ? THEN strikes + 1 WHEN ? = ? THEN 0 ELSE strikes END, updated_at = ? "
+                    "WHERE account = ?",
+                    (state, now + rest, signal, strike, state, HEALTHY, now, name),
+                )
+            self._condition.notify_all()
+        if state != HEALTHY:
+            logger.warning("Account %s is %s%s", name, state, f" for {rest:.0f}s" if rest else "",
+                           extra={"signal": signal})
+
+    def _cooldown(self, name: str) -> float:
+        with self._condition:
+            strikes = self.conn.execute("SELECT strikes FROM account_health WHERE account = ?", (name,)).fetchone()[0]
+        return min(self.max_cooldown_seconds, self.cooldown_seconds * 2 ** strikes)
+
+    def _release(self, session: Session, error: Exception = None):
+        name = session.account.name
+        limiter = session.rate_limiter
+        limiter.page_limit = None
+        pages = limiter.pages - session._pages_at_start
+        throttles = limiter.throttles - session._throttles_at_start
+        with self._condition:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO account_usage (account, day, pages, throttles) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (account, day) DO UPDATE SET pages = pages + excluded.pages, "
+                    "throttles = throttles + excluded.throttles",
+                    (name, self._day(time.time()), pages, throttles),
+                )
+        try:
+            throttled = isinstance(error, ThrottleDetected) and not isinstance(error, PageBudgetExhausted)
+            signal = getattr(error, "signal", None) if throttled else None
+            if signal in HARD_SIGNALS:
+                session.state = BLOCKED
+                self._set_health(name, BLOCKED, signal=signal, rest=self.blocked_seconds, strike=True)
+            elif signal is not None or throttles >= self.throttle_threshold:
+                session.state = COOLING
+                self._set_health(name, COOLING, signal=signal or "throttles", rest=self._cooldown(name), strike=True)
+            elif error is not None and not self._signed_in(session.driver):
+                session.state = LOGGED_OUT
+                self._set_health(name, LOGGED_OUT, signal="logged_out")
+            else:
+                session.state = HEALTHY
+                if error is None:
+                    self._set_health(name, HEALTHY)
+        finally:
+            with self._condition:
+                self._in_use.discard(name)
+                self._condition.notify_all()
+
+    def _signed_in(self, driver) -> bool:
+        try:
+            return self._is_signed_in(driver)
+        except Exception:
+            logger.debug("Could not check the login", exc_info=True)
+            return False
+
+    @contextmanager
+    def session(self, timeout: float = None) -> Iterator[Session]:
+        """
+        Borrow the session of the best available account, waiting for one if needed.
+
+        Raises:
+            NoSessionAvailable: When no account becomes available within timeout, or no
+                account could ever take work (all of them blocked)
+        """
+        session = self._acquire(timeout)
+        try:
+            yield session
+        except Exception as e:
+            self._release(session, e)
+            raise
+        self._release(session)
+
+    def call(self, func: Callable, *args, attempts: int = 2, **kwargs):
+        """
+        Call func(driver, *args, **kwargs) with a session, moving on to another account
+        when the session's account gets throttled, logged out or runs out of budget on the way.
+        """
+        for attempt in range(1, attempts + 1):
+            session = None
+            try:
+                with self.session() as session:
+                    return func(session.driver, *args, **kwargs)
+            except Exception as e:
+                exhausted = isinstance(e, PageBudgetExhausted)
+                if attempt == attempts or session is None or (session.state == HEALTHY and not exhausted):
+                    raise
+                logger.info("Retrying on another account, %s is %s", session.account.name,
+                            "out of budget" if exhausted else session.state)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            drivers = list(self._drivers.values())
+            self._drivers = {}
+            self._condition.notify_all()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                logger.debug("Failed to quit driver", exc_info=True)
+        self.conn.close()
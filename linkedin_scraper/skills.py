@@ -0,0 +1,282 @@
+"""
+Skill and technology tagging of job descriptions.
+
+SkillTagger compiles a skill dictionary into one Aho-Corasick automaton over words, so a
+description is tagged with every skill of the dictionary in a single pass over its words,
+however many skills there are:
+
+    tagger = SkillTagger.from_dict({"python": ["Python", "py3"], "go": ["=Go", "golang"]})
+    tagger.tag("Python and Go services")  # ["python", "go"]
+    tagger.tag_jobs(jobs)  # sets job.skills, or record["skills"] for to_dict() records
+
+A dictionary maps skill IDs to aliases. Aliases match whole words only ("Java" doesn't
+match "JavaScript") and ignore case, except aliases written with a leading "=", which
+must match exactly ("=Go" matches "Go" but not "go"). Words are runs of letters and
+digits that may contain ".", "+" and "#" ("Node.js", "C++", "C#"); anything else,
+including "-" and "/", separates words, so "CI/CD" also matches "CI CD".
+"""
+import json
+import logging
+import re
+import time
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .log import elapsed_ms
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w(?:[\w.+#]*[\w+#])?")
+CASE_SENSITIVE_PREFIX = "="
+
+# A starter dictionary of common technologies, keyed on skill ID
+DEFAULT_SKILLS: Dict[str, Tuple[str, ...]] = {
+    "python": ("Python", "Python3"),
+    "java": ("Java",),
+    "javascript": ("JavaScript", "JS", "ECMAScript"),
+    "typescript": ("TypeScript",),
+    "go": ("=Go", "Golang"),
+    "rust": ("Rust",),
+    "c": ("=C",),
+    "cpp": ("C++", "CPP"),
+    "csharp": ("C#", "=.NET", "dotnet"),
+    "scala": ("Scala",),
+    "kotlin": ("Kotlin",),
+    "swift": ("=Swift",),
+    "ruby": ("Ruby",),
+    "php": ("PHP",),
+    "r": ("=R",),
+    "sql": ("SQL", "T-SQL", "PL/SQL"),
+    "bash": ("Bash", "Shell scripting"),
+    "react": ("React", "React.js", "ReactJS"),
+    "angular": ("Angular", "AngularJS"),
+    "vue": ("Vue", "Vue.js", "VueJS"),
+    "nodejs": ("Node.js", "NodeJS"),
+    "django": ("Django",),
+    "flask": ("Flask",),
+    "fastapi": ("FastAPI",),
+    "spring": ("=Spring", "Spring Boot"),
+    "rails": ("Rails", "Ruby on Rails"),
+    "dotnet_core": ("ASP.NET", ".NET Core"),
+    "postgresql": ("PostgreSQL", "Postgres"),
+    "mysql": ("MySQL",),
+    "sqlite": ("SQLite",),
+    "oracle_db": ("Oracle Database", "=Oracle"),
+    "sql_server": ("SQL Server", "MSSQL"),
+    "mongodb": ("MongoDB", "Mongo"),
+    "redis": ("Redis",),
+    "elasticsearch": ("Elasticsearch", "Elastic Search", "OpenSearch"),
+    "cassandra": ("Cassandra",),
+    "dynamodb": ("DynamoDB",),
+    "snowflake": ("Snowflake",),
+    "bigquery": ("BigQuery",),
+    "redshift": ("Redshift",),
+    "databricks": ("Databricks",),
+    "spark": ("Spark", "Apache Spark", "PySpark"),
+    "hadoop": ("Hadoop", "HDFS"),
+    "kafka": ("Kafka", "Apache Kafka"),
+    "flink": ("Flink", "Apache Flink"),
+    "airflow": ("Airflow", "Apache Airflow"),
+    "dbt": ("dbt",),
+    "pandas": ("pandas",),
+    "numpy": ("NumPy",),
+    "scikit_learn": ("scikit-learn", "sklearn"),
+    "tensorflow": ("TensorFlow",),
+    "pytorch": ("PyTorch",),
+    "machine_learning": ("Machine Learning", "=ML"),
+    "deep_learning": ("Deep Learning",),
+    "nlp": ("NLP", "Natural Language Processing"),
+    "computer_vision": ("Computer Vision",),
+    "llm": ("LLM", "LLMs", "Large Language Models"),
+    "aws": ("AWS", "Amazon Web Services"),
+    "azure": ("Azure", "Microsoft Azure"),
+    "gcp": ("GCP", "Google Cloud", "Google Cloud Platform"),
+    "docker": ("Docker",),
+    "kubernetes": ("Kubernetes", "K8s"),
+    "terraform": ("Terraform",),
+    "ansible": ("Ansible",),
+    "jenkins": ("Jenkins",),
+    "github_actions": ("GitHub Actions",),
+    "gitlab_ci": ("GitLab CI",),
+    "ci_cd": ("CI/CD", "Continuous Integration", "Continuous Delivery"),
+    "git": ("Git",),
+    "linux": ("Linux", "Unix"),
+    "graphql": ("GraphQL",),
+    "rest": ("=REST", "RESTful", "REST API"),
+    "grpc": ("gRPC",),
+    "microservices": ("Microservices", "Microservice"),
+    "rabbitmq": ("RabbitMQ",),
+    "prometheus": ("Prometheus",),
+    "grafana": ("Grafana",),
+    "tableau": ("Tableau",),
+    "power_bi": ("Power BI", "PowerBI"),
+    "excel": ("=Excel", "Microsoft Excel"),
+    "looker": ("Looker",),
+    "figma": ("Figma",),
+    "jira": ("Jira",),
+    "agile": ("Agile", "Scrum", "Kanban"),
+    "html": ("HTML", "HTML5"),
+    "css": ("CSS", "CSS3", "Sass", "SCSS"),
+    "android": ("Android",),
+    "ios": ("iOS",),
+    "selenium": ("Selenium",),
+    "playwright": ("Playwright",),
+    "cypress": ("Cypress",),
+    "pytest": ("pytest",),
+    "junit": ("JUnit",),
+}
+
+
+class Match(NamedTuple):
+    skill_id: str
+    start: int  # Index of the first word of the match
+    end: int  # Index after its last word
+
+
+def words(text: str) -> List[str]:
+    """The words of text, as skills are matched against them"""
+    return _WORD_RE.findall(text)
+
+
+class SkillTagger(object):
+    """
+    Multi-pattern skill matcher: an Aho-Corasick automaton whose alphabet is lower case
+    words. Case-sensitive aliases are matched case-insensitively by the automaton and then
+    checked against the original words.
+    """
+
+    def __init__(self):
+        # Node 0 is the root. _goto[node] maps a word to the next node, _outputs[node]
+        # lists (skill_id, length, exact words or None) of the aliases ending there,
+        # including those reached through failure links
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[str, int, Optional[Tuple[str, ...]]]]] = [[]]
+        self._compiled = True
+        self.skill_ids = set()
+        self.aliases = 0
+
+    @classmethod
+    def from_dict(cls, skills: Mapping[str, Sequence[str]]) -> "SkillTagger":
+        """Compile a dictionary of skill ID -> aliases, see the module docstring"""
+        tagger = cls()
+        for skill_id, aliases in skills.items():
+            tagger.add(skill_id, *aliases)
+        tagger.compile()
+        return tagger
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTagger":
+        """Compile a JSON file holding a dictionary of skill ID -> list of aliases"""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def default(cls) -> "SkillTagger":
+        return cls.from_dict(DEFAULT_SKILLS)
+
+    def add(self, skill_id: str, *aliases: str):
+        """Add aliases of a skill; call compile() before tagging again"""
+        for alias in aliases:
+            exact = alias.startswith(CASE_SENSITIVE_PREFIX)
+            alias_words = words(alias[1:] if exact else alias)
+            if not alias_words:
+                logger.warning("Skipping alias %r of %s without any words", alias, skill_id)
+                continue
+            node = 0
+            for word in alias_words:
+                word = word.lower()
+                next_node = self._goto[node].get(word)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][word] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                node = next_node
+            output = (skill_id, len(alias_words), tuple(alias_words) if exact else None)
+            if output not in self._outputs[node]:
+                self._outputs[node].append(output)
+            self.skill_ids.add(skill_id)
+            self.aliases += 1
+        self._compiled = False
+
+    def compile(self):
+        """Compute the failure links, breadth first"""
+        queue = []
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            queue.append(node)
+        for node in queue:
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(word, 0)
+                # An alias ending here also ends every alias that is its suffix
+                for output in self._outputs[self._fail[child]]:
+                    if output not in self._outputs[child]:
+                        self._outputs[child].append(output)
+        self._compiled = True
+
+    def matches(self, text: str) -> List[Match]:
+        """Every alias occurrence in text, in order of where it ends"""
+        if not self._compiled:
+            self.compile()
+        if not text:
+            return []
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        lowered = _WORD_RE.findall(text.lower())
+        original = None
+        found = []
+        node = 0
+        for i, word in enumerate(lowered):
+            while True:
+                next_node = goto[node].get(word)
+                if next_node is not None:
+                    node = next_node
+                    break
+                if not node:
+                    break
+                node = fail[node]
+            if not node or not outputs[node]:
+                continue
+            for skill_id, length, exact in outputs[node]:
+                if exact is not None:
+                    if original is None:
+                        original = _WORD_RE.findall(text)
+                    # Lower casing can change word boundaries of some unusual characters
+                    if len(original) != len(lowered) or tuple(original[i - length + 1:i + 1]) != exact:
+                        continue
+                found.append(Match(skill_id, i - length + 1, i + 1))
+        return found
+
+    def tag(self, text: str) -> List[str]:
+        """IDs of the skills mentioned in text, in order of first mention"""
+        return list(dict.fromkeys(match.skill_id for match in self.matches(text)))
+
+    def tag_jobs(self, jobs: Iterable, fields: Sequence[str] = ("job_title", "job_description")) -> List:
+        """
+        Tag a batch of Job objects or to_dict() records with the skills mentioned in their
+        title and description, setting job.skills (record["skills"] for records).
+
+        Returns:
+            List: The jobs
+        """
+        start = time.perf_counter()
+        jobs = list(jobs)
+        tagged = 0
+        for job in jobs:
+            is_record = isinstance(job, dict)
+            text = "\n".join(
+                (job.get(field) if is_record else getattr(job, field, None)) or "" for field in fields
+            )
+            skills = self.tag(text)
+            tagged += bool(skills)
+            if is_record:
+                job["skills"] = skills
+            else:
+                job.skills = skills
+        logger.debug("Tagged %d of %d jobs with skills", tagged, len(jobs),
+                     extra={"count": tagged, "elapsed_ms": elapsed_ms(start)})
+        return jobs
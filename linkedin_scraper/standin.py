@@ -0,0 +1,658 @@
+"""
+A local stand-in for the LinkedIn pages the scrapers read, for load testing at scale.
+
+StandinSite generates job search result pages, job detail panes and job pages, profiles
+with their details pages and company home/about/people pages. Every page is a pure
+function of its URL and the site's seed, with the class names JobSearch, Job, Person and
+Company look for. Latency, server errors and throttling (429 pages, per client page
+budgets, checkpoint redirects) are configurable so pacing and rate control can be tuned
+against it.
+
+Serve it over HTTP for real browsers:
+
+    with StandinServer(StandinSite(total_jobs=100_000)) as server:
+        search = JobSearch(webdriver.Chrome(), base_url=server.url + "/jobs/", scrape=False)
+
+or drive the scrapers with no browser at all through StandinDriver, which renders the
+pages in process (any host is served, so linkedin.com URLs work unchanged):
+
+    with instant_waits():
+        search = JobSearch(StandinDriver(site), scrape=False)
+        jobs = search.search_multiple_pages("data engineer", 90009828, max_pages=4000, delay_seconds=0)
+
+Run a server from the command line with python -m linkedin_scraper.standin --help.
+"""
+import argparse
+import collections
+import hashlib
+import logging
+import random
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, quote, urljoin, urlsplit
+
+from lxml import etree
+
+from .enums import ExperienceLevel, WorkplaceType
+from .query import JobQuery
+from .replay import Page, Recording, ReplayDriver, ReplayElement
+
+logger = logging.getLogger(__name__)
+
+# Share of all postings per workplace type and experience level, as the filters see them
+WORKPLACE_WEIGHTS = {WorkplaceType.ON_SITE: 0.55, WorkplaceType.REMOTE: 0.15, WorkplaceType.HYBRID: 0.30}
+EXPERIENCE_WEIGHTS = {
+    ExperienceLevel.INTERNSHIP: 0.05, ExperienceLevel.ENTRY_LEVEL: 0.25, ExperienceLevel.ASSOCIATE: 0.15,
+    ExperienceLevel.MID_SENIOR: 0.45, ExperienceLevel.DIRECTOR: 0.07, ExperienceLevel.EXECUTIVE: 0.03,
+}
+
+_CITIES = [
+    "Warsaw, Poland", "Berlin, Germany", "London, United Kingdom", "Amsterdam, Netherlands",
+    "Paris, France", "Madrid, Spain", "Stockholm, Sweden", "Dublin, Ireland", "Zurich, Switzerland",
+    "New York, United States", "San Francisco, United States", "Toronto, Canada",
+]
+_ROLES = [
+    "Data Engineer", "Software Engineer", "Backend Developer", "Frontend Developer", "Data Scientist",
+    "Machine Learning Engineer", "DevOps Engineer", "Product Manager", "QA Engineer", "Data Analyst",
+    "Site Reliability Engineer", "Solutions Architect",
+]
+_SENIORITY = {
+    ExperienceLevel.INTERNSHIP: "Intern", ExperienceLevel.ENTRY_LEVEL: "Junior", ExperienceLevel.ASSOCIATE: "",
+    ExperienceLevel.MID_SENIOR: "Senior", ExperienceLevel.DIRECTOR: "Director of", ExperienceLevel.EXECUTIVE: "VP,",
+}
+_COMPANY_WORDS = [
+    "Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Cyberdyne", "Soylent",
+    "Tyrell", "Wonka", "Aperture", "Massive", "Dynamic", "Blue", "Northwind", "Contoso",
+]
+_COMPANY_SUFFIXES = ["Labs", "Systems", "Analytics", "Software", "Group", "Technologies", "Data", "Cloud"]
+_INDUSTRIES = ["Software Development", "IT Services and IT Consulting", "Financial Services", "Retail", "Telecommunications"]
+_FIRST_NAMES = ["Anna", "Piotr", "Maria", "Jan", "Eva", "Lukas", "Sofia", "Noah", "Emma", "Liam", "Olga", "Marek"]
+_LAST_NAMES = ["Nowak", "Kowalski", "Schmidt", "Smith", "Garcia", "Muller", "Jensen", "Rossi", "Novak", "Brown"]
+_SCHOOLS = ["University of Warsaw", "Technical University of Munich", "University of Amsterdam", "ETH Zurich"]
+_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+N_COMPANIES = 5000
+JOB_ID_BASE = 3_000_000_000
+
+NAV = '<nav class="global-nav"><ul><li><a class="global-nav__primary-link" href="/feed/">Home</a></li></ul></nav>'
+
+# Job cards load their details pane like LinkedIn's own script does. The request is
+# synchronous so the pane is in place when the click returns, which is what
+# JobSearch.scrape_job_card assumes.
+_PANE_SCRIPT = """<script>
+document.addEventListener('click', function (event) {
+    var card = event.target.closest('[data-job-id]');
+    if (!card) { return; }
+    event.preventDefault();
+    var request = new XMLHttpRequest();
+    request.open('GET', '/jobs/pane/' + card.dataset.jobId + '/?posted=' + card.dataset.posted, false);
+    request.send();
+    if (request.status === 200) {
+        document.querySelector('.jobs-search__job-details--container').outerHTML = request.responseText;
+    }
+});
+</script>"""
+
+_PARSER = etree.HTMLParser()
+
+
+class Response(NamedTuple):
+    status: int
+    title: str
+    html: str
+    location: Optional[str] = None  # Redirect target
+
+
+def _seed(*parts) -> int:
+    """A stable 64 bit seed, unlike hash() which changes between processes"""
+    digest = hashlib.blake2b("\x1f".join(str(part) for part in parts).encode("utf-8"), digest_size=8)
+    return int.from_bytes(digest.digest(), "big")
+
+
+def _int_list(values: List[str]) -> Tuple[int, ...]:
+    return tuple(sorted({int(v) for value in values for v in value.split(",") if v.strip().isdigit()}))
+
+
+def posted_text(minutes: int) -> str:
+    """Relative posting date text as shown on job cards"""
+    for unit, size in (("month", 43200), ("week", 10080), ("day", 1440), ("hour", 60)):
+        if minutes >= size:
+            amount = minutes // size
+            return f"{amount} {unit}{'s' if amount > 1 else ''} ago"
+    return f"{max(minutes, 1)} minute{'s' if minutes > 1 else ''} ago"
+
+
+def page(title: str, body: str, script: str = "") -> str:
+    return (
+        f"<!DOCTYPE html><html><head><title>{escape(title)}</title></head>"
+        f"<body>{NAV}<main class='scaffold-layout__main'>{body}</main>{script}</body></html>"
+    )
+
+
+def _line(text: str) -> str:
+    text = escape(text)
+    return f'<span aria-hidden="true">{text}</span><span class="visually-hidden">{text}</span>'
+
+
+def _entity(url: str, lines: List[str], summary: str = "") -> str:
+    spans = "".join(f"<div>{_line(text)}</div>" for text in lines)
+    return (
+        '<li class="pvs-list__paged-list-item artdeco-list__item"><div data-view-name="profile-component-entity">'
+        f'<div><a href="{url}"><img alt=""/></a></div>'
+        f"<div><div><div>{spans}</div></div><div>{summary}</div></div>"
+        "</div></li>"
+    )
+
+
+class StandinSite(object):
+    """
+    Generates the stand-in pages and applies the configured faults.
+
+    Args:
+        seed (int): Changes every generated job, profile and company
+        total_jobs (int): Results of an unfiltered search; the f_WT and f_E filters keep
+            their share of it (see WORKPLACE_WEIGHTS and EXPERIENCE_WEIGHTS)
+        max_results (int, optional): Serve no results past this offset, LinkedIn stops at 1000
+        latency (float): Seconds every response takes, plus up to latency_jitter more
+        latency_jitter (float): See latency
+        error_rate (float): Share of requests answered with a 500 error page
+        throttle_rate (float): Share of requests answered with a 429 "Too Many Requests" page
+        checkpoint_rate (float): Share of requests redirected to a security checkpoint
+        max_pages_per_minute (float, optional): Answer a client's requests with 429 pages
+            while it made more than this many in the last minute
+        posting_window_days (int): Age of the oldest posting
+    """
+
+    def __init__(self, seed: int = 0, total_jobs: int = 100_000, max_results: int = None,
+                 latency: float = 0.0, latency_jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, checkpoint_rate: float = 0.0,
+                 max_pages_per_minute: float = None, posting_window_days: int = 30):
+        self.seed = seed
+        self.total_jobs = total_jobs
+        self.max_results = max_results
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.checkpoint_rate = checkpoint_rate
+        self.max_pages_per_minute = max_pages_per_minute
+        self.posting_window_days = posting_window_days
+        self.stats = collections.Counter()
+        self._faults = random.Random(seed)
+        self._requests: Dict[str, collections.deque] = collections.defaultdict(collections.deque)
+        self._lock = threading.Lock()
+
+    # Serving
+
+    def respond(self, url: str, client: str = "") -> Response:
+        """
+        The response to a request for url from client, after the configured latency and
+        with the configured faults. Requests from the same client share a page budget.
+        """
+        with self._lock:
+            jitter = self._faults.random() * self.latency_jitter
+            draw = self._faults.random()
+            now = time.monotonic()
+            requests = self._requests[client]
+            requests.append(now)
+            while requests and requests[0] < now - 60:
+                requests.popleft()
+            over_budget = self.max_pages_per_minute is not None and len(requests) > self.max_pages_per_minute
+        if self.latency or jitter:
+            time.sleep(self.latency + jitter)
+
+        if over_budget or draw < self.throttle_rate:
+            response = Response(429, "Too Many Requests", page("Too Many Requests", "<h1>HTTP ERROR 429</h1>"))
+        elif draw < self.throttle_rate + self.checkpoint_rate:
+            response = Response(302, "", "", location="/checkpoint/challenge/")
+        elif draw < self.throttle_rate + self.checkpoint_rate + self.error_rate:
+            response = Response(500, "LinkedIn", page("LinkedIn", "<h1>Something went wrong</h1>"))
+        else:
+            response = self.render(url)
+        self.stats[response.status] += 1
+        return response
+
+    def render(self, url: str) -> Response:
+        """The page at url, without latency or faults"""
+        parts = urlsplit(url)
+        path = [segment for segment in parts.path.split("/") if segment]
+        params = parse_qs(parts.query)
+        try:
+            if path[:2] == ["jobs", "search"]:
+                return self.search_page(params)
+            if path[:2] == ["jobs", "pane"] and len(path) == 3:
+                posted = params.get("posted", [""])[0]
+                return Response(200, "", self.job_pane(int(path[2]), int(posted) if posted.isdigit() else None))
+            if path[:2] == ["jobs", "view"] and len(path) >= 3:
+                return self.job_page(int(path[2]))
+            if path[:1] == ["in"] and len(path) >= 2:
+                return self.profile_page(path[1], "/".join(path[2:]))
+            if path[:1] == ["company"] and len(path) >= 2:
+                return self.company_page(path[1], "/".join(path[2:]))
+            if path[:1] == ["feed"] or not path:
+                return Response(200, "Feed | LinkedIn", page("Feed | LinkedIn", "<h1>Feed</h1>"))
+            if path[:1] == ["checkpoint"]:
+                return Response(200, "Security Verification | LinkedIn",
+                                page("Security Verification | LinkedIn", "<h1>Let's do a quick security check</h1>"))
+        except ValueError:
+            pass
+        return Response(404, "Page not found | LinkedIn", page("Page not found | LinkedIn", "<h1>Page not found</h1>"))
+
+    # Jobs
+
+    def result_count(self, workplace_types=(), experience_levels=()) -> int:
+        """Results of a search with these filters, before max_results"""
+        share = sum(WORKPLACE_WEIGHTS[WorkplaceType(wt)] for wt in workplace_types or WORKPLACE_WEIGHTS)
+        share *= sum(EXPERIENCE_WEIGHTS[ExperienceLevel(exp)] for exp in experience_levels or EXPERIENCE_WEIGHTS)
+        return round(self.total_jobs * share)
+
+    def job_id(self, search_seed: int, position: int, geoid: int, workplace_types, experience_levels) -> int:
+        """
+        The job at position of a search. Its city, workplace type and experience level are
+        encoded in the id, so the pane and job page agree with the search without any state.
+        """
+        rnd = random.Random(_seed(search_seed, position))
+        # A different multiple of a number coprime to 10**7 per position keeps ids unique within a search
+        serial = (search_seed + position * 982_451) % 10_000_000
+        workplace_types = workplace_types or tuple(WORKPLACE_WEIGHTS)
+        experience_levels = experience_levels or tuple(EXPERIENCE_WEIGHTS)
+        wt = rnd.choices(workplace_types, [WORKPLACE_WEIGHTS[WorkplaceType(wt)] for wt in workplace_types])[0]
+        exp = rnd.choices(experience_levels, [EXPERIENCE_WEIGHTS[ExperienceLevel(exp)] for exp in experience_levels])[0]
+        city = geoid % len(_CITIES)
+        return JOB_ID_BASE + serial * 10_000 + city * 100 + int(wt) * 10 + int(exp)
+
+    def job(self, job_id: int) -> dict:
+        """The fields of a job, generated from its id alone"""
+        city, wt, exp = job_id // 100 % 100, WorkplaceType(job_id // 10 % 10), ExperienceLevel(job_id % 10)
+        rnd = random.Random(_seed(self.seed, "job", job_id))
+        company = rnd.randrange(N_COMPANIES)
+        role = rnd.choice(_ROLES)
+        title = f"{_SENIORITY[exp]} {role}".strip()
+        applicants = rnd.choice([rnd.randint(1, 99), 100, 200])
+        return {
+            "job_id": job_id,
+            "title": title,
+            "company": self.company_name(company),
+            "company_slug": self.company_slug(company),
+            "location": _CITIES[city],
+            "workplace_type": wt,
+            "experience": exp,
+            "applicants": f"Over {applicants} applicants" if applicants >= 100 else f"{applicants} applicants",
+            "posted_minutes": rnd.randrange(self.posting_window_days * 1440),
+            "description": " ".join(
+                f"We are looking for a {title} to join {self.company_name(company)}."
+                for _ in range(rnd.randint(3, 8))
+            ),
+        }
+
+    def search_page(self, params: Dict[str, List[str]]) -> Response:
+        keywords = " ".join(params.get("keywords", [""])[0].split())
+        geoid = int(params.get("geoId", ["0"])[0] or 0)
+        workplace_types = _int_list(params.get("f_WT", []))
+        experience_levels = _int_list(params.get("f_E", []))
+        sort_by = params.get("sortBy", ["R"])[0]
+        start = int(params.get("start", ["0"])[0] or 0)
+        # f_TPR=r<seconds> keeps the postings of the last that many seconds
+        posted_within = params.get("f_TPR", [""])[0]
+        within = max(1, int(posted_within[1:]) // 60) if posted_within[1:].isdigit() else None
+
+        postings = self.result_count(workplace_types, experience_levels)
+        window = self.posting_window_days * 1440
+        total = postings if within is None else min(postings, -(-within * postings // window))
+        served = min(total, self.max_results) if self.max_results is not None else total
+        search_seed = _seed(self.seed, keywords.lower(), geoid, workplace_types, experience_levels)
+        cards, pane = [], '<div class="jobs-search__job-details--container"></div>'
+        for position in range(start, min(start + JobQuery.JOBS_PER_PAGE, served)):
+            job = self.job(self.job_id(search_seed, position, geoid, workplace_types, experience_levels))
+            # Most recent first spreads the postings evenly over the window
+            if sort_by == "DD":
+                posted = position * window // max(postings, 1)
+            else:
+                posted = job["posted_minutes"] % within if within is not None else job["posted_minutes"]
+            if not cards:
+                pane = self.job_pane(job["job_id"], posted)
+            cards.append(self.job_card(job, posted))
+
+        title = f"{keywords or 'All'} Jobs in {_CITIES[geoid % len(_CITIES)]} | LinkedIn"
+        if cards:
+            results = f'<ul class="scaffold-layout__list-container">{"".join(cards)}</ul>'
+        else:
+            results = '<div class="jobs-search-no-results-banner"><h2>No matching jobs found.</h2></div>'
+        body = (
+            '<div class="scaffold-layout__list">'
+            '<header class="jobs-search-results-list__header">'
+            f'<div class="jobs-search-results-list__subtitle"><span>{total:,} results</span></div></header>'
+            f'<div class="jobs-search-results-list">{results}</div>'
+            "</div>"
+            f'<div class="scaffold-layout__detail">{pane}</div>'
+        )
+        return Response(200, title, page(title, body, _PANE_SCRIPT))
+
+    def job_card(self, job: dict, posted: int) -> str:
+        return (
+            f'<li class="scaffold-layout__list-item" data-occludable-job-id="{job["job_id"]}">'
+            f'<div class="job-card-container job-card-list" data-job-id="{job["job_id"]}" data-posted="{posted}">'
+            '<div class="artdeco-entity-lockup__title">'
+            f'<a class="job-card-list__title--link" href="/jobs/view/{job["job_id"]}/?trk=public_jobs_topcard-title">'
+            f'{escape(job["title"])}</a></div>'
+            f'<div class="artdeco-entity-lockup__subtitle"><span>{escape(job["company"])}</span></div>'
+            '<ul class="job-card-container__metadata-wrapper">'
+            f'<li>{escape(job["location"])} ({job["workplace_type"].label})</li></ul>'
+            f'<ul class="job-card-list__footer-wrapper"><li><time>{posted_text(posted)}</time></li></ul>'
+            "</div></li>"
+        )
+
+    def _top_card(self, job: dict, posted: int) -> str:
+        # Job pages read location and posting date as the 1st and 4th non-empty span,
+        # search panes the posting date and applicants as the 3rd and 5th low emphasis one
+        low = '<span class="tvm__text tvm__text--low-emphasis">{}</span>'
+        return (
+            f'<div class="job-details-jobs-unified-top-card__company-name">'
+            f'<a href="/company/{job["company_slug"]}/life/">{escape(job["company"])}</a></div>'
+            f'<div class="job-details-jobs-unified-top-card__job-title"><h1>{escape(job["title"])}</h1></div>'
+            '<div class="job-details-jobs-unified-top-card__primary-description-container"><div>'
+            + low.format(f'<span>{escape(job["location"])}</span>')
+            + low.format(" · ")
+            + low.format(posted_text(posted))
+            + low.format(" · ")
+            + low.format(escape(job["applicants"]))
+            + "</div></div>"
+            '<ul><li class="job-details-jobs-unified-top-card__job-insight">'
+            f'<span>{job["workplace_type"].label}</span> <span>Full-time</span> '
+            f'<span>{job["experience"].label}</span></li></ul>'
+        )
+
+    def job_pane(self, job_id: int, posted: int = None) -> str:
+        """The details pane of a search results page, as loaded when a card is clicked"""
+        job = self.job(job_id)
+        posted = job["posted_minutes"] if posted is None else posted
+        return (
+            '<div class="jobs-search__job-details--container">'
+            + self._top_card(job, posted)
+            + f'<article class="jobs-description__container"><div id="job-details"><p>{escape(job["description"])}</p>'
+            "</div></article></div>"
+        )
+
+    def job_page(self, job_id: int) -> Response:
+        job = self.job(job_id)
+        title = f'{job["title"]} | {job["company"]} | LinkedIn'
+        body = (
+            '<div class="jobs-details">' + self._top_card(job, job["posted_minutes"])
+            + f'<div class="jobs-unified-top-card__applicant-count">{escape(job["applicants"])}</div>'
+            f'<div class="jobs-description"><div id="job-details"><p>{escape(job["description"])}</p></div>'
+            '<button type="button">See more</button></div></div>'
+        )
+        return Response(200, title, page(title, body))
+
+    # Profiles
+
+    def person_name(self, slug: str) -> str:
+        rnd = random.Random(_seed(self.seed, "person", slug))
+        return f"{rnd.choice(_FIRST_NAMES)} {rnd.choice(_LAST_NAMES)}"
+
+    def person_slug(self, company: int, index: int) -> str:
+        name = self.person_name(f"{company}-{index}").lower().replace(" ", "-")
+        return f"{name}-{company}-{index}"
+
+    def _dates(self, rnd: random.Random) -> str:
+        start = rnd.randint(2005, 2022)
+        if rnd.random() < 0.3:
+            return f"{rnd.choice(_MONTHS)} {start} - Present · {2026 - start} yrs"
+        end = min(start + rnd.randint(0, 4), 2025)
+        return f"{rnd.choice(_MONTHS)} {start} - {rnd.choice(_MONTHS)} {end} · {end - start + 1} yrs"
+
+    def experience_section(self, rnd: random.Random) -> str:
+        entries = []
+        for _ in range(rnd.randint(1, 6)):
+            company = rnd.randrange(N_COMPANIES)
+            url = f"https://www.linkedin.com/company/{self.company_slug(company)}/"
+            if rnd.random() < 0.2:
+                positions = "".join(
+                    '<li class="pvs-list__paged-list-item"><a href="#">'
+                    f"<div>{_line(rnd.choice(_ROLES))}</div><div>{_line(self._dates(rnd))}</div>"
+                    f"<div>{_line(rnd.choice(_CITIES))}</div></a></li>"
+                    for _ in range(rnd.randint(2, 3))
+                )
+                summary = f'<div class="pvs-list__container"><ul>{positions}</ul></div>'
+                entries.append(_entity(url, [self.company_name(company), "Full-time", rnd.choice(_CITIES)], summary))
+            else:
+                lines = [rnd.choice(_ROLES), f"{self.company_name(company)} · Full-time", self._dates(rnd)]
+                if rnd.random() < 0.7:
+                    lines.append(rnd.choice(_CITIES))
+                entries.append(_entity(url, lines, _line("Built and ran data pipelines.")))
+        return f'<div class="pvs-list__container"><ul>{"".join(entries)}</ul></div>'
+
+    def education_section(self, rnd: random.Random) -> str:
+        entries = []
+        for _ in range(rnd.randint(1, 3)):
+            start = rnd.randint(1995, 2020)
+            entries.append(_entity(
+                f"https://www.linkedin.com/school/{rnd.randrange(1000)}/",
+                [rnd.choice(_SCHOOLS), "Master's degree, Computer Science", f"{start} - {start + rnd.randint(3, 5)}"],
+            ))
+        return f'<div class="pvs-list__container"><ul>{"".join(entries)}</ul></div>'
+
+    def profile_page(self, slug: str, section: str) -> Response:
+        name = self.person_name(slug)
+        rnd = random.Random(_seed(self.seed, "profile", slug))
+        experiences, educations = self.experience_section(rnd), self.education_section(rnd)
+        if section == "details/experience":
+            return Response(200, f"{name} | LinkedIn", page(f"{name} | LinkedIn", f"<section>{experiences}</section>"))
+        if section == "details/education":
+            return Response(200, f"{name} | LinkedIn", page(f"{name} | LinkedIn", f"<section>{educations}</section>"))
+        if section:
+            return self.render("/404/")
+        body = (
+            '<section class="artdeco-card pv-top-card"><div class="mt2 relative">'
+            f"<h1>{escape(name)}</h1>"
+            f'<span class="text-body-small inline t-black--light break-words">{rnd.choice(_CITIES)}</span></div></section>'
+            '<section class="artdeco-card"><div id="about"></div>'
+            f'<div class="display-flex"><span>{escape(name)} builds data products.</span></div></section>'
+        )
+        return Response(200, f"{name} | LinkedIn", page(f"{name} | LinkedIn", body))
+
+    # Companies
+
+    def company_name(self, company: int) -> str:
+        rnd = random.Random(_seed(self.seed, "company", company))
+        return f"{rnd.choice(_COMPANY_WORDS)} {rnd.choice(_COMPANY_SUFFIXES)}"
+
+    def company_slug(self, company: int) -> str:
+        return f"{self.company_name(company).lower().replace(' ', '-')}-{company}"
+
+    def company_page(self, slug: str, section: str) -> Response:
+        company = int(slug.rsplit("-", 1)[-1])
+        name = self.company_name(company)
+        rnd = random.Random(_seed(self.seed, "company-page", company))
+        employees = rnd.randint(10, 60)
+        title = f"{name} | LinkedIn"
+        top_card = (
+            '<section class="org-top-card"><div dir="ltr">'
+            f'<h1 class="org-top-card-summary__title">{escape(name)}</h1></div>'
+            '<nav><ul class="org-page-navigation__items">'
+            '<li><a data-control-name="page_member_main_nav_about_tab" href="about/">About</a></li>'
+            '<li><a data-control-name="page_member_main_nav_people_tab" href="people/">People</a></li>'
+            "</ul></nav></section>"
+        )
+        if not section:
+            return Response(200, title, page(title, top_card))
+        if section == "about":
+            details = [
+                ("Website", f"https://www.{slug}.example"),
+                ("Industry", rnd.choice(_INDUSTRIES)),
+                ("Company size", rnd.choice(["11-50 employees", "51-200 employees", "201-500 employees"])),
+                ("Headquarters", rnd.choice(_CITIES)),
+                ("Type", "Privately Held"),
+                ("Founded", str(rnd.randint(1990, 2020))),
+                ("Specialties", "Data, Cloud, Analytics"),
+            ]
+            grid = "".join(f"<dt>{label}</dt><dd>{escape(value)}</dd>" for label, value in details)
+            body = (
+                top_card
+                + '<section class="artdeco-card org-page-details-module__card-spacing org-about-module__margin-bottom">'
+                f"<h2>Overview</h2><p>{escape(name)} builds software for data teams.</p><dl>{grid}</dl></section>"
+                f'<section class="mt1"><span>See all {employees} employees on LinkedIn</span></section>'
+            )
+            return Response(200, title, page(title, body))
+        if section == "people":
+            people = "".join(
+                f'<li><div><a href="/in/{self.person_slug(company, i)}/">'
+                f'<span dir="ltr">{escape(self.person_name(f"{company}-{i}"))}</span></a></div>'
+                f"<div>· 2nd</div><div>2nd degree connection</div>"
+                f"<div>{escape(random.Random(_seed(self.seed, company, i)).choice(_ROLES))} at {escape(name)}</div></li>"
+                for i in range(employees)
+            )
+            return Response(200, title, page(title, top_card + f'<ul class="list-style-none">{people}</ul>'))
+        return self.render("/404/")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    site: StandinSite = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        # Each browser session gets a cookie so page budgets apply per session, not per host
+        cookies = dict(
+            part.strip().split("=", 1) for part in (self.headers.get("Cookie") or "").split(";") if "=" in part
+        )
+        client = cookies.get("standin_session") or self.client_address[0]
+        response = self.site.respond(self.path, client)
+        body = response.html.encode("utf-8")
+        self.send_response(response.status)
+        if response.location:
+            self.send_header("Location", response.location)
+        if "standin_session" not in cookies:
+            self.send_header("Set-Cookie", f"standin_session={_seed(time.time_ns(), id(self)):x}; Path=/")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class StandinServer(object):
+    """Serves a StandinSite over HTTP from a background thread; port 0 picks a free port"""
+
+    def __init__(self, site: StandinSite = None, host: str = "127.0.0.1", port: int = 0):
+        self.site = site or StandinSite()
+        handler = type("Handler", (_Handler,), {"site": self.site})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+        logger.info("Stand-in serving at %s", self.url, extra={"url": self.url})
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class StandinDriver(ReplayDriver):
+    """
+    ReplayDriver over a StandinSite instead of a recording: pages are rendered on request,
+    with the site's latency and faults, and clicks on job cards and links work like they
+    do in a browser.
+    """
+
+    def __init__(self, site: StandinSite = None, max_redirects: int = 5):
+        super().__init__(Recording())
+        self.site = site or StandinSite()
+        self.max_redirects = max_redirects
+
+    def _load(self, window, url: str):
+        response = self.site.respond(url, self.session_id)
+        for _ in range(self.max_redirects):
+            if response.location is None:
+                break
+            url = urljoin(url, response.location)
+            response = self.site.respond(url, self.session_id)
+        window.history.append(url)
+        window.url = url
+        window.page = Page(url=url, current_url=url, title=response.title, html=response.html)
+        window.root = etree.fromstring(response.html or "<html></html>", _PARSER)
+        self.pages_served += 1
+
+    def on_click(self, element: ReplayElement):
+        super().on_click(element)
+        node = element._node
+        card = next((n for n in node.iterancestors() if n.get("data-job-id")), None)
+        if node.get("data-job-id"):
+            card = node
+        if card is not None:
+            self._load_pane(card)
+            return
+        link = next((n for n in [node, *node.iterancestors()] if n.tag == "a"), None)
+        if link is not None and link.get("href") and not link.get("href").startswith("#"):
+            self.get(urljoin(self.current_url, link.get("href")))
+
+    def _load_pane(self, card):
+        url = urljoin(self.current_url, f"/jobs/pane/{card.get('data-job-id')}/?posted={quote(card.get('data-posted', ''))}")
+        response = self.site.respond(url, self.session_id)
+        if response.status != 200:
+            return
+        root = self._window.root
+        panes = root.xpath("//*[contains(concat(' ', @class, ' '), ' jobs-search__job-details--container ')]")
+        if panes:
+            pane = etree.fromstring(response.html, _PARSER).find(".//body")[0]
+            panes[0].getparent().replace(panes[0], pane)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m linkedin_scraper.standin",
+        description="Serve generated LinkedIn-like pages for load testing the scrapers.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=100_000, help="results of an unfiltered search")
+    parser.add_argument("--max-results", type=int, help="serve no results past this offset (LinkedIn: 1000)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="up to this many more seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 500 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of 429 responses")
+    parser.add_argument("--checkpoint-rate", type=float, default=0.0, help="share of checkpoint redirects")
+    parser.add_argument("--max-pages-per-minute", type=float, help="429 responses to sessions going faster")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    site = StandinSite(
+        seed=args.seed, total_jobs=args.jobs, max_results=args.max_results, latency=args.latency,
+        latency_jitter=args.latency_jitter, error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        checkpoint_rate=args.checkpoint_rate, max_pages_per_minute=args.max_pages_per_minute,
+    )
+    server = StandinServer(site, args.host, args.port)
+    logger.info("Stand-in serving at %s, job search at %s/jobs/", server.url, server.url)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        logger.info("Responses by status: %s", dict(site.stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from .log import elapsed_ms
+from .normalize import (
+    parse_applicant_count,
+    parse_experience_level,
+    parse_job_id,
+    parse_posted_date,
+    parse_workplace_type,
+)
+
+logger = logging.getLogger(__name__)
+
+JOBS = "jobs"
+COMPANIES = "companies"
+PEOPLE = "people"
+
+_JOB_COLUMNS = (
+    "job_id", "job_title", "company", "company_linkedin_url", "location", "posted_date",
+    "applicant_count", "job_description", "benefits", "workplace_type", "experience",
+    "posted_at", "applicant_total", "workplace", "experience_level",
+)
+_COMPANY_COLUMNS = (
+    "name", "about_us", "specialties", "website", "phone", "industry", "company_type",
+    "headquarters", "company_size", "founded", "headcount",
+    "showcase_pages", "affiliated_companies", "employees",
+)
+_PERSON_COLUMNS = ("name", "about", "location", "open_to_work", "company", "job_title")
+_EXPERIENCE_COLUMNS = (
+    "institution_name", "linkedin_url", "position_title", "from_date", "to_date", "start_date",
+    "end_date", "duration", "duration_months", "location", "description",
+)
+_EDUCATION_COLUMNS = (
+    "institution_name", "linkedin_url", "degree", "from_date", "to_date", "start_date",
+    "end_date", "description",
+)
+_TRACKING_COLUMNS = ("content_hash", "first_seen", "last_seen", "updated_at")
+
+_COLUMNS = {JOBS: _JOB_COLUMNS, COMPANIES: _COMPANY_COLUMNS, PEOPLE: _PERSON_COLUMNS}
+# Fields that change with the time of the scrape rather than with the record ("3 days ago"
+# is "4 days ago" the next day), left out of the content hash
+_UNHASHED = {JOBS: frozenset(("posted_date", "posted_at"))}
+
+
+def _entity_table(table: str, columns) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table} (\n"
+        "    linkedin_url TEXT PRIMARY KEY,\n"
+        + "".join(f"    {column},\n" for column in columns)
+        + "    content_hash TEXT NOT NULL,\n"
+          "    first_seen REAL NOT NULL,\n"
+          "    last_seen REAL NOT NULL,\n"
+          "    updated_at REAL NOT NULL\n"
+          ");\n"
+    )
+
+
+def _child_table(table: str, columns) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table} (\n"
+        "    person_url TEXT NOT NULL,\n"
+        "    position INTEGER NOT NULL,\n"
+        + "".join(f"    {column},\n" for column in columns)
+        + "    PRIMARY KEY (person_url, position)\n"
+          ");\n"
+    )
+
+
+_SCHEMA = (
+    _entity_table(JOBS, _JOB_COLUMNS)
+    + "CREATE INDEX IF NOT EXISTS jobs_job_id ON jobs (job_id);\n"
+    + "CREATE INDEX IF NOT EXISTS jobs_company ON jobs (company);\n"
+    + "CREATE INDEX IF NOT EXISTS jobs_posted_at ON jobs (posted_at);\n"
+    + _entity_table(COMPANIES, _COMPANY_COLUMNS)
+    + "CREATE INDEX IF NOT EXISTS companies_name ON companies (name);\n"
+    + _entity_table(PEOPLE, _PERSON_COLUMNS)
+    + "CREATE INDEX IF NOT EXISTS people_company ON people (company);\n"
+    + _child_table("experiences", _EXPERIENCE_COLUMNS)
+    + "CREATE INDEX IF NOT EXISTS experiences_linkedin_url ON experiences (linkedin_url);\n"
+    + _child_table("educations", _EDUCATION_COLUMNS)
+    + "CREATE INDEX IF NOT EXISTS educations_linkedin_url ON educations (linkedin_url);\n"
+)
+
+# Well under SQLite's default limit of 999 bound parameters
+_IN_CHUNK = 500
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __iadd__(self, other: "UpsertResult"):
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        return self
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str, sort_keys=True)
+    if isinstance(value, (str, int, float, bytes)) or value is None:
+        return value
+    return str(value)
+
+
+def content_hash(record: dict, ignored=()) -> str:
+    """Stable hash of a record's content, so an unchanged re-scrape can be recognised"""
+    if ignored:
+        record = {key: value for key, value in record.items() if key not in ignored}
+    return hashlib.sha1(json.dumps(record, default=str, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# Parsed columns of a job: (column, the scraped field it comes from, its parser)
+_PARSED_JOB_COLUMNS = (
+    ("posted_at", "posted_date", parse_posted_date),
+    ("applicant_total", "applicant_count", parse_applicant_count),
+    ("workplace", "workplace_type", parse_workplace_type),
+    ("experience_level", "experience", parse_experience_level),
+)
+
+
+def _job_record(job) -> dict:
+    if isinstance(job, dict):
+        record = dict(job)
+    else:
+        record = job.to_dict()
+        for name, _, _ in _PARSED_JOB_COLUMNS:
+            record[name] = getattr(job, name, None)
+    # Plain to_dict() records (e.g. the command line's) and unnormalized jobs lack them
+    for name, source, parse in _PARSED_JOB_COLUMNS:
+        if record.get(name) is None and record.get(source) is not None:
+            record[name] = parse(record[source])
+    if record.get("job_id") is None and record.get("linkedin_url"):
+        record["job_id"] = parse_job_id(record["linkedin_url"])
+    return record
+
+
+def _as_record(item) -> dict:
+    return dict(item) if isinstance(item, dict) else item.to_dict()
+
+
+class EntityStore(object):
+    """
+    SQLite store of scraped jobs, companies and people (with their experiences and educations).
+
+    Every row is keyed on its linkedin_url and carries a hash of its content. Upserts compare
+    hashes first, so re-scraping unchanged records costs a lookup, and at most a last_seen
+    update, instead of rewriting the row and its children. A job's relative posted date
+    isn't part of the hash, so an unchanged job keeps the posted_at of its first scrape. Writes are batched into one
+    transaction per batch_size records.
+    """
+
+    def __init__(self, path: str = ":memory:", batch_size: int = 500, touch_unchanged: bool = True):
+        self.batch_size = batch_size
+        self.touch_unchanged = touch_unchanged
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _existing_hashes(self, table: str, urls: List[str]) -> Dict[str, str]:
+        hashes = {}
+        for i in range(0, len(urls), _IN_CHUNK):
+            chunk = urls[i:i + _IN_CHUNK]
+            hashes.update(self.conn.execute(
+                f"SELECT linkedin_url, content_hash FROM {table} "
+                f"WHERE linkedin_url IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ))
+        return hashes
+
+    @staticmethod
+    def _upsert_sql(table: str, columns) -> str:
+        names = ("linkedin_url",) + tuple(columns) + _TRACKING_COLUMNS
+        updates = [f"{name} = excluded.{name}" for name in tuple(columns) + ("content_hash", "last_seen", "updated_at")]
+        return (
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT (linkedin_url) DO UPDATE SET {', '.join(updates)}"
+        )
+
+    def _upsert_batch(self, table: str, records: List[dict], write_children=None) -> UpsertResult:
+        # The last record wins when a batch holds the same url twice
+        by_url = {record["linkedin_url"]: record for record in records if record.get("linkedin_url")}
+        result = UpsertResult()
+        now = time.time()
+        with self._lock, self.conn:
+            existing = self._existing_hashes(table, list(by_url))
+            rows, changed, unchanged = [], [], []
+            for url, record in by_url.items():
+                digest = content_hash(record, _UNHASHED.get(table, ()))
+                previous = existing.get(url)
+                if previous == digest:
+                    unchanged.append((now, url))
+                    continue
+                if previous is None:
+                    result.inserted += 1
+                else:
+                    result.updated += 1
+                changed.append(record)
+                rows.append(
+                    (url,) + tuple(_plain(record.get(column)) for column in _COLUMNS[table])
+                    + (digest, now, now, now)
+                )
+            result.unchanged = len(unchanged)
+            if rows:
+                self.conn.executemany(self._upsert_sql(table, _COLUMNS[table]), rows)
+                if write_children is not None:
+                    write_children(changed)
+            if unchanged and self.touch_unchanged:
+                self.conn.executemany(f"UPDATE {table} SET last_seen = ? WHERE linkedin_url = ?", unchanged)
+        return result
+
+    def _upsert(self, table: str, items: Iterable, to_record, write_children=None) -> UpsertResult:
+        start = time.perf_counter()
+        total = UpsertResult()
+        batch = []
+        for item in items:
+            batch.append(to_record(item))
+            if len(batch) >= self.batch_size:
+                total += self._upsert_batch(table, batch, write_children)
+                batch = []
+        if batch:
+            total += self._upsert_batch(table, batch, write_children)
+        logger.info("Upserted %s: %d inserted, %d updated, %d unchanged", table,
+                    total.inserted, total.updated, total.unchanged,
+                    extra={"count": total.written, "elapsed_ms": elapsed_ms(start)})
+        return total
+
+    def _write_person_children(self, people: List[dict]):
+        urls = [(person["linkedin_url"],) for person in people]
+        for table, key, columns in (("experiences", "experiences", _EXPERIENCE_COLUMNS),
+                                    ("educations", "educations", _EDUCATION_COLUMNS)):
+            self.conn.executemany(f"DELETE FROM {table} WHERE person_url = ?", urls)
+            rows = [
+                (person["linkedin_url"], position) + tuple(_plain(entry.get(column)) for column in columns)
+                for person in people
+                for position, entry in enumerate(person.get(key) or [])
+            ]
+            if rows:
+                names = ("person_url", "position") + columns
+                self.conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})", rows
+                )
+
+    def upsert_jobs(self, jobs: Iterable) -> UpsertResult:
+        """Insert or update Job objects (or their to_dict() records)"""
+        return self._upsert(JOBS, jobs, _job_record)
+
+    def upsert_companies(self, companies: Iterable) -> UpsertResult:
+        """Insert or update Company objects (or their to_dict() records)"""
+        return self._upsert(COMPANIES, companies, _as_record)
+
+    def upsert_people(self, people: Iterable) -> UpsertResult:
+        """Insert or update Person objects (or their to_dict() records), replacing changed experiences and educations"""
+        return self._upsert(PEOPLE, people, _as_record, self._write_person_children)
+
+    def _get(self, table: str, url: str) -> Optional[dict]:
+        with self._lock:
+            cursor = self.conn.execute(f"SELECT * FROM {table} WHERE linkedin_url = ?", (url,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([column[0] for column in cursor.description], row))
+
+    def _children(self, table: str, url: str) -> List[dict]:
+        with self._lock:
+            cursor = self.conn.execute(f"SELECT * FROM {table} WHERE person_url = ? ORDER BY position", (url,))
+            rows = cursor.fetchall()
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in rows]
+
+    def get_job(self, url: str) -> Optional[dict]:
+        return self._get(JOBS, url)
+
+    def get_company(self, url: str) -> Optional[dict]:
+        return self._get(COMPANIES, url)
+
+    def get_person(self, url: str) -> Optional[dict]:
+        person = self._get(PEOPLE, url)
+        if person is not None:
+            person["experiences"] = self._children("experiences", url)
+            person["educations"] = self._children("educations", url)
+        return person
+
+    def count(self, table: str) -> int:
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
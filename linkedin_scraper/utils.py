@@ -1,7 +1,7 @@
-import pandas as pd
-
-
 def list_of_job_to_pandas(job_list):
+    # pandas is only needed for DataFrame exports, so it is imported on demand
+    import pandas as pd
+
     dico_df = {
         "linkedin_url": [],
         "job_title": [],
@@ -0,0 +1,238 @@
+"""
+Recovery from browser crashes and lost logins in long runs.
+
+A Watchdog supervises one driver. Work goes through watchdog.call(), and when it fails
+the watchdog checks whether the session itself is dead: the browser crashed or
+disconnected, LinkedIn shows its auth wall, or the session was logged out. If so it
+starts a new browser (or logs the old one in again), and runs the work again, instead of
+every later page failing, or every field timing out, on the dead session:
+
+    watchdog = Watchdog(chrome_driver, login=lambda driver: actions.login(driver, email, password))
+    jobs = watchdog.call(lambda driver: JobSearch(driver, scrape=False).search_multiple_pages("python", 103644278))
+    watchdog.close()
+
+Scrapers find the watchdog supervising their driver with Watchdog.for_driver(), so
+JobSearch.search_multiple_pages and Company.get_employees recover page by page, keeping
+the pages they already have. Failures on a healthy session (a missing element, a 429)
+are raised as they are, and so are checkpoints, which a new login won't get past.
+
+Logouts that don't fail anything (a profile scraped from the logged out view comes back
+empty) are caught by a sign-in check after the work, at most every health_check_seconds.
+"""
+import logging
+import threading
+import time
+import weakref
+from typing import Callable, Optional
+
+from .rate_limit import AUTH_WALL, RateLimiter, ThrottleDetected, detect_throttle
+
+logger = logging.getLogger(__name__)
+
+# Why a session can't go on
+CRASHED = "crashed"  # The browser or its driver is gone
+LOGGED_OUT = "logged_out"  # Pages load, without the signed in navigation bar
+
+
+class SessionLost(Exception):
+    def __init__(self, reason: str, restarts: int):
+        super().__init__(f"Browser session lost ({reason}), still dead after {restarts} recoveries")
+        self.reason = reason
+        self.restarts = restarts
+
+
+def is_driver_alive(driver) -> bool:
+    """Whether the browser behind driver still answers"""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def is_signed_in(driver) -> bool:
+    from .objects import Scraper
+    return bool(Scraper(driver=driver).is_signed_in())
+
+
+def diagnose(driver, error: Exception = None, is_signed_in: Callable = is_signed_in) -> Optional[str]:
+    """
+    Why the session of driver can't go on, after error if work failed.
+
+    Returns:
+        Optional[str]: CRASHED, AUTH_WALL or LOGGED_OUT, or None for a healthy session
+            and for sessions a new login won't help (throttled or at a checkpoint)
+    """
+    if isinstance(error, ThrottleDetected) and error.signal != AUTH_WALL:
+        return None
+    if not is_driver_alive(driver):
+        return CRASHED
+    signal = detect_throttle(driver)
+    if signal == AUTH_WALL or isinstance(error, ThrottleDetected):
+        return AUTH_WALL
+    if signal is not None:
+        return None
+    return None if is_signed_in(driver) else LOGGED_OUT
+
+
+class Watchdog(object):
+    """
+    Supervises one driver, restarting it and logging in again when its session dies.
+    Like the driver itself, a watchdog belongs to one worker thread at a time.
+
+    Args:
+        driver_factory (Callable): Starts a new, logged out driver
+        login (Callable, optional): Logs a driver in, login(driver)
+        driver (optional): An already logged in driver to start with, instead of a new one
+        max_restarts (int): Recoveries in a row for one call before giving up with SessionLost
+        restart_backoff_seconds (float): Wait before the first recovery, doubling on every next one
+        health_check_seconds (float, optional): Check the sign-in after successful work at
+            most this often, None to check after failures only
+        is_signed_in (Callable): Tells whether a driver is still logged in
+    """
+
+    # Weak, like RateLimiter's registry, so a watchdog dropped without close() doesn't linger
+    _watchdogs: "weakref.WeakValueDictionary[object, Watchdog]" = weakref.WeakValueDictionary()
+    _registry_lock = threading.Lock()
+
+    def __init__(self, driver_factory: Callable, login: Callable = None, driver=None, max_restarts: int = 3,
+                 restart_backoff_seconds: float = 5.0, health_check_seconds: Optional[float] = 60.0,
+                 is_signed_in: Callable = is_signed_in):
+        self.driver_factory = driver_factory
+        self.login = login
+        self.max_restarts = max_restarts
+        self.restart_backoff_seconds = restart_backoff_seconds
+        self.health_check_seconds = health_check_seconds
+        self.is_signed_in = is_signed_in
+        self.restarts = 0  # Browsers started to replace a dead one
+        self.logins = 0  # Logins to restore a lost session, in the same or a new browser
+        self._driver = None
+        self._last_check = time.monotonic()
+        if driver is not None:
+            self._adopt(driver)
+
+    @staticmethod
+    def _key(driver):
+        return getattr(driver, "session_id", None) or id(driver)
+
+    @classmethod
+    def for_driver(cls, driver) -> Optional["Watchdog"]:
+        """The watchdog supervising driver, if any"""
+        with cls._registry_lock:
+            return cls._watchdogs.get(cls._key(driver))
+
+    def _adopt(self, driver):
+        with self._registry_lock:
+            if self._driver is not None:
+                self._watchdogs.pop(self._key(self._driver), None)
+            self._watchdogs[self._key(driver)] = self
+        self._driver = driver
+
+    @property
+    def driver(self):
+        """The supervised driver, started and logged in on first use"""
+        if self._driver is None:
+            driver = self.driver_factory()
+            self._adopt(driver)
+            if self.login is not None:
+                self.login(driver)
+        return self._driver
+
+    def diagnose(self, error: Exception = None) -> Optional[str]:
+        """Why the supervised session can't go on, see diagnose()"""
+        self._last_check = time.monotonic()
+        return diagnose(self._driver, error, self.is_signed_in)
+
+    def _checkup(self) -> Optional[str]:
+        if self.health_check_seconds is None or time.monotonic() - self._last_check < self.health_check_seconds:
+            return None
+        return self.diagnose()
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        Call func(driver, *args, **kwargs) with the supervised driver. When func fails on
+        a dead session, or the session turns out dead after it, recover the session and
+        call func again.
+
+        Raises:
+            SessionLost: When the session is still dead after max_restarts recoveries in a row
+        """
+        recoveries = 0
+        while True:
+            error = None
+            try:
+                result = func(self.driver, *args, **kwargs)
+                reason = self._checkup()
+                if reason is None:
+                    return result
+                logger.warning("Session found %s after the work, doing it again", reason, extra={"signal": reason})
+            except Exception as e:
+                reason = self.diagnose(e)
+                if reason is None:
+                    raise
+                error = e
+            while reason is not None:
+                if recoveries >= self.max_restarts:
+                    raise SessionLost(reason, recoveries) from error
+                recoveries += 1
+                reason = self.recover(reason, recoveries)
+
+    def recover(self, reason: str, attempt: int = 1) -> Optional[str]:
+        """
+        Bring a dead session back: start a new browser if the old one is gone, and log in.
+
+        Returns:
+            Optional[str]: Why the session still can't go on, None once it is healthy again
+        """
+        delay = self.restart_backoff_seconds * 2 ** (attempt - 1)
+        logger.warning("Session %s, recovering in %.0fs (attempt %d of %d)", reason, delay, attempt,
+                       self.max_restarts, extra={"signal": reason})
+        time.sleep(delay)
+        try:
+            if reason == CRASHED or not is_driver_alive(self._driver):
+                self._restart()
+            if self.login is not None:
+                self.logins += 1
+                self.login(self._driver)
+        except ThrottleDetected as e:
+            if e.signal != AUTH_WALL:
+                raise
+            logger.warning("Login hit the auth wall", extra={"signal": e.signal})
+        except Exception as e:
+            logger.warning("Recovery failed: %s", e, extra={"signal": reason})
+        reason = self.diagnose()
+        if reason is None:
+            logger.info("Session recovered after %d attempt(s)", attempt, extra={"count": attempt})
+        return reason
+
+    def _restart(self):
+        old = self._driver
+        if old is not None:
+            try:
+                old.quit()
+            except Exception:
+                logger.debug("Failed to quit the dead driver", exc_info=True)
+        driver = self.driver_factory()
+        self.restarts += 1
+        if old is not None:
+            # Pacing and page counts carry over to the new browser
+            RateLimiter.transfer(old, driver)
+        self._adopt(driver)
+
+    def close(self):
+        """Quit the supervised driver"""
+        driver, self._driver = self._driver, None
+        if driver is None:
+            return
+        with self._registry_lock:
+            self._watchdogs.pop(self._key(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            logger.debug("Failed to quit driver", exc_info=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
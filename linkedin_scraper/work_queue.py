@@ -0,0 +1,515 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Task kinds understood by the default Worker handlers
+SEARCH_SHARD = "search_shard"
+JOB = "job"
+PERSON = "person"
+COMPANY = "company"
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+
+@dataclass
+class Task:
+    kind: str
+    payload: dict = field(default_factory=dict)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = PENDING
+    attempts: int = 0
+    max_attempts: int = 3
+    available_at: float = 0.0
+    lease_expires_at: float = None
+    worker_id: str = None
+    last_error: str = None
+
+    def to_json(self) -> str:
+        return json.dumps(self.__dict__)
+
+    @classmethod
+    def from_json(cls, data) -> "Task":
+        return cls(**json.loads(data))
+
+
+class Broker(object):
+    """
+    Interface of a task broker.
+
+    Tasks are leased rather than popped: a leased task becomes available again once
+    its visibility timeout expires without an ack, so work held by a crashed worker
+    is picked up by another one. Every lease counts as an attempt; a task failing
+    max_attempts times ends up dead.
+
+    extend, ack and nack only apply while the caller still holds the lease (the same
+    worker and attempt, still leased) and return whether it did. A worker whose lease
+    expired and was taken over by another one can't touch the task any more.
+    """
+
+    def put(self, kind: str, payload: dict, max_attempts: int = 3) -> str:
+        raise NotImplementedError
+
+    def lease(self, worker_id: str, visibility_timeout: float = 600) -> Optional[Task]:
+        raise NotImplementedError
+
+    def extend(self, task: Task, visibility_timeout: float = 600) -> bool:
+        raise NotImplementedError
+
+    def ack(self, task: Task) -> bool:
+        raise NotImplementedError
+
+    def nack(self, task: Task, error: str = None, retry_delay: float = 0) -> bool:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def put_many(self, kind: str, payloads: List[dict], max_attempts: int = 3) -> List[str]:
+        return [self.put(kind, payload, max_attempts) for payload in payloads]
+
+
+class MemoryBroker(Broker):
+    """In-process broker, a local stand-in for tests and single-process runs"""
+
+    def __init__(self):
+        self._tasks: Dict[str, Task] = {}
+        self._lock = threading.Lock()
+
+    def put(self, kind, payload, max_attempts=3):
+        task = Task(kind=kind, payload=payload, max_attempts=max_attempts, available_at=time.time())
+        with self._lock:
+            self._tasks[task.id] = task
+        return task.id
+
+    def lease(self, worker_id, visibility_timeout=600):
+        now = time.time()
+        with self._lock:
+            for task in self._tasks.values():
+                ready = task.status == PENDING and task.available_at <= now
+                expired = task.status == LEASED and task.lease_expires_at < now
+                if not (ready or expired):
+                    continue
+                if expired and task.attempts >= task.max_attempts:
+                    task.status = DEAD
+                    task.last_error = task.last_error or "lease expired"
+                    continue
+                task.status = LEASED
+                task.attempts += 1
+                task.worker_id = worker_id
+                task.lease_expires_at = now + visibility_timeout
+                return Task(**task.__dict__)
+        return None
+
+    def _held(self, task) -> Optional[Task]:
+        stored = self._tasks.get(task.id)
+        if stored is None or stored.status != LEASED:
+            return None
+        if stored.worker_id != task.worker_id or stored.attempts != task.attempts:
+            return None
+        return stored
+
+    def extend(self, task, visibility_timeout=600):
+        with self._lock:
+            stored = self._held(task)
+            if stored is None:
+                return False
+            stored.lease_expires_at = time.time() + visibility_timeout
+            return True
+
+    def ack(self, task):
+        with self._lock:
+            stored = self._held(task)
+            if stored is None:
+                return False
+            stored.status = DONE
+            return True
+
+    def nack(self, task, error=None, retry_delay=0):
+        with self._lock:
+            stored = self._held(task)
+            if stored is None:
+                return False
+            stored.last_error = error
+            stored.status = DEAD if stored.attempts >= stored.max_attempts else PENDING
+            stored.available_at = time.time() + retry_delay
+            return True
+
+    def stats(self):
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        with self._lock:
+            for task in self._tasks.values():
+                counts[task.status] += 1
+        return counts
+
+
+class SQLiteBroker(Broker):
+    """Broker for several worker processes on a single host"""
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL,
+        available_at REAL NOT NULL,
+        lease_expires_at REAL,
+        worker_id TEXT,
+        last_error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS tasks_status_available ON tasks (status, available_at);
+    CREATE INDEX IF NOT EXISTS tasks_status_lease ON tasks (status, lease_expires_at);
+    """
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self._SCHEMA)
+        self._lock = threading.Lock()
+
+    def put(self, kind, payload, max_attempts=3):
+        return self.put_many(kind, [payload], max_attempts)[0]
+
+    def put_many(self, kind, payloads, max_attempts=3):
+        now = time.time()
+        tasks = [Task(kind=kind, payload=payload, max_attempts=max_attempts) for payload in payloads]
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(
+                "INSERT INTO tasks (id, kind, payload, status, max_attempts, available_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(task.id, kind, json.dumps(task.payload), PENDING, max_attempts, now) for task in tasks],
+            )
+            self.conn.execute("COMMIT")
+        return [task.id for task in tasks]
+
+    def lease(self, worker_id, visibility_timeout=600):
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "UPDATE tasks SET status = ?, last_error = COALESCE(last_error, 'lease expired') "
+                    "WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts",
+                    (DEAD, LEASED, now),
+                )
+                row = self.conn.execute(
+                    "SELECT id, kind, payload, attempts, max_attempts, last_error FROM tasks "
+                    "WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires_at < ?) "
+                    "ORDER BY available_at LIMIT 1",
+                    (PENDING, now, LEASED, now),
+                ).fetchone()
+                if row is None:
+                    self.conn.execute("COMMIT")
+                    return None
+                task_id, kind, payload, attempts, max_attempts, last_error = row
+                self.conn.execute(
+                    "UPDATE tasks SET status = ?, attempts = ?, worker_id = ?, lease_expires_at = ? WHERE id = ?",
+                    (LEASED, attempts + 1, worker_id, now + visibility_timeout, task_id),
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return Task(
+            kind=kind, payload=json.loads(payload), id=task_id, status=LEASED,
+            attempts=attempts + 1, max_attempts=max_attempts, worker_id=worker_id,
+            lease_expires_at=now + visibility_timeout, last_error=last_error,
+        )
+
+    # Matches the row only while task's lease is still held
+    _HELD = "id = ? AND worker_id = ? AND attempts = ? AND status = ?"
+
+    def _update_held(self, task, assignments: str, values: tuple) -> bool:
+        with self._lock:
+            cursor = self.conn.execute(
+                f"UPDATE tasks SET {assignments} WHERE {self._HELD}",
+                values + (task.id, task.worker_id, task.attempts, LEASED),
+            )
+        return cursor.rowcount == 1
+
+    def extend(self, task, visibility_timeout=600):
+        return self._update_held(task, "lease_expires_at = ?", (time.time() + visibility_timeout,))
+
+    def ack(self, task):
+        return self._update_held(task, "status = ?", (DONE,))
+
+    def nack(self, task, error=None, retry_delay=0):
+        status = DEAD if task.attempts >= task.max_attempts else PENDING
+        return self._update_held(
+            task, "status = ?, last_error = ?, available_at = ?", (status, error, time.time() + retry_delay)
+        )
+
+    def stats(self):
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        with self._lock:
+            for status, count in self.conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+                counts[status] = count
+        return counts
+
+
+class RedisBroker(Broker):
+    """
+    Broker for a cluster of scraper hosts, on anything speaking the Redis protocol.
+
+    Takes an already connected client (e.g. redis.Redis), so redis is only needed
+    when this broker is actually used.
+    """
+
+    # Move expired leases back to the queue (or to dead), then lease the next task
+    _LEASE_SCRIPT = """
+    local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+    for _, id in ipairs(expired) do
+        redis.call('ZREM', KEYS[2], id)
+        local task = cjson.decode(redis.call('HGET', KEYS[3], id))
+        if task['attempts'] >= task['max_attempts'] then
+            task['status'] = 'dead'
+        else
+            task['status'] = 'pending'
+            redis.call('LPUSH', KEYS[1], id)
+        end
+        redis.call('HSET', KEYS[3], id, cjson.encode(task))
+    end
+    local id = redis.call('RPOP', KEYS[1])
+    if not id then
+        return nil
+    end
+    local task = cjson.decode(redis.call('HGET', KEYS[3], id))
+    task['status'] = 'leased'
+    task['attempts'] = task['attempts'] + 1
+    task['worker_id'] = ARGV[2]
+    task['lease_expires_at'] = tonumber(ARGV[1]) + tonumber(ARGV[3])
+    local encoded = cjson.encode(task)
+    redis.call('HSET', KEYS[3], id, encoded)
+    redis.call('ZADD', KEYS[2], task['lease_expires_at'], id)
+    return encoded
+    """
+
+    # Store a task's new state if the caller still holds its lease, then keep it leased
+    # ("extend"), or move it to the pending list or the delayed set, or neither
+    _RELEASE_SCRIPT = """
+    local data = redis.call('HGET', KEYS[3], ARGV[1])
+    if not data then
+        return 0
+    end
+    local stored = cjson.decode(data)
+    if stored['status'] ~= 'leased' or stored['worker_id'] ~= ARGV[2] or stored['attempts'] ~= tonumber(ARGV[3]) then
+        return 0
+    end
+    redis.call('HSET', KEYS[3], ARGV[1], ARGV[4])
+    if ARGV[5] == 'extend' then
+        redis.call('ZADD', KEYS[2], ARGV[6], ARGV[1])
+        return 1
+    end
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    if ARGV[5] == 'pending' then
+        redis.call('LPUSH', KEYS[1], ARGV[1])
+    elseif ARGV[5] == 'delayed' then
+        redis.call('ZADD', KEYS[4], ARGV[6], ARGV[1])
+    end
+    return 1
+    """
+
+    def __init__(self, client, namespace: str = "linkedin_scraper"):
+        self.client = client
+        self.pending_key = f"{namespace}:pending"
+        self.leased_key = f"{namespace}:leased"
+        self.delayed_key = f"{namespace}:delayed"
+        self.tasks_key = f"{namespace}:tasks"
+        self._lease = client.register_script(self._LEASE_SCRIPT)
+        self._release = client.register_script(self._RELEASE_SCRIPT)
+
+    def put(self, kind, payload, max_attempts=3):
+        task = Task(kind=kind, payload=payload, max_attempts=max_attempts, available_at=time.time())
+        pipe = self.client.pipeline()
+        pipe.hset(self.tasks_key, task.id, task.to_json())
+        pipe.lpush(self.pending_key, task.id)
+        pipe.execute()
+        return task.id
+
+    def _release_delayed(self, now):
+        for task_id in self.client.zrangebyscore(self.delayed_key, "-inf", now):
+            if self.client.zrem(self.delayed_key, task_id):
+                self.client.lpush(self.pending_key, task_id)
+
+    def lease(self, worker_id, visibility_timeout=600):
+        now = time.time()
+        self._release_delayed(now)
+        data = self._lease(
+            keys=[self.pending_key, self.leased_key, self.tasks_key],
+            args=[now, worker_id, visibility_timeout],
+        )
+        return Task.from_json(data) if data else None
+
+    def _store_held(self, task, new_state: Task, move: str, score: float = 0) -> bool:
+        return bool(self._release(
+            keys=[self.pending_key, self.leased_key, self.tasks_key, self.delayed_key],
+            args=[task.id, task.worker_id, task.attempts, new_state.to_json(), move, score],
+        ))
+
+    def extend(self, task, visibility_timeout=600):
+        expires_at = time.time() + visibility_timeout
+        if not self._store_held(task, replace(task, lease_expires_at=expires_at), "extend", expires_at):
+            return False
+        task.lease_expires_at = expires_at
+        return True
+
+    def ack(self, task):
+        return self._store_held(task, replace(task, status=DONE), "none")
+
+    def nack(self, task, error=None, retry_delay=0):
+        if task.attempts >= task.max_attempts:
+            return self._store_held(task, replace(task, status=DEAD, last_error=error), "none")
+        available_at = time.time() + retry_delay
+        released = replace(task, status=PENDING, last_error=error, available_at=available_at)
+        if retry_delay > 0:
+            return self._store_held(task, released, "delayed", available_at)
+        return self._store_held(task, released, "pending")
+
+    def stats(self):
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        for data in self.client.hvals(self.tasks_key):
+            counts[json.loads(data)["status"]] += 1
+        return counts
+
+
+def _search_shard(driver, payload):
+    from .job_search import JobSearch
+    return JobSearch(driver, scrape=False).search_multiple_pages(**payload)
+
+
+def _job(driver, payload):
+    from .jobs import Job
+    return Job(payload["linkedin_url"], driver=driver, close_on_complete=False)
+
+
+def _person(driver, payload):
+    from .person import Person
+    return Person(
+        payload["linkedin_url"],
+        driver=driver,
+        parallel_details=payload.get("parallel_details", False),
+        close_on_complete=False,
+    )
+
+
+def _company(driver, payload):
+    from .company import Company
+    return Company(
+        payload["linkedin_url"],
+        driver=driver,
+        get_employees=payload.get("get_employees", False),
+        close_on_complete=False,
+    )
+
+
+DEFAULT_HANDLERS = {
+    SEARCH_SHARD: _search_shard,
+    JOB: _job,
+    PERSON: _person,
+    COMPANY: _company,
+}
+
+
+class Worker(object):
+    """
+    Consumes tasks from a broker with one driver.
+
+    Each handler is called as handler(driver, payload); its return value is passed to
+    on_result(task, result). A raising handler nacks the task so it is retried with
+    exponential backoff until it runs out of attempts. While a handler runs, a
+    heartbeat thread extends the task's lease every third of visibility_timeout, so
+    long tasks (a 40 page search shard) aren't leased to a second worker mid-run.
+    """
+
+    def __init__(
+        self,
+        broker: Broker,
+        driver,
+        handlers: Dict[str, Callable] = None,
+        on_result: Callable = None,
+        worker_id: str = None,
+        visibility_timeout: float = 600,
+        poll_interval: float = 5,
+        retry_delay: float = 30,
+    ):
+        self.broker = broker
+        self.driver = driver
+        self.handlers = dict(DEFAULT_HANDLERS, **(handlers or {}))
+        self.on_result = on_result
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.processed = 0
+        self.failed = 0
+
+    def _heartbeat(self, task: Task, stop: threading.Event):
+        while not stop.wait(self.visibility_timeout / 3):
+            try:
+                if not self.broker.extend(task, self.visibility_timeout):
+                    logger.warning("Lost the lease of task %s (%s)", task.id, task.kind, extra={"task_id": task.id})
+                    return
+            except Exception:
+                logger.warning("Failed to extend the lease of task %s", task.id, exc_info=True,
+                               extra={"task_id": task.id})
+
+    def run_once(self) -> bool:
+        """Process a single task, returning False if none was available"""
+        task = self.broker.lease(self.worker_id, self.visibility_timeout)
+        if task is None:
+            return False
+        handler = self.handlers.get(task.kind)
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(task, stop), daemon=True)
+        heartbeat.start()
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for task kind '{task.kind}'")
+            result = handler(self.driver, task.payload)
+            if self.on_result is not None:
+                self.on_result(task, result)
+        except Exception as e:
+            stop.set()
+            heartbeat.join()
+            self.failed += 1
+            logger.warning("Task %s (%s) failed on attempt %d: %s", task.id, task.kind, task.attempts, e,
+                           extra={"task_id": task.id})
+            if not self.broker.nack(task, f"{type(e).__name__}: {e}", self.retry_delay * 2 ** (task.attempts - 1)):
+                logger.warning("Task %s was leased to another worker meanwhile", task.id, extra={"task_id": task.id})
+            return True
+        finally:
+            stop.set()
+            heartbeat.join()
+        if not self.broker.ack(task):
+            logger.warning("Task %s was leased to another worker meanwhile, it may be processed twice", task.id,
+                           extra={"task_id": task.id})
+        self.processed += 1
+        return True
+
+    def run(self, max_tasks: int = None, stop_when_empty: bool = False):
+        """
+        Process tasks until max_tasks have been handled or, with stop_when_empty,
+        until the broker has nothing left to lease.
+        """
+        handled = 0
+        while max_tasks is None or handled < max_tasks:
+            if self.run_once():
+                handled += 1
+                continue
+            if stop_when_empty:
+                break
+            time.sleep(self.poll_interval)
+        return handled
@@ -0,0 +1,37 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = int(os.environ.get("RUNS", "10"))
+
+CASES = [
+    ("python startup only", "pass"),
+    ("import linkedin_scraper", "import linkedin_scraper"),
+    ("import linkedin_scraper.normalize", "import linkedin_scraper.normalize"),
+    ("linkedin_scraper.JobSearch (loads selenium)", "import linkedin_scraper; linkedin_scraper.JobSearch"),
+    ("every eager import of the old __init__",
+     "from linkedin_scraper import Person, Institution, Experience, Education, Contact, Company, Job, JobSearch; "
+     "import linkedin_scraper.utils, requests, lxml.html"),
+]
+
+
+def measure(code):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    print(f"Median wall time of a fresh interpreter over {RUNS} runs")
+    for label, code in CASES:
+        print(f"{label:<48} {measure(code):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import random
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import from linkedin_scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.jobs import Job
+from linkedin_scraper.job_frame import JobFrame
+from linkedin_scraper.normalize import normalize_jobs
+from linkedin_scraper.enums import WorkplaceType, ExperienceLevel
+from linkedin_scraper import constants as c
+
+N_JOBS = int(os.environ.get("N_JOBS", "100000"))
+
+
+def make_jobs(n):
+    rnd = random.Random(0)
+    companies = [f"Company {i}" for i in range(2000)]
+    locations = [f"City {i}, Poland" for i in range(300)]
+    return [
+        Job(
+            linkedin_url=f"https://www.linkedin.com/jobs/view/{rnd.randrange(n)}",
+            job_title=f"Engineer {i % 50}",
+            company=rnd.choice(companies),
+            location=rnd.choice(locations),
+            posted_date=f"{rnd.randint(1, 30)} days ago",
+            applicant_count=f"{rnd.randint(1, 200)} applicants",
+            workplace_type=rnd.choice(c.WORKPLACE_TYPES),
+            experience=rnd.choice(c.EXPERIENCE_LEVELS),
+            scrape=False,
+        )
+        for i in range(n)
+    ]
+
+
+def with_objects(jobs, now):
+    normalize_jobs(jobs, now)
+    seen = set()
+    unique = []
+    for job in jobs:
+        if job.linkedin_url not in seen:
+            seen.add(job.linkedin_url)
+            unique.append(job)
+    cutoff = now - timedelta(days=7)
+    selected = [
+        job for job in unique
+        if job.workplace == WorkplaceType.REMOTE
+        and job.experience_level == ExperienceLevel.MID_SENIOR
+        and job.posted_at >= cutoff
+    ]
+    per_company = {}
+    for job in selected:
+        per_company[job.company] = per_company.get(job.company, 0) + 1
+    ages = [now - job.posted_at for job in unique]
+    return len(selected), len(per_company), len(ages)
+
+
+def with_frame(frame, now):
+    unique = frame.dedup()
+    selected = unique.filter(
+        workplace_types=[WorkplaceType.REMOTE],
+        experience_levels=[ExperienceLevel.MID_SENIOR],
+        posted_after=now - timedelta(days=7),
+    )
+    per_company = selected.group_by_company()
+    ages = unique.posting_age(now)
+    return len(selected), len(per_company), len(ages)
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<40} {time.perf_counter() - start:8.3f}s  {result}")
+    return result
+
+
+def main():
+    jobs = make_jobs(N_JOBS)
+    now = datetime.now()
+    print(f"Benchmarking {N_JOBS} jobs")
+    frame = timed("JobFrame.from_jobs", JobFrame.from_jobs, jobs, now)
+    timed("list of Job: normalize/dedup/filter/group", with_objects, jobs, now)
+    timed("JobFrame: dedup/filter/group", with_frame, frame, now)
+
+
+if __name__ == "__main__":
+    main()
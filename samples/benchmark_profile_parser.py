@@ -0,0 +1,86 @@
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path to import from linkedin_scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.profile_parser import parse_experiences, parse_educations
+
+N_SECTIONS = int(os.environ.get("N_SECTIONS", "20000"))
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def line(text):
+    return f'<span aria-hidden="true">{text}</span><span class="visually-hidden">{text}</span>'
+
+
+def entity(url, lines, summary=""):
+    spans = "".join(f"<div>{line(text)}</div>" for text in lines)
+    return (
+        '<li class="pvs-list__paged-list-item"><div data-view-name="profile-component-entity">'
+        f'<div><a href="{url}"><img/></a></div>'
+        f"<div><div><div>{spans}</div></div><div>{summary}</div></div>"
+        "</div></li>"
+    )
+
+
+def dates(rnd):
+    start = rnd.randint(2000, 2020)
+    end = rnd.choice(["Present", f"{rnd.choice(MONTHS)} {start + rnd.randint(0, 4)}"])
+    return f"{rnd.choice(MONTHS)} {start} - {end} · {rnd.randint(1, 9)} yrs {rnd.randint(1, 11)} mos"
+
+
+def experience_section(rnd):
+    entries = []
+    for i in range(rnd.randint(2, 6)):
+        url = f"https://www.linkedin.com/company/{rnd.randrange(10000)}/"
+        if rnd.random() < 0.2:
+            positions = "".join(
+                '<li class="pvs-list__paged-list-item"><a href="#">'
+                f"<div>{line(f'Role {j}')}</div><div>{line(dates(rnd))}</div><div>{line('Warsaw, Poland')}</div>"
+                f"</a><div>{line('Built things')}</div></li>"
+                for j in range(rnd.randint(2, 3))
+            )
+            summary = f'<div class="pvs-list__container"><ul>{positions}</ul></div>'
+            entries.append(entity(url, [f"Company {i}", "Full-time · 6 yrs", "Warsaw, Poland"], summary))
+        else:
+            lines = [f"Engineer {i}", f"Company {i} · Full-time", dates(rnd)]
+            if rnd.random() < 0.7:
+                lines.append("Remote")
+            entries.append(entity(url, lines, line("Worked on data pipelines")))
+    return f'<div class="pvs-list__container"><ul>{"".join(entries)}</ul></div>'
+
+
+def education_section(rnd):
+    entries = [
+        entity(
+            f"https://www.linkedin.com/school/{rnd.randrange(1000)}/",
+            [f"University {i}", "Master's degree, Computer Science", f"{2000 + i} - {2004 + i}"],
+        )
+        for i in range(rnd.randint(1, 3))
+    ]
+    return f'<div class="pvs-list__container"><ul>{"".join(entries)}</ul></div>'
+
+
+def main():
+    rnd = random.Random(0)
+    experiences = [experience_section(rnd) for _ in range(N_SECTIONS)]
+    educations = [education_section(rnd) for _ in range(N_SECTIONS)]
+
+    sample = parse_experiences(experiences[0])
+    print(f"First section parses to {len(sample)} experiences, e.g. {sample[0]}")
+
+    for label, sections, parse in [("experience", experiences, parse_experiences),
+                                   ("education", educations, parse_educations)]:
+        start = time.perf_counter()
+        entries = sum(len(parse(section)) for section in sections)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<10} {len(sections)} sections, {entries} entries in {elapsed:.2f}s "
+              f"({len(sections) / elapsed:,.0f} sections/s, {elapsed / len(sections) * 1e6:.0f} us/section)")
+
+
+if __name__ == "__main__":
+    main()
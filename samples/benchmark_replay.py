@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path to import from linkedin_scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.person import Person
+from linkedin_scraper.replay import Page, Recording, ReplayDriver, instant_waits
+from benchmark_profile_parser import education_section, experience_section
+
+N_PROFILES = int(os.environ.get("N_PROFILES", "200"))
+WORKERS = int(os.environ.get("WORKERS", "4"))
+# Seconds per page load, 0 measures the scraping code alone
+LATENCY = float(os.environ.get("LATENCY", "0"))
+
+NAV = '<nav><a class="global-nav__primary-link" href="/feed/">Home</a></nav>'
+
+
+def make_recording(n, rnd):
+    """Synthetic profiles shaped like the pages Person reads"""
+    recording = Recording()
+    urls = []
+    for i in range(n):
+        url = f"https://www.linkedin.com/in/person-{i}/"
+        urls.append(url)
+        recording.add(Page(url=url, current_url=url, title=f"Person {i} | LinkedIn", html=(
+            f"<html><body>{NAV}<main><div class='mt2 relative'><h1>Person {i}</h1>"
+            "<span class='text-body-small inline t-black--light break-words'>Warsaw, Poland</span></div>"
+            "<section><div id='about'></div><div class='display-flex'><span>About me</span></div></section>"
+            "</main></body></html>"
+        )))
+        for path, section in (("details/experience", experience_section(rnd)),
+                              ("details/education", education_section(rnd))):
+            recording.add(Page(url=url + path, current_url=url + path, title="",
+                               html=f"<html><body>{NAV}<main>{section}</main></body></html>"))
+    return recording, urls
+
+
+def main():
+    recording, urls = make_recording(N_PROFILES, random.Random(0))
+    drivers = []
+
+    def scrape(chunk):
+        driver = ReplayDriver(recording, latency=LATENCY)
+        drivers.append(driver)
+        for url in chunk:
+            Person(url, driver=driver, close_on_complete=False, max_contacts=0)
+
+    chunks = [urls[i::WORKERS] for i in range(WORKERS)]
+    start = time.perf_counter()
+    with instant_waits(), ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        list(executor.map(scrape, chunks))
+    elapsed = time.perf_counter() - start
+    pages = sum(driver.pages_served for driver in drivers)
+    print(f"{N_PROFILES} profiles, {pages} pages with {WORKERS} workers in {elapsed:.2f}s: "
+          f"{N_PROFILES / elapsed:,.0f} profiles/s, {pages / elapsed:,.0f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to import from linkedin_scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.search_index import JobIndex
+
+N_JOBS = int(os.environ.get("N_JOBS", "1000000"))
+REPEATS = int(os.environ.get("REPEATS", "20"))
+
+ROLES = ["Data Engineer", "Software Engineer", "Backend Developer", "Data Scientist", "DevOps Engineer",
+         "Product Manager", "QA Engineer", "Data Analyst", "Site Reliability Engineer", "Solutions Architect"]
+# Rare to common, so queries hit a few dozen up to hundreds of thousands of postings
+TECHNOLOGIES = ["Erlang", "Haskell", "Elixir", "Scala", "Rust", "Go", "Kotlin", "C++", "C#", "Kafka", "Spark",
+                "Airflow", "Terraform", "Kubernetes", "Docker", "AWS", "PostgreSQL", "Java", "Python", "SQL"]
+FILLER = ("we are looking for an engineer to join our team and build reliable systems with modern tools "
+          "you will work with product and design on features used by millions of customers").split()
+
+
+def make_jobs(n, rnd):
+    weights = [1.5 ** i for i in range(len(TECHNOLOGIES))]
+    for i in range(n):
+        stack = set(rnd.choices(TECHNOLOGIES, weights, k=4))
+        words = rnd.choices(FILLER, k=120) + list(stack)
+        rnd.shuffle(words)
+        yield {
+            "linkedin_url": f"https://www.linkedin.com/jobs/view/{4_000_000_000 + i}/",
+            "job_title": f"{rnd.choice(['Senior ', 'Junior ', ''])}{rnd.choice(ROLES)}",
+            "company": f"Company {rnd.randrange(20000)}",
+            "job_description": " ".join(words),
+        }
+
+
+def timed(label, func, repeats=1):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<45} {elapsed * 1000:9.2f} ms  {result}")
+
+
+def main():
+    rnd = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        index = JobIndex(os.path.join(directory, "jobs.idx"))
+        timed(f"index {N_JOBS} postings", lambda: index.add(make_jobs(N_JOBS, rnd)))
+        timed("optimize", index.optimize)
+        size = os.path.getsize(os.path.join(directory, "jobs.idx")) / 2 ** 20
+        print(f"index size {size:.0f} MiB")
+
+        for query in ["erlang", "haskell elixir", "title:scala", "rust kubernetes", "kafka*", "python",
+                      "data engineer", "sql"]:
+            hits = index.count(query)
+            timed(f"top 20 for {query!r} ({hits} hits)", lambda: len(index.search(query)), REPEATS)
+        timed("top 20 with snippets for 'haskell'", lambda: len(index.search("haskell", snippets=True)), REPEATS)
+        index.max_candidates = None
+        timed("top 20 for 'sql', ranking every match", lambda: len(index.search("sql")), 3)
+
+        changed = [dict(job, job_description=job["job_description"] + " Elixir")
+                   for job in make_jobs(1000, random.Random(1))]
+        timed("re-index 1000 changed postings", lambda: index.add(changed))
+        timed("re-index them again, unchanged", lambda: index.add(changed))
+        timed("remove 1000 postings", lambda: index.remove(range(4_000_000_000, 4_000_001_000)))
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path to import from linkedin_scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.skills import DEFAULT_SKILLS, SkillTagger
+
+N_JOBS = int(os.environ.get("N_JOBS", "50000"))
+N_SKILLS = int(os.environ.get("N_SKILLS", "5000"))
+# Jobs tagged by the per-term substring loop, which is too slow to run on the whole corpus
+N_NAIVE = int(os.environ.get("N_NAIVE", "500"))
+
+FILLER = ("we are looking for an engineer to join our team and build reliable systems with modern tools "
+          "you will work with product and design on features used by millions of customers").split()
+
+
+def make_dictionary(n, rnd):
+    """The default dictionary, padded with made up multi-word tools"""
+    skills = {skill_id: list(aliases) for skill_id, aliases in DEFAULT_SKILLS.items()}
+    for i in range(n - len(skills)):
+        name = f"Tool{i}"
+        skills[f"tool_{i}"] = [name, f"{name} {rnd.choice(['Cloud', 'Studio', 'Pro'])}"]
+    return skills
+
+
+def make_corpus(n, skills, rnd):
+    aliases = [alias.lstrip("=") for values in skills.values() for alias in values]
+    corpus = []
+    for _ in range(n):
+        words = rnd.choices(FILLER, k=300) + rnd.sample(aliases, 8)
+        rnd.shuffle(words)
+        corpus.append({"job_title": "Data Engineer", "job_description": " ".join(words)})
+    return corpus
+
+
+def naive_tag(skills, text):
+    text = text.lower()
+    return [skill_id for skill_id, aliases in skills.items()
+            if any(alias.lstrip("=").lower() in text for alias in aliases)]
+
+
+def main():
+    rnd = random.Random(0)
+    skills = make_dictionary(N_SKILLS, rnd)
+    corpus = make_corpus(N_JOBS, skills, rnd)
+    size = sum(len(job["job_description"]) for job in corpus) / 2 ** 20
+
+    start = time.perf_counter()
+    tagger = SkillTagger.from_dict(skills)
+    print(f"compiled {len(tagger.skill_ids)} skills, {tagger.aliases} aliases in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    tagger.tag_jobs(corpus)
+    elapsed = time.perf_counter() - start
+    tags = sum(len(job["skills"]) for job in corpus)
+    print(f"automaton: {N_JOBS} jobs ({size:.0f} MiB), {tags} tags in {elapsed:.2f}s: "
+          f"{N_JOBS / elapsed:,.0f} jobs/s, {size / elapsed:.1f} MiB/s")
+
+    start = time.perf_counter()
+    for job in corpus[:N_NAIVE]:
+        naive_tag(skills, job["job_description"])
+    naive = (time.perf_counter() - start) / N_NAIVE
+    print(f"substring loop: {1 / naive:,.0f} jobs/s, {naive * N_JOBS:.0f}s for all {N_JOBS} jobs "
+          f"({naive * N_JOBS / elapsed:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to import from linkedin_scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.store import EntityStore
+
+N_JOBS = int(os.environ.get("N_JOBS", "50000"))
+CHANGED = float(os.environ.get("CHANGED", "0.05"))
+
+
+def make_jobs(n, rnd):
+    return [
+        {
+            "linkedin_url": f"https://www.linkedin.com/jobs/view/{i}",
+            "job_title": f"Engineer {i % 50}",
+            "company": f"Company {rnd.randrange(2000)}",
+            "location": f"City {rnd.randrange(300)}, Poland",
+            "posted_date": f"{rnd.randint(1, 30)} days ago",
+            "applicant_count": f"{rnd.randint(1, 200)} applicants",
+            "job_description": "Build and run data pipelines. " * 40,
+        }
+        for i in range(n)
+    ]
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:6.2f}s  {result}")
+
+
+def main():
+    rnd = random.Random(0)
+    jobs = make_jobs(N_JOBS, rnd)
+    # A day later: every relative posted date moved on, only CHANGED of the jobs really did
+    rescrape = [dict(job, posted_date=f"{int(job['posted_date'].split()[0]) + 1} days ago") for job in jobs]
+    for job in rnd.sample(rescrape, int(N_JOBS * CHANGED)):
+        job["applicant_count"] = "Over 200 applicants"
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = EntityStore(os.path.join(directory, "store.db"))
+        timed(f"first scrape, {N_JOBS} jobs", lambda: store.upsert_jobs(jobs))
+        timed(f"re-scrape, {CHANGED:.0%} changed", lambda: store.upsert_jobs(rescrape))
+        store.touch_unchanged = False
+        timed("re-scrape again, no last_seen updates", lambda: store.upsert_jobs(rescrape))
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path to import from linkedin_scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.job_search import JobSearch
+from linkedin_scraper.query import JobQuery
+from linkedin_scraper.rate_limit import RateLimiter
+from linkedin_scraper.replay import instant_waits
+from linkedin_scraper.standin import StandinDriver, StandinServer, StandinSite
+
+N_JOBS = int(os.environ.get("N_JOBS", "100000"))
+WORKERS = int(os.environ.get("WORKERS", "4"))
+# "standin" renders pages in process, "chrome" drives headless Chrome over HTTP
+DRIVER = os.environ.get("DRIVER", "standin")
+# Seconds per response and share of 429 responses, to exercise pacing and rate control
+LATENCY = float(os.environ.get("LATENCY", "0"))
+THROTTLE_RATE = float(os.environ.get("THROTTLE_RATE", "0"))
+# Pages per minute for each worker's rate limiter, 0 for no limit
+RATE = float(os.environ.get("RATE", "0"))
+
+KEYWORDS = "data engineer"
+GEOID = 90009828
+
+
+def make_driver(site, server):
+    if DRIVER == "chrome":
+        from selenium import webdriver
+
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        driver = webdriver.Chrome(options=options)
+    else:
+        driver = StandinDriver(site)
+    if RATE:
+        RateLimiter.for_driver(driver, rate=RATE, max_rate=RATE)
+    else:
+        RateLimiter.for_driver(driver, rate=1e9, max_rate=1e9)
+    return driver
+
+
+def main():
+    site = StandinSite(total_jobs=N_JOBS, latency=LATENCY, throttle_rate=THROTTLE_RATE)
+    server = StandinServer(site).start() if DRIVER == "chrome" else None
+    base_url = server.url + "/jobs/" if server else "https://www.linkedin.com/jobs/"
+    pages = -(-N_JOBS // JobQuery.JOBS_PER_PAGE)
+
+    def scrape(worker):
+        driver = make_driver(site, server)
+        search = JobSearch(driver, base_url=base_url, scrape=False)
+        jobs = []
+        try:
+            for page in range(worker, pages, WORKERS):
+                try:
+                    jobs.extend(search.search(KEYWORDS, GEOID, current_page_index=page, delay_seconds=0))
+                except Exception as e:
+                    print(f"page {page + 1} failed: {e}")
+        finally:
+            driver.quit()
+        return jobs
+
+    start = time.perf_counter()
+    with instant_waits(), ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        jobs = [job for worker_jobs in executor.map(scrape, range(WORKERS)) for job in worker_jobs]
+    elapsed = time.perf_counter() - start
+    if server:
+        server.stop()
+
+    unique = len({job.linkedin_url for job in jobs})
+    print(f"{len(jobs)} jobs ({unique} unique) from {pages} pages with {WORKERS} {DRIVER} workers in {elapsed:.1f}s: "
+          f"{len(jobs) / elapsed:,.0f} jobs/s, {pages / elapsed:,.1f} pages/s")
+    print(f"Responses by status: {dict(site.stats)}")
+
+
+if __name__ == "__main__":
+    main()
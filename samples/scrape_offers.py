@@ -9,7 +9,7 @@ from selenium.webdriver.chrome.options import Options
 # Add parent directory to path to import from linkedin_scraper
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from linkedin_scraper import actions
+from linkedin_scraper import actions, configure_logging
 from linkedin_scraper.job_search import JobSearch
 
 def main():
@@ -24,6 +24,12 @@ def main():
     
     # New parameter for max pages to scrape
     MAX_PAGES = int(os.environ.get("MAX_PAGES", "3"))
+
+    # LOG_LEVEL=DEBUG shows every card, LOG_JSON=1 emits JSON lines
+    configure_logging(
+        level=os.environ.get("LOG_LEVEL", "INFO"),
+        json_output=os.environ.get("LOG_JSON") == "1",
+    )
     
     if not LINKEDIN_USERNAME or not LINKEDIN_PASSWORD:
         print("Error: LinkedIn username and password must be set as environment variables")
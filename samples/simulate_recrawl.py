@@ -0,0 +1,94 @@
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path to import from linkedin_scraper
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper.recrawl import DAY, PageBudget, RecrawlScheduler
+
+N_ENTITIES = int(os.environ.get("N_ENTITIES", "2000"))
+DAYS = int(os.environ.get("DAYS", "30"))
+# Enough pages to crawl every entity once a day on a fixed schedule
+PAGES_PER_HOUR = float(os.environ.get("PAGES_PER_HOUR", str(N_ENTITIES / 24)))
+STEP = 10 * 60
+
+
+def true_rates(n, rnd):
+    """Changes per day: a few busy postings, most of them barely changing"""
+    return [rnd.choice([4.0, 1.0]) if rnd.random() < 0.1 else rnd.choice([1 / 7, 1 / 30, 1 / 90]) for _ in range(n)]
+
+
+def simulate(rates, pick, seed):
+    """
+    Crawl with pick(now) choosing the urls to crawl at every step, returning the share of
+    entities whose last crawl was up to date, averaged over time, the changes found and
+    the pages loaded.
+    """
+    rnd = random.Random(seed)
+    urls = [f"https://www.linkedin.com/jobs/view/{4_000_000_000 + i}/" for i in range(len(rates))]
+    index = {url: i for i, url in enumerate(urls)}
+    versions = [0] * len(rates)
+    seen = [-1] * len(rates)
+    next_change = [rnd.expovariate(rate) * DAY for rate in rates]
+    fresh = found = steps = pages = 0
+    for now in range(0, DAYS * DAY, STEP):
+        for i, at in enumerate(next_change):
+            while at <= now:
+                versions[i] += 1
+                at += rnd.expovariate(rates[i]) * DAY
+            next_change[i] = at
+        for url in pick(now, versions):
+            i = index[url]
+            found += seen[i] not in (-1, versions[i])
+            seen[i] = versions[i]
+            pages += 1
+        fresh += sum(seen[i] == versions[i] for i in range(len(rates))) / len(rates)
+        steps += 1
+    return fresh / steps, found, pages
+
+
+def main():
+    rates = true_rates(N_ENTITIES, random.Random(0))
+    urls = [f"https://www.linkedin.com/jobs/view/{4_000_000_000 + i}/" for i in range(N_ENTITIES)]
+    index = {url: i for i, url in enumerate(urls)}
+
+    def round_robin():
+        budget = PageBudget(PAGES_PER_HOUR, now=0)
+        position = 0
+
+        def pick(now, versions):
+            nonlocal position
+            batch = []
+            while budget.available(now) >= 1:
+                budget.spend(1)
+                batch.append(urls[position % len(urls)])
+                position += 1
+            return batch
+        return pick
+
+    def freshness_driven(min_staleness=0.0):
+        scheduler = RecrawlScheduler(pages_per_hour=PAGES_PER_HOUR, min_staleness=min_staleness)
+        scheduler.budget = PageBudget(PAGES_PER_HOUR, scheduler.budget.burst, now=0)
+        scheduler.track(urls)
+
+        def pick(now, versions):
+            batch = [target.linkedin_url for target in scheduler.next_batch(now=now)]
+            for url in batch:
+                scheduler.record(url, {"linkedin_url": url, "version": versions[index[url]]}, crawled_at=now)
+            return batch
+        return pick
+
+    print(f"{N_ENTITIES} jobs over {DAYS} days, {PAGES_PER_HOUR:.0f} pages/hour")
+    for label, pick in (("fixed round robin", round_robin()),
+                        ("freshness driven", freshness_driven()),
+                        ("min_staleness=0.5", freshness_driven(0.5))):
+        start = time.perf_counter()
+        freshness, found, pages = simulate(rates, pick, seed=1)
+        print(f"{label:<20} {freshness:6.1%} fresh on average, {pages} pages, {found} changes found "
+              f"({found / pages:.0%} of pages) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
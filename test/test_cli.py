@@ -0,0 +1,128 @@
+import csv
+import json
+import logging
+
+import pytest
+
+pytest.importorskip("lxml")
+from linkedin_scraper import cli  # noqa: E402
+from linkedin_scraper.log import ROOT_LOGGER  # noqa: E402
+from linkedin_scraper.rate_limit import CHECKPOINT, ThrottleDetected  # noqa: E402
+from linkedin_scraper.replay import instant_waits  # noqa: E402
+from linkedin_scraper.standin import StandinDriver, StandinSite  # noqa: E402
+
+PROFILES = ["https://www.linkedin.com/in/ada-lovelace/", "https://www.linkedin.com/in/alan-turing/"]
+
+
+class StandinDriverPool:
+    """DriverPool over stand-in drivers, one per pool like the real one per thread"""
+
+    site = StandinSite(total_jobs=60)
+    created = []
+
+    def __init__(self, args):
+        self.driver = StandinDriver(self.site)
+        self.created.append(self)
+        self.calls = []
+
+    def get(self):
+        return self.driver
+
+    def call(self, func, *args):
+        self.calls.append(args[0])
+        return func(self.driver, *args)
+
+    def close(self):
+        pass
+
+
+class StandinSessionPool:
+    """SessionPool lending out a single stand-in driver"""
+
+    def __init__(self, error=None):
+        self.driver = StandinDriver(StandinDriverPool.site)
+        self.error = error
+        self.calls = []
+        self.closed = False
+
+    def call(self, func, *args):
+        self.calls.append(args)
+        if self.error is not None:
+            raise self.error
+        return func(self.driver, *args)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def standin(monkeypatch):
+    logger = logging.getLogger(ROOT_LOGGER)
+    handlers, level = list(logger.handlers), logger.level
+    monkeypatch.setattr(cli, "DriverPool", StandinDriverPool)
+    StandinDriverPool.created = []
+    with instant_waits():
+        yield
+    logger.handlers[:] = handlers
+    logger.setLevel(level)
+
+
+def test_parse_arguments():
+    args = cli.build_parser().parse_args(
+        ["jobs", "search", "python", "--geoid", "103644278", "--max-pages", "2", "-w", "3", "--since", "marks.db"])
+    assert (args.items, args.geoid, args.max_pages, args.workers, args.since) == (["python"], 103644278, 2, 3, "marks.db")
+    assert args.scrape is cli._search_jobs and args.format == cli.JSONL
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["people", "--format", "xml"])
+
+
+def test_missing_credentials(monkeypatch):
+    for name in ("LINKEDIN_USERNAME", "LINKEDIN_PASSWORD", "LINKEDIN_COOKIE"):
+        monkeypatch.delenv(name, raising=False)
+    assert cli.main(["people", PROFILES[0]]) == 2
+    assert cli.main(["people", PROFILES[0], "--email", "me@example.com"]) == 2
+    assert StandinDriverPool.created == []
+
+
+def test_search_to_jsonl(tmp_path):
+    output = tmp_path / "jobs.jsonl"
+    code = cli.main(["jobs", "search", "data engineer", "--geoid", "90009828", "--max-pages", "1", "--delay", "0",
+                     "--cookie", "li_at", "-o", str(output)])
+    assert code == 0
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(records) == 25 and all(record["linkedin_url"].startswith("https://") for record in records)
+
+
+def test_people_to_csv_and_resume(tmp_path):
+    output = tmp_path / "people.csv"
+    common = ["people", "--cookie", "li_at", "--format", "csv", "-o", str(output)]
+    assert cli.main(common + PROFILES[:1]) == 0
+    assert (tmp_path / "people.csv.done").read_text().splitlines() == PROFILES[:1]
+
+    assert cli.main(common + PROFILES + ["--resume"]) == 0
+    assert [pool.calls for pool in StandinDriverPool.created] == [PROFILES[:1], PROFILES[1:]]
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 2 and rows[0]["name"] and rows[0]["name"] != rows[1]["name"]
+    assert isinstance(json.loads(rows[0]["experiences"]), list)
+
+
+def recrawl(tmp_path, monkeypatch, sessions):
+    monkeypatch.setattr(cli, "_session_pool", lambda args: sessions if args.accounts else None)
+    return cli.main(["recrawl", PROFILES[0], "--schedule", str(tmp_path / "recrawl.db"), "--batches", "1",
+                     "--accounts", str(tmp_path / "accounts.json"), "-o", str(tmp_path / "updates.jsonl")])
+
+
+def test_recrawl_with_accounts(tmp_path, monkeypatch):
+    sessions = StandinSessionPool()
+    assert recrawl(tmp_path, monkeypatch, sessions) == 0
+    assert sessions.calls == [("person", PROFILES[0])] and sessions.closed
+    assert StandinDriverPool.created == []
+    records = [json.loads(line) for line in (tmp_path / "updates.jsonl").read_text().splitlines()]
+    assert [record["linkedin_url"] for record in records] == PROFILES[:1]
+
+
+def test_recrawl_stops_when_throttled(tmp_path, monkeypatch):
+    sessions = StandinSessionPool(ThrottleDetected(CHECKPOINT, PROFILES[0]))
+    assert recrawl(tmp_path, monkeypatch, sessions) == 1
+    assert len(sessions.calls) == 1 and sessions.closed
@@ -0,0 +1,65 @@
+from linkedin_scraper import connections
+from linkedin_scraper.connections import ConnectionsCrawler
+
+
+class ConnectionsDriver:
+    """Renders a list of n connections, batch cards more per scroll"""
+
+    current_url = connections.CONNECTIONS_URL
+    title = "Connections"
+
+    def __init__(self, n, batch=40):
+        self.urls = [f"https://www.linkedin.com/in/person-{i}/" for i in range(n)]
+        self.batch = batch
+        self.rendered = batch
+        self.read = 0
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, value):
+        return object()
+
+    def execute_script(self, script, *args):
+        if script == connections._COUNT_CARDS_JS:
+            return min(self.rendered, len(self.urls))
+        if script == connections._LOAD_MORE_JS:
+            self.rendered += self.batch
+            return None
+        rows = [(url, url.rsplit("-", 1)[1], "Engineer") for url in self.urls[args[0]:self.rendered]]
+        self.read += len(rows)
+        return rows
+
+
+def crawl(driver, **kwargs):
+    crawler = ConnectionsCrawler(driver, scroll_pause=0, max_idle_scrolls=1, **kwargs)
+    return crawler, [contact.url for contact in crawler.crawl()]
+
+
+def test_crawl_everything():
+    crawler, urls = crawl(ConnectionsDriver(100))
+    assert len(urls) == crawler.count == crawler.position == 100
+
+
+def test_resume_reads_from_the_saved_position():
+    first, urls = crawl(ConnectionsDriver(300), max_count=250)
+    assert first.position == 250
+
+    driver = ConnectionsDriver(300)
+    second, rest = crawl(driver, resume_after=first.cursor, resume_position=first.position)
+    assert urls + rest == ConnectionsDriver(300).urls
+    assert driver.read == 300 - 250 + ConnectionsCrawler.resume_slack
+
+
+def test_resume_after_new_connections():
+    first, urls = crawl(ConnectionsDriver(300), max_count=250)
+    driver = ConnectionsDriver(300)
+    driver.urls = ["https://www.linkedin.com/in/new-0/"] + driver.urls
+    second, rest = crawl(driver, resume_after=first.cursor, resume_position=first.position)
+    assert rest == driver.urls[251:] and second.position == 301
+
+
+def test_resume_without_a_position_scans_the_list():
+    driver = ConnectionsDriver(100)
+    _, rest = crawl(driver, resume_after="https://www.linkedin.com/in/person-89/")
+    assert len(rest) == 10 and driver.read == 100
@@ -0,0 +1,57 @@
+from linkedin_scraper.dedup import DUPLICATE, NEAR_DUPLICATE, NEW, JobDeduplicator
+from linkedin_scraper.jobs import Job
+
+WORDS = ("we build data pipelines for millions of customers using python spark and kafka on aws with a small team "
+         "that values ownership testing code review and continuous delivery of reliable services").split()
+
+
+def job(job_id, description, title="Data Engineer"):
+    url = f"https://www.linkedin.com/jobs/view/{job_id}/" if job_id else "Unknown"
+    return Job(linkedin_url=url, job_title=title, company="Acme", location="Berlin",
+               job_description=description, scrape=False)
+
+
+def test_same_id_is_a_duplicate():
+    with JobDeduplicator() as dedup:
+        assert dedup.process(job(1, " ".join(WORDS))).status == NEW
+        result = dedup.process(job(1, "changed"))
+        assert (result.status, result.duplicate_of) == (DUPLICATE, 1)
+
+
+def test_same_content_under_a_new_id():
+    with JobDeduplicator() as dedup:
+        dedup.process(job(1, " ".join(WORDS)))
+        result = dedup.process(job(2, " ".join(WORDS)))
+        assert (result.status, result.duplicate_of) == (DUPLICATE, 1)
+        # The repost is indexed under its own ID as well
+        assert 2 in dedup and dedup.process(job(2, "changed")).duplicate_of == 2
+
+
+def test_placeholder_descriptions_are_not_compared():
+    with JobDeduplicator() as dedup:
+        assert dedup.process(job(1, "Description not available")).is_new
+        assert dedup.process(job(2, "Description not available")).is_new
+        assert dedup.process(job(2, "Description not available")).status == DUPLICATE
+
+
+def test_placeholder_without_an_id_is_undecidable():
+    with JobDeduplicator() as dedup:
+        first = dedup.process(job(None, "Description not available"))
+        second = dedup.process(job(None, "Description not available", title="Data Engineer"))
+        assert first.is_new and second.is_new
+        assert len(dedup) == 0
+
+
+def test_chain_of_near_duplicates():
+    # Every version differs from the previous one in two words, the last one from the first in eight
+    versions = [[f"word{i}" for i in range(120)]]
+    for step in range(4):
+        words = list(versions[-1])
+        words[step * 30] = words[step * 30 + 15] = f"edit{step}"
+        versions.append(words)
+    with JobDeduplicator() as dedup:
+        results = [dedup.process(job(100 + i, " ".join(words))) for i, words in enumerate(versions)]
+        assert dedup.check(job(200, " ".join(versions[-1]))).duplicate_of == 104
+    assert results[0].is_new
+    assert [result.status for result in results[1:]] == [NEAR_DUPLICATE] * 4
+    assert [result.duplicate_of for result in results[1:]] == [100, 101, 102, 103]
@@ -0,0 +1,42 @@
+import threading
+
+from linkedin_scraper.failures import JOB_CARD, SEARCH_PAGE, DeadLetterStore, ScrapeFailure
+
+
+def failure(stage, url, **context):
+    return ScrapeFailure.from_exception(ValueError("boom"), stage, url, **context)
+
+
+def test_replay_keeps_failures_recorded_by_the_handlers(tmp_path):
+    store = DeadLetterStore(str(tmp_path / "failures.jsonl"))
+    store.add(failure(SEARCH_PAGE, "https://www.linkedin.com/jobs/search/?keywords=python", search={"page": 0}))
+    store.add(failure(SEARCH_PAGE, "https://www.linkedin.com/jobs/search/?keywords=java", search={"page": 0}))
+
+    def replay_search(item):
+        # Like JobSearch.search, records what failed on the way, then fails itself for java
+        store.add(failure(JOB_CARD, item.url + "&card=3", card_index=3))
+        if "java" in item.url:
+            store.add(failure(SEARCH_PAGE, item.url, **item.context))
+            raise ValueError("still broken")
+        return item.url
+
+    finished = []
+    thread = threading.Thread(target=lambda: finished.append(store.replay({SEARCH_PAGE: replay_search})))
+    thread.start()
+    thread.join(timeout=5)
+    assert finished == [["https://www.linkedin.com/jobs/search/?keywords=python"]]
+
+    left = sorted((item.stage, item.url, item.attempts) for item in store)
+    assert left == [
+        (JOB_CARD, "https://www.linkedin.com/jobs/search/?keywords=java&card=3", 1),
+        (JOB_CARD, "https://www.linkedin.com/jobs/search/?keywords=python&card=3", 1),
+        (SEARCH_PAGE, "https://www.linkedin.com/jobs/search/?keywords=java", 2),
+    ]
+
+
+def test_replay_skips_exhausted_failures(tmp_path):
+    store = DeadLetterStore(str(tmp_path / "failures.jsonl"))
+    store.add(failure(JOB_CARD, "https://www.linkedin.com/jobs/view/3900000001/"))
+    assert store.replay({JOB_CARD: lambda item: 1 / 0}, max_attempts=2) == []
+    assert store.replay({JOB_CARD: lambda item: 1 / 0}, max_attempts=2) == []
+    assert [item.attempts for item in store] == [2]
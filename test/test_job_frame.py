@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import pytest
+
+from linkedin_scraper.jobs import Job
+
+pd = pytest.importorskip("pandas")
+from linkedin_scraper.job_frame import JobFrame  # noqa: E402
+
+NOW = datetime(2024, 3, 31, 12, 0)
+
+
+def job(url, title="Data Engineer", company="Acme"):
+    return Job(linkedin_url=url, job_title=title, company=company, location="Berlin", posted_date="1 day ago",
+               applicant_count="Over 100 applicants", workplace_type="Remote", experience="Entry level", scrape=False)
+
+
+def test_dedup_drops_repeated_job_ids():
+    frame = JobFrame.from_jobs([
+        job("https://www.linkedin.com/jobs/view/3900000001/"),
+        job("https://www.linkedin.com/jobs/view/3900000001/?refId=abc"),
+        job("https://www.linkedin.com/jobs/view/3900000002/"),
+    ], now=NOW)
+    assert list(frame.dedup().df["job_id"]) == [3900000001, 3900000002]
+
+
+def test_dedup_keeps_jobs_without_an_id():
+    frame = JobFrame.from_jobs([
+        job("Unknown", title="Data Engineer"),
+        job("Unknown", title="Backend Engineer"),
+        job("https://www.linkedin.com/jobs/view/3900000001/"),
+    ], now=NOW)
+    deduped = frame.dedup()
+    assert len(deduped) == 3
+    assert list(deduped.df["job_title"]) == ["Data Engineer", "Backend Engineer", "Data Engineer"]
+
+
+def test_dedup_keep_last():
+    frame = JobFrame.from_jobs([
+        job("https://www.linkedin.com/jobs/view/3900000001/", title="First"),
+        job("https://www.linkedin.com/jobs/view/3900000001/", title="Second"),
+    ], now=NOW)
+    assert list(frame.dedup(keep="last").df["job_title"]) == ["Second"]
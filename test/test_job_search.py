@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("lxml")
+from selenium.webdriver.common.by import By  # noqa: E402
+
+from linkedin_scraper import job_search  # noqa: E402
+from linkedin_scraper.failures import JOB_CARD, DeadLetterStore, ScrapeFailure  # noqa: E402
+from linkedin_scraper.job_search import JobSearch  # noqa: E402
+from linkedin_scraper.query import HighWaterMarks, JobQuery  # noqa: E402
+from linkedin_scraper.replay import Page, Recording, ReplayDriver, instant_waits  # noqa: E402
+from linkedin_scraper.standin import StandinDriver, StandinSite  # noqa: E402
+
+SEARCH_URL = "https://www.linkedin.com/jobs/search?keywords=data"
+SEARCH_KEY = JobQuery.create("data engineer", 90009828).search_key
+
+
+def card_failure(url):
+    return ScrapeFailure.from_exception(ValueError("stale element"), JOB_CARD, url=url,
+                                        search={"search_term": "data", "geoid": 90009828}, card_index=3)
+
+
+def test_card_url_falls_back_to_the_job_id():
+    recording = Recording()
+    recording.add(Page(url=SEARCH_URL, current_url=SEARCH_URL, title="Jobs", html=(
+        '<html><body><div class="job-card-list" data-job-id="3900000001"><span>No title link</span></div>'
+        '<div class="job-card-list"><span>Nothing at all</span></div></body></html>'
+    )))
+    driver = ReplayDriver(recording)
+    driver.get(SEARCH_URL)
+    search = JobSearch(driver, scrape=False)
+    first, second = driver.find_elements(By.CLASS_NAME, "job-card-list")
+    assert search._job_card_url(first) == "https://www.linkedin.com/jobs/view/3900000001"
+    assert search._job_card_url(second) is None
+
+
+def test_replay_only_loads_the_failed_cards(tmp_path, monkeypatch):
+    scraped = []
+
+    class FakeJob:
+        def __init__(self, url, driver=None, close_on_complete=True):
+            scraped.append(url)
+            self.linkedin_url = url
+
+    monkeypatch.setattr(job_search, "Job", FakeJob)
+    store = DeadLetterStore(str(tmp_path / "failures.jsonl"))
+    store.add(card_failure("https://www.linkedin.com/jobs/view/3900000001"))
+    store.add(card_failure(None))
+    driver = StandinDriver(StandinSite(total_jobs=60))
+    with instant_waits():
+        jobs = JobSearch(driver, scrape=False).replay_failures(store)
+    assert [job.linkedin_url for job in jobs] == scraped == ["https://www.linkedin.com/jobs/view/3900000001"]
+    # The card without a URL didn't re-run its search page, and stays in the store
+    assert driver.pages_served == 0
+    assert [(failure.url, failure.attempts) for failure in store] == [(None, 2)]
+
+
+def incremental_search(driver, max_pages=20, **kwargs):
+    with instant_waits():
+        return JobSearch(driver, scrape=False).search_multiple_pages(
+            "data engineer", 90009828, max_pages=max_pages, delay_seconds=0, **kwargs)
+
+
+def test_incremental_search_stops_at_the_mark():
+    # Four postings a minute, so the last 40 minutes hold 160 of them, plus the slack of
+    # the posted date filter: 180 results on 8 pages
+    driver = StandinDriver(StandinSite(total_jobs=4 * 30 * 1440))
+    marks = HighWaterMarks()
+    mark = datetime.now() - timedelta(minutes=40)
+    marks.put(SEARCH_KEY, mark)
+    jobs = incremental_search(driver, high_water_marks=marks)
+    assert driver.pages_served == 7
+    assert "f_TPR=r" in driver.current_url and "sortBy=DD" in driver.current_url
+    assert 155 <= len(jobs) <= 165 and all(job.posted_at >= mark for job in jobs)
+    assert marks.get(SEARCH_KEY) > mark + timedelta(minutes=39)
+
+
+def test_mark_only_advances_after_a_complete_run():
+    driver = StandinDriver(StandinSite(total_jobs=4 * 30 * 1440))
+    marks = HighWaterMarks()
+    mark = datetime.now() - timedelta(minutes=40)
+    marks.put(SEARCH_KEY, mark)
+    jobs = incremental_search(driver, high_water_marks=marks, max_pages=3)
+    assert len(jobs) == 75
+    assert marks.get(SEARCH_KEY) == mark
+    incremental_search(driver, high_water_marks=marks)
+    assert marks.get(SEARCH_KEY) > mark
+
+
+def test_replayed_incremental_page_keeps_its_posted_date_filter(tmp_path):
+    site = StandinSite(total_jobs=4 * 30 * 1440, error_rate=1.0)
+    driver = StandinDriver(site)
+    store = DeadLetterStore(str(tmp_path / "failures.jsonl"))
+    marks = HighWaterMarks()
+    mark = datetime.now() - timedelta(minutes=40)
+    marks.put(SEARCH_KEY, mark)
+    with instant_waits():
+        search = JobSearch(driver, scrape=False, dead_letters=store)
+        assert search.search_multiple_pages("data engineer", 90009828, delay_seconds=0, high_water_marks=marks,
+                                            max_consecutive_failures=1) == []
+        assert marks.get(SEARCH_KEY) == mark
+        site.error_rate = 0.0
+        jobs = search.replay_failures()
+    assert len(jobs) == 25
+    assert "f_TPR=r" in driver.current_url and "sortBy=DD" in driver.current_url
+    assert list(store) == []
+
+
+def test_search_stops_after_the_last_page():
+    driver = StandinDriver(StandinSite(total_jobs=60))
+    with instant_waits():
+        search = JobSearch(driver, scrape=False)
+        jobs = search.search_multiple_pages("data engineer", 90009828, max_pages=10, delay_seconds=0)
+    assert len(jobs) == 60
+    # The result count on the first page plans three pages, no empty fourth page is loaded
+    assert driver.pages_served == 3
+    assert search.last_plan.pages == 3
+
+
+def test_planned_search_starts_on_the_counted_page():
+    driver = StandinDriver(StandinSite(total_jobs=60))
+    with instant_waits():
+        search = JobSearch(driver, scrape=False)
+        plan = search.plan_search("data engineer", 90009828)
+        jobs = search.search_multiple_pages("data engineer", 90009828, delay_seconds=0, plan=plan)
+    assert len(jobs) == 60
+    assert driver.pages_served == 3
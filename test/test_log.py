@@ -0,0 +1,51 @@
+import io
+import json
+import logging
+import sys
+
+import pytest
+
+from linkedin_scraper.log import ROOT_LOGGER, JsonFormatter, configure_logging
+
+
+@pytest.fixture
+def package_logger():
+    logger = logging.getLogger(ROOT_LOGGER)
+    handlers, level = list(logger.handlers), logger.level
+    yield logger
+    logger.handlers[:] = handlers
+    logger.setLevel(level)
+
+
+def test_json_lines_carry_the_extra_fields(package_logger):
+    stream = io.StringIO()
+    configure_logging(logging.DEBUG, json_output=True, stream=stream)
+    logging.getLogger("linkedin_scraper.job_search").info(
+        "Found %d job cards", 25, extra={"query": "python", "page": 2, "count": 25, "ignored": "x"})
+    record = json.loads(stream.getvalue())
+    assert record["message"] == "Found 25 job cards"
+    assert (record["level"], record["logger"]) == ("INFO", "linkedin_scraper.job_search")
+    assert (record["query"], record["page"], record["count"]) == ("python", 2, 25)
+    assert "ignored" not in record and "url" not in record
+
+
+def test_json_exceptions():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("linkedin_scraper", logging.ERROR, __file__, 1, "Failed", None,
+                                   exc_info=sys.exc_info())
+    data = json.loads(JsonFormatter().format(record))
+    assert data["exception"].startswith("Traceback") and "ValueError: boom" in data["exception"]
+
+
+def test_configure_logging_is_idempotent(package_logger):
+    first, second = io.StringIO(), io.StringIO()
+    configure_logging(stream=first)
+    configure_logging(level=logging.WARNING, stream=second)
+    handlers = [handler for handler in package_logger.handlers if not isinstance(handler, logging.NullHandler)]
+    assert len(handlers) == 1
+    package_logger.warning("once")
+    package_logger.info("filtered")
+    assert first.getvalue() == "" and second.getvalue().count("once") == 1
+    assert "filtered" not in second.getvalue()
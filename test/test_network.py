@@ -0,0 +1,57 @@
+import json
+import os
+
+from linkedin_scraper.network import NetworkScraper, jobs_from_payload, load_responses
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class CapturedDriver:
+    """Plays captured responses back through the performance log once a page is loaded"""
+
+    title = "LinkedIn"
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.current_url = None
+        self._log = []
+
+    def get(self, url):
+        self.current_url = url
+        for i, response in enumerate(self.responses):
+            self._log.append({"method": "Network.responseReceived", "params": {
+                "requestId": str(i),
+                "response": {"url": response.url, "status": response.status, "mimeType": "application/json"},
+            }})
+            self._log.append({"method": "Network.loadingFinished", "params": {"requestId": str(i)}})
+
+    def get_log(self, kind):
+        entries, self._log = self._log, []
+        return [{"message": json.dumps({"message": message})} for message in entries]
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Network.getResponseBody":
+            return {"body": json.dumps(self.responses[int(params["requestId"])].payload), "base64Encoded": False}
+        return {}
+
+
+def scraper():
+    driver = CapturedDriver(load_responses(os.path.join(FIXTURES, "job_details.jsonl")))
+    return NetworkScraper(driver, timeout=0.5, settle=0)
+
+
+def test_job_picks_the_requested_posting():
+    job = scraper().job("https://www.linkedin.com/jobs/view/3900000001/?refId=abc")
+    assert job.linkedin_url == "https://www.linkedin.com/jobs/view/3900000001/"
+    assert (job.job_title, job.company, job.job_description) == ("Data Engineer", "Acme", "Build pipelines.")
+    assert job.applicant_total == 42
+
+
+def test_job_ignores_similar_jobs():
+    assert scraper().job("https://www.linkedin.com/jobs/view/3900000009/") is None
+
+
+def test_fixture_starts_with_similar_jobs():
+    responses = list(load_responses(os.path.join(FIXTURES, "job_details.jsonl")))
+    titles = [job.job_title for response in responses for job in jobs_from_payload(response.payload)]
+    assert titles == ["Backend Engineer", "Data Analyst", "Data Engineer"]
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+from linkedin_scraper.enums import ExperienceLevel, WorkplaceType
+from linkedin_scraper.jobs import Job
+from linkedin_scraper.normalize import normalize_job, parse_applicant_count, parse_posted_date, parse_result_count
+
+NOW = datetime(2024, 3, 31, 12, 0)
+
+
+def test_parse_posted_date():
+    assert parse_posted_date("3 days ago", NOW) == NOW - timedelta(days=3)
+    assert parse_posted_date("Reposted 2 weeks ago", NOW) == NOW - timedelta(weeks=2)
+    assert parse_posted_date("an hour ago", NOW) == NOW - timedelta(hours=1)
+    assert parse_posted_date("Just now", NOW) == NOW
+    assert parse_posted_date("yesterday-ish", NOW) is None
+
+
+def test_parse_posted_date_open_ended():
+    assert parse_posted_date("30+ days ago", NOW) == NOW - timedelta(days=30)
+
+
+def test_parse_applicant_count():
+    assert parse_applicant_count("Over 100 applicants") == 100
+    assert parse_applicant_count("Be among the first 25 applicants") == 25
+    assert parse_applicant_count("1,234 people clicked apply") == 1234
+    assert parse_applicant_count(None) is None
+
+
+
+def test_parse_result_count():
+    assert parse_result_count("1,234 results") == 1234
+    assert parse_result_count("1 result") == 1
+    assert parse_result_count("10,000+ results") == 10000
+    assert parse_result_count("Data engineer in Berlin") is None
+    assert parse_result_count(None) is None
+
+
+def test_normalize_job():
+    job = Job(scrape=False, posted_date="1 week ago", applicant_count="Over 200 applicants",
+              workplace_type="Remote", experience="Mid-Senior level")
+    normalize_job(job, NOW)
+    assert job.posted_at == NOW - timedelta(weeks=1)
+    assert job.applicant_total == 200
+    assert job.workplace == WorkplaceType.REMOTE
+    assert job.experience_level == ExperienceLevel.MID_SENIOR
@@ -0,0 +1,41 @@
+import pytest
+
+from linkedin_scraper.jobs import Job
+from linkedin_scraper.planner import SearchPlanner, SearchShard
+from linkedin_scraper.replay import instant_waits
+from linkedin_scraper.standin import StandinDriver, StandinSite
+
+pytest.importorskip("lxml")
+
+
+def test_saturated_shard_is_split_without_crawling():
+    site = StandinSite(total_jobs=150)
+    driver = StandinDriver(site)
+    planner = SearchPlanner([driver], max_pages=4, delay_seconds=0)
+    with instant_waits():
+        jobs = planner.run("data engineer", 90009828)
+
+    root = next(result for result in planner.results if result.shard.workplace_types == ())
+    assert root.saturated and root.result_count == 150
+    assert root.jobs_found == 0 and len(root.children) == 3
+    children = [result for result in planner.results if result is not root]
+    assert all(not result.saturated for result in children)
+    # The stand-in rounds each facet's share of the results
+    assert len(jobs) == len({job.linkedin_url for job in jobs}) == sum(result.result_count for result in children)
+    # One page to count the root, and the children's crawls start on their counted page
+    assert driver.pages_served == 1 + sum(-(-result.result_count // 25) for result in children)
+
+
+def test_merge_keeps_jobs_without_an_id():
+    planner = SearchPlanner([object()])
+    jobs = [
+        Job(linkedin_url="Unknown", job_title="First", scrape=False),
+        Job(linkedin_url="Unknown", job_title="Second", scrape=False),
+        Job(linkedin_url="https://www.linkedin.com/jobs/view/3900000001/", scrape=False),
+        Job(linkedin_url="https://www.linkedin.com/jobs/view/3900000001/?refId=abc", scrape=False),
+    ]
+    assert planner._merge(jobs) == 3
+
+
+def test_shard_str():
+    assert str(SearchShard("python", 103644278, workplace_types=(2,))) == "'python' @ 103644278 [Workplace: Remote]"
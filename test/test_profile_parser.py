@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("lxml")
+from linkedin_scraper.profile_parser import parse_date_range, parse_educations, parse_experiences  # noqa: E402
+
+
+def line(text):
+    return f'<span aria-hidden="true">{text}</span><span class="visually-hidden">{text}</span>'
+
+
+def entity(url, lines, summary=""):
+    spans = "".join(f"<div>{line(text)}</div>" for text in lines)
+    return (
+        '<li class="pvs-list__paged-list-item"><div data-view-name="profile-component-entity">'
+        f'<div><a href="{url}"><img/></a></div>'
+        f"<div><div><div>{spans}</div></div><div>{summary}</div></div>"
+        "</div></li>"
+    )
+
+
+def section(*entries):
+    return f'<div class="pvs-list__container"><ul>{"".join(entries)}</ul></div>'
+
+
+def test_experience_with_dates():
+    html = section(entity("https://www.linkedin.com/company/1/", [
+        "Data Engineer", "Acme · Full-time", "Jan 2020 - Present · 4 yrs 3 mos", "Berlin, Germany",
+    ]))
+    [experience] = parse_experiences(html)
+    assert (experience.position_title, experience.institution_name) == ("Data Engineer", "Acme · Full-time")
+    assert experience.from_date == "Jan 2020" and experience.to_date == "Present"
+    assert experience.location == "Berlin, Germany" and experience.duration_months == 51
+
+
+def test_experience_without_dates():
+    html = section(
+        entity("https://www.linkedin.com/company/1/", ["Data Engineer", "Acme · Full-time", "Berlin, Germany"]),
+        entity("https://www.linkedin.com/company/2/", ["Volunteer"]),
+    )
+    first, second = parse_experiences(html)
+    assert (first.position_title, first.institution_name, first.location) == (
+        "Data Engineer", "Acme · Full-time", "Berlin, Germany")
+    assert first.from_date == "" and first.start_date is None
+    assert (second.position_title, second.institution_name) == ("Volunteer", "")
+
+
+def test_education_without_dates():
+    html = section(entity("https://www.linkedin.com/school/1/", ["TU Berlin", "MSc, Computer Science"]))
+    [education] = parse_educations(html)
+    assert (education.institution_name, education.degree) == ("TU Berlin", "MSc, Computer Science")
+    assert education.from_date is None
+
+
+def test_parse_date_range():
+    dates = parse_date_range("2018 - 2020")
+    assert dates.start.isoformat() == "2018-01-01" and dates.end.isoformat() == "2020-12-01"
+    assert parse_date_range("2 yrs 1 mo").duration_months == 25
+    assert parse_date_range("Berlin, Germany") is None
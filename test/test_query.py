@@ -0,0 +1,78 @@
+import time
+from datetime import datetime
+
+from linkedin_scraper.enums import ExperienceLevel, WorkplaceType
+from linkedin_scraper.query import HighWaterMarks, JobQuery, QueryCache, SearchPlan
+
+
+def test_equivalent_queries_share_url_and_key():
+    first = JobQuery.create("Data  Engineer ", 90009828, [WorkplaceType.REMOTE, 1, 2], [4, 2])
+    second = JobQuery.create("data engineer", "90009828", [2, 1], [ExperienceLevel(2), 4, 4])
+    assert first == second and first.key == second.key
+    assert first.url() == (
+        "https://www.linkedin.com/jobs/search?keywords=data%20engineer&geoId=90009828"
+        "&f_WT=1,2&f_E=2,4&refresh=true"
+    )
+
+
+def test_url_of_later_pages():
+    query = JobQuery.create("python", 103644278, sort_by="DD", posted_within=86400, page=2)
+    assert query.url("https://example.test/jobs") == (
+        "https://example.test/jobs/search?keywords=python&geoId=103644278&f_TPR=r86400&sortBy=DD&start=50&refresh=true"
+    )
+
+
+def test_search_key():
+    query = JobQuery.create("python", 103644278)
+    assert query.for_page(3).search_key == query.search_key
+    assert JobQuery.create("python", 103644278, sort_by="DD", posted_within=3600).search_key == query.search_key
+    assert query.for_page(3).key != query.key
+    assert JobQuery.create("python", 103644278, workplace_types=[2]).search_key != query.search_key
+    assert JobQuery.create("python", 90009828).search_key != query.search_key
+
+
+
+def test_search_plan():
+    assert SearchPlan.create(60, max_pages=10) == SearchPlan(60, 3)
+    assert not SearchPlan.create(60, max_pages=10).truncated
+    assert SearchPlan.create(50, max_pages=10).pages == 2
+    assert SearchPlan.create(0, max_pages=10) == SearchPlan(0, 0)
+    # LinkedIn serves at most 1000 results, 25 per page
+    assert SearchPlan.create(5000, max_pages=100) == SearchPlan(5000, 40)
+    # Every page LinkedIn serves is planned, the rest is up to splitting the search
+    assert not SearchPlan.create(5000, max_pages=100).truncated
+    assert SearchPlan.create(1000, max_pages=10) == SearchPlan(1000, 10)
+    assert SearchPlan.create(1000, max_pages=10).truncated
+    assert SearchPlan.create(None, max_pages=10) == SearchPlan(None, 10)
+    assert SearchPlan.create(None, max_pages=10).truncated
+
+
+def test_query_cache():
+    cache = QueryCache(ttl_seconds=60)
+    assert cache.get("key") is None
+    cache.put("key", [{"job_title": "First"}])
+    assert cache.get("key").jobs == [{"job_title": "First"}]
+    cache.put("key", [{"job_title": "Second"}])
+    assert cache.get("key").jobs == [{"job_title": "Second"}]
+    cache.close()
+
+
+def test_query_cache_expiry():
+    cache = QueryCache(ttl_seconds=60)
+    cache.put("old", [])
+    cache.conn.execute("UPDATE query_cache SET created_at = ?", (time.time() - 61,))
+    cache.put("new", [])
+    assert cache.get("old") is None and cache.get("new") is not None
+    assert cache.purge() == 1
+    cache.close()
+
+
+def test_high_water_marks(tmp_path):
+    since = datetime(2024, 3, 31, 12, 0, 30)
+    with HighWaterMarks(str(tmp_path / "marks.db")) as marks:
+        assert marks.get("search") is None
+        marks.put("search", since)
+    with HighWaterMarks(str(tmp_path / "marks.db")) as marks:
+        assert marks.get("search") == since
+        marks.put("search", datetime(2024, 4, 1))
+        assert marks.get("search") == datetime(2024, 4, 1)
@@ -0,0 +1,38 @@
+import gc
+import weakref
+
+from linkedin_scraper.rate_limit import TOO_MANY_REQUESTS, RateLimiter
+
+
+class Driver:
+    pass
+
+
+def test_pacing_is_opt_in():
+    limiter = RateLimiter()
+    assert limiter.interval == 0
+    limiter.record_success()
+    assert limiter.rate is None and limiter.pages == 1
+    assert RateLimiter(rate=12).interval == 5
+
+
+def test_throttle_starts_pacing():
+    limiter = RateLimiter(max_rate=30, cooldown_seconds=0)
+    limiter.record_throttle(TOO_MANY_REQUESTS)
+    assert limiter.rate == 15
+    limiter.record_success()
+    assert limiter.rate == 16
+
+
+def test_limiters_are_shared_per_driver_and_released_with_it():
+    driver = Driver()
+    limiter = RateLimiter.for_driver(driver, rate=6)
+    assert RateLimiter.for_driver(driver) is limiter and limiter.rate == 6
+    replacement = Driver()
+    RateLimiter.transfer(driver, replacement)
+    assert RateLimiter.for_driver(replacement) is limiter
+
+    released = weakref.ref(limiter)
+    del driver, replacement, limiter
+    gc.collect()
+    assert released() is None
@@ -0,0 +1,85 @@
+import math
+import time
+
+import pytest
+
+from linkedin_scraper.rate_limit import PageBudgetExhausted
+from linkedin_scraper.recrawl import DAY, PageBudget, RecrawlScheduler, estimate_change_rate
+
+JOB_URL = "https://www.linkedin.com/jobs/view/{}/"
+PERSON_URL = "https://www.linkedin.com/in/ada-lovelace/"
+
+
+def test_estimate_change_rate():
+    assert estimate_change_rate(1, 0, 0, prior_rate=0.5) == 0.5
+    # Four daily intervals without a change pull the prior towards zero
+    assert estimate_change_rate(5, 0, 4 * DAY, prior_rate=0.5) == pytest.approx(1 / 6)
+    # A change in every interval stays finite
+    assert estimate_change_rate(5, 4, 4 * DAY, prior_rate=0.5, prior_weight=0) == pytest.approx(math.log(9))
+    assert estimate_change_rate(5, 4, 4 * DAY, prior_rate=0.5) == pytest.approx((4 * math.log(9) + 1) / 6)
+    # The prior's weight fades with the history
+    few = estimate_change_rate(3, 0, 2 * DAY, prior_rate=0.5)
+    many = estimate_change_rate(31, 0, 30 * DAY, prior_rate=0.5)
+    assert 0 < many < few < 0.5
+
+
+def test_page_budget_refill_and_burst():
+    budget = PageBudget(pages_per_hour=60, burst=10, now=0)
+    assert budget.available(0) == 10
+    budget.spend(10)
+    assert budget.available(60) == pytest.approx(1)
+    assert budget.wait_time(4, now=60) == pytest.approx(180)
+    assert budget.available(3600) == 10
+
+
+def test_next_batch_order_and_budget():
+    with RecrawlScheduler(pages_per_hour=1, burst=4) as scheduler:
+        now = time.time()
+        scheduler.track([JOB_URL.format(1), JOB_URL.format(2), JOB_URL.format(3), PERSON_URL])
+        scheduler.record(JOB_URL.format(1), {"job_title": "a"}, crawled_at=now - 10 * DAY)
+        scheduler.record(JOB_URL.format(2), {"job_title": "b"}, crawled_at=now - DAY)
+        scheduler.record(PERSON_URL, {"name": "Ada"}, crawled_at=now - 100 * DAY)
+        batch = scheduler.next_batch(now=now)
+        # Never crawled first, then by rate * age: 0.5 * 10, then 1/60 * 100, which costs
+        # three pages and doesn't fit after the first two, then 0.5 * 1
+        assert [target.linkedin_url for target in batch] == [JOB_URL.format(3), JOB_URL.format(1), JOB_URL.format(2)]
+        assert [target.staleness for target in batch] == pytest.approx([1.0, 1 - math.exp(-5), 1 - math.exp(-0.5)])
+        assert scheduler.budget.available(now) == pytest.approx(1, abs=0.01)
+        assert scheduler.next_batch(max_size=0, now=now) == []
+
+
+def test_record_failure_backs_off():
+    now = time.time()
+    url = JOB_URL.format(1)
+    with RecrawlScheduler(pages_per_hour=1, burst=100, min_interval=3600) as scheduler:
+        scheduler.track([url])
+        scheduler.record_failure(url, failed_at=now)
+        assert scheduler.next_batch(now=now + 3500) == []
+        assert len(scheduler.next_batch(now=now + 3700)) == 1
+        scheduler.record_failure(url, failed_at=now)
+        assert scheduler.next_batch(now=now + 7100) == []
+        assert len(scheduler.next_batch(now=now + 7300)) == 1
+        # A successful crawl resets the backoff
+        scheduler.record(url, {"job_title": "a"}, crawled_at=now)
+        scheduler.record_failure(url, failed_at=now)
+        assert len(scheduler.next_batch(now=now + 3700)) == 1
+
+
+def test_run_stops_on_throttling():
+    scraped = []
+
+    def scrape(driver, kind, url):
+        scraped.append(url)
+        if url == JOB_URL.format(1):
+            raise ValueError("no job title")
+        raise PageBudgetExhausted(url)
+
+    with RecrawlScheduler(pages_per_hour=3600) as scheduler:
+        scheduler.track([JOB_URL.format(1)])
+        scheduler.record(JOB_URL.format(2), {"job_title": "b"}, crawled_at=time.time() - 10 * DAY)
+        with pytest.raises(PageBudgetExhausted):
+            scheduler.run(None, batches=1, scrape=scrape)
+        assert scraped == [JOB_URL.format(1), JOB_URL.format(2)]
+        # The throttled entity is left as it was, the failed one backs off
+        assert len(scheduler.history(JOB_URL.format(2))) == 1
+        assert [target.linkedin_url for target in scheduler.next_batch()] == [JOB_URL.format(2)]
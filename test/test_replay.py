@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+pytest.importorskip("lxml")
+from linkedin_scraper import rate_limit  # noqa: E402
+from linkedin_scraper.job_search import JobSearch  # noqa: E402
+from linkedin_scraper.person import Person  # noqa: E402
+from linkedin_scraper.rate_limit import RateLimiter  # noqa: E402
+from linkedin_scraper.replay import Recording, RecordingDriver, ReplayDriver, instant_waits  # noqa: E402
+from linkedin_scraper.standin import StandinDriver, StandinSite  # noqa: E402
+
+PROFILE = "https://www.linkedin.com/in/ada-lovelace/"
+
+
+@pytest.fixture(scope="module")
+def recording(tmp_path_factory):
+    """A profile and a three page search, recorded from the stand-in site"""
+    path = str(tmp_path_factory.mktemp("replay") / "recording.jsonl")
+    driver = RecordingDriver(StandinDriver(StandinSite(total_jobs=60)), path)
+    with instant_waits():
+        person = Person(PROFILE, driver=driver, close_on_complete=False)
+        jobs = JobSearch(driver, scrape=False).search_multiple_pages("data engineer", 90009828, max_pages=3,
+                                                                      delay_seconds=0)
+    driver.quit()
+    return path, person, jobs
+
+
+def test_replay_person(recording):
+    path, recorded, _ = recording
+    driver = ReplayDriver(path)
+    with instant_waits():
+        person = Person(PROFILE, driver=driver, close_on_complete=False)
+    assert person.name == recorded.name
+    assert person.experiences == recorded.experiences and person.experiences
+    assert person.educations == recorded.educations and person.educations
+
+
+def test_replay_job_search(recording):
+    path, _, recorded = recording
+    with instant_waits():
+        jobs = JobSearch(ReplayDriver(path), scrape=False).search_multiple_pages(
+            "data engineer", 90009828, max_pages=3, delay_seconds=0)
+    assert len(jobs) == 60
+    assert [(job.linkedin_url, job.job_title, job.company) for job in jobs] == [
+        (job.linkedin_url, job.job_title, job.company) for job in recorded]
+
+
+def test_replay_unrecorded_page():
+    driver = ReplayDriver(Recording())
+    driver.get(PROFILE)
+    assert driver.title == "Page not found"
+
+
+def test_instant_waits_skip_rate_limiting():
+    limiter = RateLimiter(rate=1)
+    start = time.monotonic()
+    with instant_waits():
+        limiter.acquire()
+        limiter.acquire()
+        limiter.record_throttle(rate_limit.TOO_MANY_REQUESTS)
+        limiter.acquire()
+    assert time.monotonic() - start < 1
+
+
+def test_overlapping_instant_waits():
+    with instant_waits() as outer:
+        with instant_waits() as inner:
+            assert inner is outer
+        assert rate_limit.time is outer
+    assert rate_limit.time is time
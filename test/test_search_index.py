@@ -0,0 +1,74 @@
+import pytest
+
+from linkedin_scraper.search_index import JobIndex, match_expression
+
+
+def posting(job_id, title, company="Acme", description=""):
+    return {
+        "job_id": job_id,
+        "linkedin_url": f"https://www.linkedin.com/jobs/view/{job_id}/",
+        "job_title": title,
+        "company": company,
+        "job_description": description,
+    }
+
+
+@pytest.fixture
+def index():
+    with JobIndex() as index:
+        yield index
+
+
+def test_match_expression_quotes_operators():
+    assert match_expression("kafka OR spark") == '"kafka" AND "OR" AND "spark"'
+    assert match_expression('NEAR(python "sql")') == '"NEAR" AND "python" AND "sql"'
+    assert match_expression("c++ c#", match_all=False) == '"c++" OR "c#"'
+    assert match_expression("title:python data*") == 'job_title : "python" AND "data" *'
+    # Unknown fields are ignored rather than passed to FTS5
+    assert match_expression("salary:high") == '"high"'
+    assert match_expression("- ()") == ""
+
+
+def test_operators_in_queries_are_matched_literally(index):
+    index.add([posting(1, "C++ developer"), posting(2, "C developer")])
+    assert [hit.job_id for hit in index.search("c++")] == [1]
+    assert [hit.job_id for hit in index.search("developer NOT")] == []
+    assert index.search("") == []
+
+
+def test_add_skips_unchanged_and_replaces_changed_postings(index):
+    assert index.add([posting(1, "Data engineer"), posting(2, "Data analyst")]) == 2
+    assert index.add([posting(1, "Data engineer"), posting(2, "Data analyst")]) == 0
+    assert index.add([posting(2, "Machine learning engineer")]) == 1
+    assert index.count() == 2
+    assert index.count("analyst") == 0
+    assert [hit.job_id for hit in index.search("machine learning")] == [2]
+    # Postings without a job ID are skipped
+    assert index.add([{"job_title": "Unknown"}]) == 0
+
+
+def test_remove(index):
+    index.add([posting(1, "Data engineer"), posting(2, "Data analyst")])
+    assert index.remove([1, 3]) == 1
+    assert index.count() == 1
+    assert [hit.job_id for hit in index.search("data")] == [2]
+
+
+def test_title_and_company_outrank_description(index):
+    index.add([
+        posting(1, "Backend engineer", description="We run python services on kafka"),
+        posting(2, "Python engineer", description="We run services on kafka"),
+        posting(3, "Engineer", company="Python Software Foundation", description="Services on kafka"),
+    ])
+    assert [hit.job_id for hit in index.search("python")] == [2, 3, 1]
+    assert [hit.job_id for hit in index.search("description:python")] == [1]
+
+
+def test_max_candidates_ranks_newest_matches_only():
+    with JobIndex(max_candidates=3) as index:
+        index.add([posting(job_id, "Engineer") for job_id in range(1, 11)])
+        assert sorted(hit.job_id for hit in index.search("engineer")) == [8, 9, 10]
+        assert index.count("engineer") == 10
+    with JobIndex(max_candidates=None) as index:
+        index.add([posting(job_id, "Engineer") for job_id in range(1, 11)])
+        assert len(index.search("engineer")) == 10
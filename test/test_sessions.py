@@ -0,0 +1,53 @@
+import pytest
+
+from linkedin_scraper.objects import Scraper
+from linkedin_scraper.rate_limit import PageBudgetExhausted, RateLimiter
+from linkedin_scraper.sessions import HEALTHY, Account, SessionPool
+
+pytest.importorskip("lxml")
+from linkedin_scraper.standin import StandinDriver, StandinSite  # noqa: E402
+
+URLS = [f"https://www.linkedin.com/company/company-{i}/" for i in range(5)]
+
+
+def pool(*budgets):
+    site = StandinSite()
+    accounts = [Account(name=f"account-{i}", cookie="li_at", daily_pages=budget) for i, budget in enumerate(budgets)]
+    return SessionPool(accounts, driver_factory=lambda: StandinDriver(site), login=lambda driver, account: None,
+                       is_signed_in=lambda driver: True)
+
+
+def load(driver, urls, done):
+    for url in urls:
+        if url not in done:
+            Scraper(driver=driver).get_page(url)
+            done.append(url)
+
+
+def test_page_limit():
+    limiter = RateLimiter()
+    limiter.page_limit = 1
+    limiter.acquire()
+    limiter.record_success()
+    with pytest.raises(PageBudgetExhausted):
+        limiter.acquire()
+
+
+def test_session_stops_at_the_account_budget():
+    with pool(3) as sessions:
+        done = []
+        with pytest.raises(PageBudgetExhausted):
+            with sessions.session() as session:
+                load(session.driver, URLS, done)
+        assert len(done) == 3
+        [status] = sessions.status()
+        assert (status.state, status.pages_today, status.budget_left) == (HEALTHY, 3, 0)
+        assert session.rate_limiter.page_limit is None
+
+
+def test_call_moves_on_when_the_budget_runs_out():
+    with pool(3, 2) as sessions:
+        done = []
+        sessions.call(load, URLS, done)
+        assert done == URLS
+        assert sorted(status.pages_today for status in sessions.status()) == [2, 3]
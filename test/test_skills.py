@@ -0,0 +1,52 @@
+from linkedin_scraper.skills import SkillTagger, words
+
+
+def test_whole_words_only():
+    tagger = SkillTagger.from_dict({"java": ["Java"], "javascript": ["JavaScript"]})
+    assert tagger.tag("JavaScript developer") == ["javascript"]
+    assert tagger.tag("Java, JavaScript") == ["java", "javascript"]
+    assert tagger.tag("Javanese") == []
+
+
+def test_case_sensitive_aliases():
+    tagger = SkillTagger.from_dict({"go": ["=Go", "golang"]})
+    assert tagger.tag("Services written in Go") == ["go"]
+    assert tagger.tag("Ready to go") == []
+    assert tagger.tag("GOLANG and golang") == ["go"]
+
+
+def test_overlapping_multi_word_aliases():
+    tagger = SkillTagger.from_dict({
+        "spark": ["Spark", "Apache Spark"],
+        "spark_streaming": ["Apache Spark Streaming"],
+        "streaming": ["Spark Streaming"],
+    })
+    # "Apache Spark Streaming" also ends "Spark Streaming" and, one word earlier,
+    # "Spark" and "Apache Spark", through the failure links
+    matches = tagger.matches("Apache Spark Streaming")
+    assert sorted((match.skill_id, match.start, match.end) for match in matches) == [
+        ("spark", 0, 2), ("spark", 1, 2), ("spark_streaming", 0, 3), ("streaming", 1, 3),
+    ]
+    assert tagger.tag("Apache Flink, Spark Streaming") == ["spark", "streaming"]
+
+
+def test_words_keep_symbols():
+    assert words("C++, C#, .NET and CI/CD") == ["C++", "C#", "NET", "and", "CI", "CD"]
+    assert words("Node.js.") == ["Node.js"]
+    tagger = SkillTagger.default()
+    assert tagger.tag("C++ and C# on .NET, CI/CD") == ["cpp", "csharp", "ci_cd"]
+    assert tagger.tag("CI CD pipelines") == ["ci_cd"]
+    assert tagger.tag(".net") == []
+
+
+def test_tag_jobs_sets_skills():
+    class Job:
+        job_title = "Python developer"
+        job_description = "Django and PostgreSQL"
+
+    job = Job()
+    record = {"job_title": "Data engineer", "job_description": None}
+    tagger = SkillTagger.default()
+    assert tagger.tag_jobs([job, record]) == [job, record]
+    assert job.skills == ["python", "django", "postgresql"]
+    assert record["skills"] == []
@@ -0,0 +1,56 @@
+import re
+
+import pytest
+
+pytest.importorskip("lxml")
+from linkedin_scraper.enums import ExperienceLevel, WorkplaceType  # noqa: E402
+from linkedin_scraper.query import JobQuery  # noqa: E402
+from linkedin_scraper.rate_limit import CHECKPOINT, detect_throttle  # noqa: E402
+from linkedin_scraper.standin import StandinDriver, StandinSite  # noqa: E402
+
+
+def search(site, page=0, **filters):
+    """(result count in the header, job ids of the cards) of a search page"""
+    response = site.render(JobQuery.create("data engineer", 90009828, page=page, **filters).url())
+    count = int(re.search(r"([\d,]+) results", response.html).group(1).replace(",", ""))
+    return count, re.findall(r'data-job-id="(\d+)"', response.html)
+
+
+def test_filters_keep_their_share():
+    site = StandinSite(total_jobs=10_000)
+    assert search(site)[0] == 10_000
+    assert search(site, workplace_types=[WorkplaceType.REMOTE])[0] == 1500
+    assert search(site, workplace_types=[WorkplaceType.REMOTE, WorkplaceType.HYBRID])[0] == 4500
+    assert search(site, experience_levels=[ExperienceLevel.ENTRY_LEVEL])[0] == 2500
+    assert search(site, workplace_types=[WorkplaceType.REMOTE], experience_levels=[ExperienceLevel.ENTRY_LEVEL])[0] == 375
+    count, ids = search(site, workplace_types=[WorkplaceType.REMOTE])
+    # The workplace type is the second to last digit of a stand-in job id
+    assert len(ids) == 25 and {job_id[-2] for job_id in ids} == {str(int(WorkplaceType.REMOTE))}
+
+
+def test_posted_within_shrinks_the_total():
+    site = StandinSite(total_jobs=3000, posting_window_days=30)
+    assert search(site, posted_within=24 * 3600)[0] == 100
+    assert search(site, posted_within=7 * 24 * 3600)[0] == 700
+
+
+def test_max_results():
+    site = StandinSite(total_jobs=3000, max_results=1000)
+    assert len(search(site, page=39)[1]) == 25
+    count, ids = search(site, page=40)
+    assert count == 3000 and ids == []
+
+
+def test_pages_per_minute_per_client():
+    site = StandinSite(max_pages_per_minute=2)
+    url = "https://www.linkedin.com/feed/"
+    assert [site.respond(url, "a").status for _ in range(3)] == [200, 200, 429]
+    assert site.respond(url, "b").status == 200
+    assert site.stats[429] == 1
+
+
+def test_driver_follows_checkpoint_redirects():
+    driver = StandinDriver(StandinSite(checkpoint_rate=1.0))
+    driver.get("https://www.linkedin.com/in/ada-lovelace/")
+    assert "/checkpoint/challenge/" in driver.current_url
+    assert detect_throttle(driver) == CHECKPOINT
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from linkedin_scraper.jobs import Job
+from linkedin_scraper.normalize import normalize_job
+from linkedin_scraper.store import EntityStore
+
+URL = "https://www.linkedin.com/jobs/view/3900000001/"
+
+
+def scraped_job(posted_date, now, applicant_count="Over 100 applicants"):
+    job = Job(linkedin_url=URL, job_title="Data Engineer", company="Acme", location="Berlin",
+              posted_date=posted_date, applicant_count=applicant_count, job_description="Build pipelines.",
+              workplace_type="Remote", experience="Entry level", scrape=False)
+    return normalize_job(job, now)
+
+
+def test_rescraping_an_unchanged_job_the_next_day():
+    with EntityStore() as store:
+        assert store.upsert_jobs([scraped_job("3 days ago", datetime(2024, 3, 28, 12))]).inserted == 1
+        result = store.upsert_jobs([scraped_job("4 days ago", datetime(2024, 3, 29, 9))])
+        assert (result.updated, result.unchanged) == (0, 1)
+        assert store.get_job(URL)["posted_at"] == "2024-03-25T12:00:00"
+
+
+def test_rescraping_a_changed_job():
+    with EntityStore() as store:
+        store.upsert_jobs([scraped_job("3 days ago", datetime(2024, 3, 28, 12))])
+        result = store.upsert_jobs([scraped_job("4 days ago", datetime(2024, 3, 29, 9), "Over 200 applicants")])
+        assert result.updated == 1
+        assert store.get_job(URL)["applicant_total"] == 200
+
+
+def test_plain_records_get_their_parsed_columns():
+    record = scraped_job("2 days ago", datetime(2024, 3, 28, 12)).to_dict()
+    assert "posted_at" not in record and "applicant_total" not in record
+    with EntityStore() as store:
+        store.upsert_jobs([record])
+        stored = store.get_job(URL)
+    assert stored["posted_at"] is not None and stored["applicant_total"] == 100
+    assert stored["workplace"] is not None and stored["experience_level"] is not None
@@ -0,0 +1,158 @@
+import gc
+
+import pytest
+
+from linkedin_scraper.rate_limit import CHECKPOINT, TOO_MANY_REQUESTS, RateLimiter, ThrottleDetected
+from linkedin_scraper.watchdog import CRASHED, LOGGED_OUT, SessionLost, Watchdog
+
+FEED = "https://www.linkedin.com/feed/"
+
+
+class FakeDriver:
+    """Just enough of a webdriver for diagnose(): crashed drivers stop answering"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.crashed = False
+        self.quit_called = False
+        self.url = FEED
+        self.title = "Feed | LinkedIn"
+
+    @property
+    def current_url(self):
+        if self.crashed:
+            raise ConnectionError("browser is gone")
+        return self.url
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeDrivers:
+    """Driver factory numbering the drivers it starts"""
+
+    def __init__(self):
+        self.started = []
+
+    def __call__(self):
+        self.started.append(FakeDriver(str(len(self.started) + 1)))
+        return self.started[-1]
+
+
+def watchdog(signed_in=True, **kwargs):
+    return Watchdog(FakeDrivers(), restart_backoff_seconds=0, health_check_seconds=None,
+                    is_signed_in=lambda driver: signed_in, **kwargs)
+
+
+def test_call_retries_on_a_new_driver_after_a_crash():
+    with watchdog() as dog:
+        first = dog.driver
+        limiter = RateLimiter.for_driver(first)
+        limiter.record_success()
+        limiter.record_success()
+
+        def work(driver):
+            if driver is first:
+                driver.crashed = True
+                raise RuntimeError("no such window")
+            return driver.session_id
+
+        assert dog.call(work) == "2"
+        assert dog.restarts == 1 and first.quit_called
+        assert Watchdog.for_driver(dog.driver) is dog and Watchdog.for_driver(first) is None
+        # The new browser keeps the session's pacing and page count
+        assert RateLimiter.for_driver(dog.driver) is limiter and limiter.pages == 2
+
+
+def test_session_lost_after_max_restarts():
+    logins = []
+    with watchdog(signed_in=False, login=logins.append, max_restarts=2) as dog:
+        with pytest.raises(SessionLost) as raised:
+            dog.call(lambda driver: 1 / 0)
+        assert raised.value.reason == LOGGED_OUT and raised.value.restarts == 2
+        # The first login, then one per recovery, all in the same browser
+        assert len(logins) == 3 and dog.restarts == 0
+
+    with watchdog(max_restarts=1) as dog:
+        def crash(driver):
+            driver.crashed = True
+            raise RuntimeError("no such window")
+
+        with pytest.raises(SessionLost) as raised:
+            dog.call(crash)
+        assert raised.value.reason == CRASHED and dog.restarts == 1
+
+
+def test_throttling_and_checkpoints_are_not_recovered():
+    logins = []
+    with watchdog(login=logins.append) as dog:
+        for signal in (TOO_MANY_REQUESTS, CHECKPOINT):
+            def throttled(driver):
+                raise ThrottleDetected(signal, driver.current_url)
+
+            with pytest.raises(ThrottleDetected):
+                dog.call(throttled)
+
+        def at_checkpoint(driver):
+            driver.url = "https://www.linkedin.com/checkpoint/challenge/abc"
+            raise RuntimeError("element not found")
+
+        with pytest.raises(RuntimeError):
+            dog.call(at_checkpoint)
+        assert dog.restarts == 0 and len(logins) == 1
+
+
+def test_registry_drops_unclosed_watchdogs():
+    dog = watchdog()
+    driver = dog.driver
+    assert Watchdog.for_driver(driver) is dog
+    del dog
+    gc.collect()
+    assert Watchdog.for_driver(driver) is None
+
+
+def test_company_employees_resume_without_duplicates():
+    pytest.importorskip("lxml")
+    from linkedin_scraper.company import Company
+    from linkedin_scraper.replay import instant_waits
+    from linkedin_scraper.standin import StandinDriver, StandinSite
+
+    site = StandinSite()
+
+    class CrashingDriver(StandinDriver):
+        """Crashes on the first scroll after the employee list was read"""
+
+        scripts = 0
+        crashed = False
+
+        def execute_script(self, script, *args):
+            self.scripts += 1
+            if self.scripts == 3 and not drivers:
+                self.crashed = True
+            if self.crashed:
+                raise ConnectionError("browser is gone")
+            return super().execute_script(script, *args)
+
+        @property
+        def current_url(self):
+            if self.crashed:
+                raise ConnectionError("browser is gone")
+            return super().current_url
+
+    drivers = []
+
+    def start():
+        drivers.append(CrashingDriver(site))
+        return drivers[-1]
+
+    first = CrashingDriver(site)
+    dog = Watchdog(start, driver=first, restart_backoff_seconds=0, health_check_seconds=None,
+                   is_signed_in=lambda driver: True)
+    company = Company("https://www.linkedin.com/company/" + site.company_slug(7) + "/", driver=first,
+                      scrape=False)
+    with dog, instant_waits():
+        employees = company.get_employees(wait_time=0)
+    assert first.crashed and len(drivers) == 1 and company.driver is drivers[0]
+    urls = [employee["linkedin_url"] for employee in employees]
+    assert urls and len(urls) == len(set(urls))
+    assert len(urls) == site.company_page(site.company_slug(7), "people").html.count('<li><div><a href="/in/')
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from linkedin_scraper.work_queue import DONE, LEASED, PENDING, MemoryBroker, SQLiteBroker, Worker
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def broker(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryBroker()
+        return
+    broker = SQLiteBroker(str(tmp_path / "tasks.db"))
+    yield broker
+    broker.conn.close()
+
+
+def test_late_nack_does_not_release_a_task_leased_again(broker):
+    broker.put("job", {"url": "https://www.linkedin.com/jobs/view/3900000001/"})
+    first = broker.lease("w1", visibility_timeout=0)
+    time.sleep(0.01)
+    second = broker.lease("w2", visibility_timeout=60)
+    assert second.id == first.id
+
+    assert not broker.nack(first, "too slow")
+    assert not broker.ack(first)
+    assert not broker.extend(first, 60)
+    assert broker.lease("w3") is None
+    assert broker.stats()[LEASED] == 1
+
+    assert broker.ack(second)
+    assert broker.stats()[DONE] == 1
+
+
+def test_nack_by_the_lease_holder(broker):
+    broker.put("job", {})
+    task = broker.lease("w1")
+    assert broker.nack(task, "failed")
+    assert broker.stats()[PENDING] == 1
+    assert not broker.ack(task)
+
+
+def test_heartbeat_keeps_long_tasks_leased(broker):
+    broker.put("slow", {})
+    stolen = []
+
+    def slow(driver, payload):
+        time.sleep(0.5)
+        stolen.append(broker.lease("w2", visibility_timeout=0.3))
+
+    worker = Worker(broker, driver=None, handlers={"slow": slow}, worker_id="w1", visibility_timeout=0.3)
+    assert worker.run_once()
+    assert stolen == [None]
+    assert worker.processed == 1 and broker.stats()[DONE] == 1